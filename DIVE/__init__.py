@@ -1 +1,2 @@
+from ._components.dive_data_store import DIVEDataStore
 from ._widget import DIVEWidget
\ No newline at end of file
@@ -1,25 +1,167 @@
-from .._utilities import helper_functions
+from .._utilities import bit_mask, data_sources, helper_functions, memory
 import copy
+import itertools
 import numpy as np
 import pandas as pd
+import threading
+
+background_index_size = 1000000 # Distinct-value indices for fields with at least this many rows are built in a background thread
+field_index_clock = itertools.count() # Used to record when each distinct-value index was last used so that the least recently used ones can be discarded first
 
 class DIVEData:
     """
     This class stores data that can be accessed by DIVE.
+
+    Parameters
+    ----------
+    store : None, DIVEDataStore (Default: None)
+        The store to share data and its derived values with (see "dive_data_store.DIVEDataStore").
+        If None, the derived values are only used by this data object.
+    max_chunks : int (Default: 4)
+        The maximum number of chunks of partitioned data that can be in the current time range (see "data_sources.PartitionedSource").
     """
-    def __init__(self):
+    def __init__(self, store=None, max_chunks=4):
+        self.store = store
+        self.max_chunks = max_chunks
+        self.shared = None # The entry in the store for the current data
         self.filtered_idx = None
+        self.source = self.window = None # The partitioned data source and the range of its chunks that are currently in data
+        self.time_values = None # The time field as int64 nanoseconds (for pandas.Timestamps) or numeric values, used for searching the current time range
+        self.field_indices = {} # Holds the distinct-value index for each field that has been requested
+        self.field_facts = {} # Holds the properties of each field that have been used for validation (see "calc_field_fact")
+        self.index_threads = {} # Holds the background threads that are building distinct-value indices
+        self.index_lock = threading.Lock()
 
     def apply_filter(self, filter_idx):
-        self.filtered_idx = np.logical_and(self.filtered_idx, filter_idx)
+        self.filtered_idx = self.filtered_idx & filter_idx
 
     def apply_selection(self, selection):
-        self.selection = np.zeros(len(self.data.index), dtype='bool') if selection is None else selection
+        if selection is None:
+            self.selection = bit_mask.BitMask.full(len(self.data.index), False)
+        else:
+            self.selection = selection if isinstance(selection, bit_mask.BitMask) else bit_mask.BitMask(selection)
+
+    def build_field_index(self, data, field):
+        field_index = self.calc_field_index(data, field)
+        with self.index_lock:
+            if data is self.data: # Data may have changed while the index was being built
+                self.field_indices[field] = field_index
+
+    def get_field_fact(self, field, fact):
+        """
+        Get a property of a field that is used for validation, calculating it if it hasn't been calculated since the data last changed.
+
+        Parameters
+        ----------
+        field : str
+            The name of the field.
+        fact : str
+            The name of the property (see "calc_field_fact").
+
+        Returns
+        -------
+        object
+            The value of the property.
+        """
+        return self.lookup_field_fact(self.field_facts, self.data, field, fact)
+
+    def get_field_index(self, field):
+        """
+        Get the distinct-value index for a field, building it if it hasn't been built yet.
+
+        Parameters
+        ----------
+        field : str
+            The name of the field.
+
+        Returns
+        -------
+        dict
+            The distinct-value index for the field. See "calc_field_index" for the keys.
+        """
+        with self.index_lock:
+            thread = self.index_threads.get(field)
+        if thread is not None:
+            thread.join()
+        with self.index_lock:
+            field_index = self.field_indices.get(field)
+        if field_index is None:
+            field_index = self.calc_field_index(self.data, field)
+            with self.index_lock:
+                self.field_indices[field] = field_index
+        field_index['last_use'] = next(field_index_clock)
+        return field_index
+
+    def get_field_index_uses(self, seen):
+        """
+        Get when each distinct-value index was last used and how much memory it uses.
+
+        Parameters
+        ----------
+        seen : set
+            The keys of the arrays that have already been counted (see "memory.get_nbytes").
+            Arrays that are also used elsewhere should already be in it so that they aren't counted as memory that the index uses on its own.
+
+        Returns
+        -------
+        list
+            The last use (a value that increases with every use, or -1 if the index hasn't been used), name and estimated number of bytes of each field that has a distinct-value index.
+        """
+        with self.index_lock:
+            field_indices = list(self.field_indices.items())
+        return [(field_index.get('last_use', -1), field, memory.get_nbytes(field_index, seen)) for field, field_index in field_indices]
+
+    def get_memory_usage(self, seen, discardable=True):
+        """
+        Estimate the memory used by this data object.
+
+        Parameters
+        ----------
+        seen : set
+            The keys of the arrays that have already been counted (see "memory.get_nbytes").
+            Data that is shared with other data objects (see "DIVEDataStore") is only counted by the first data object it is measured for.
+        discardable : bool (Default: True)
+            Toggle whether the values that can be discarded to save memory (the distinct-value indices and the cached chunks outside of the current window) should be counted.
+
+        Returns
+        -------
+        dict
+            The number of bytes used by the data, filter indices, selection, distinct-value indices, time values and cached chunks of partitioned data.
+        """
+        with self.index_lock:
+            field_indices = list(self.field_indices.values()) if discardable else []
+        usage = {'data': memory.get_nbytes(self.data, seen), 'filter': memory.get_nbytes(self.filtered_idx, seen), 'selection': memory.get_nbytes(self.selection, seen)}
+        usage.update({'field_indices': memory.get_nbytes(field_indices, seen), 'time_values': memory.get_nbytes(self.time_values, seen)})
+        if self.source is None:
+            usage['chunk_cache'] = 0
+        else:
+            usage['chunk_cache'] = memory.get_nbytes(self.source.chunk_cache if discardable else self.source.get_cached_chunks(self.window), seen)
+        return usage
+
+    def get_session_state(self):
+        """
+        Get the state of this data object for a saved session, including the derived values that would otherwise have to be recalculated.
+        The data itself isn't included.
+
+        Returns
+        -------
+        dict
+            The state of this data object.
+        """
+        with self.index_lock:
+            field_indices = dict(self.field_indices)
+        state = self.get_state(as_copy=False)
+        del state['data']
+        state.update({'filtered_idx': self.filtered_idx, 'field_indices': field_indices, 'field_facts': self.field_facts, 'source': None if self.source is None else (str(self.source.path.resolve()), self.source.max_chunks)})
+        return state
 
     def get_state(self, as_copy=True):
         attrs = ['name', 'data', 'id_field', 'time_field', 'selection']
         if as_copy:
-            return {attr: getattr(self, attr, None) if attr == 'data' else copy.deepcopy(getattr(self, attr, None)) for attr in attrs}
+            state = {attr: getattr(self, attr, None) if attr in ['data', 'selection'] else copy.deepcopy(getattr(self, attr, None)) for attr in attrs}
+            if state['selection'] is not None: # Selections are only expanded to bool arrays when they leave DIVE
+                state['selection'] = state['selection'].to_bool()
+            return state
         return {attr: getattr(self, attr, None) for attr in attrs}
 
     def get_valid_idx(self, current_time, hold_time=None):
@@ -39,24 +181,125 @@ class DIVEData:
         numpy.ndarray
             The valid indices in data as a boolean array.
         """
-        if current_time is not None and self.time_field is not None:
-            valid_idx = self.filtered_idx.copy()
-            time = self.data.loc[:, self.time_field]
-            if hold_time is not None:
-                valid_idx[:time.searchsorted(helper_functions.safe_time_math(current_time, hold_time, add=False))] = False
-            valid_idx[time.searchsorted(current_time, side='right'):] = False
+        valid_range = self.get_valid_range(current_time, hold_time)
+        if valid_range is not None:
+            start, stop = valid_range
+            valid_idx = np.zeros(len(self.data.index), dtype='bool')
+            valid_idx[start:stop] = self.filtered_idx[start:stop] # Only the bits in the current time range have to be unpacked
             return valid_idx
-        return self.filtered_idx
+        return self.filtered_idx.to_bool()
+
+    def get_valid_range(self, current_time, hold_time=None):
+        """
+        Calculate the range of rows in data that are in the current time range.
+
+        Parameters
+        ----------
+        current_time : None, numeric, pandas.Timestamp with tz
+            The current time value for the animation.
+            For pandas.Timestamp time fields, this can also be an internal time value (see "helper_functions.to_time_value").
+        hold_time : None, numeric, pandas.Timedelta (Default: None)
+            The number of seconds prior to the current time that should be included.
+            If None, all points prior to the current time will be included.
+
+        Returns
+        -------
+        None, tuple
+            The start (inclusive) and stop (exclusive) rows of the current time range.
+            Will be None if there isn't a current time or a time field.
+        """
+        if current_time is None or self.time_field is None:
+            return None
+        current_value = helper_functions.to_time_value(current_time)
+        stop = int(self.time_values.searchsorted(current_value, side='right'))
+        if hold_time is None or stop == 0:
+            return 0, stop
+        start_value = current_value - helper_functions.to_time_value(hold_time)
+        return 0 if start_value <= self.time_values[0] else int(self.time_values.searchsorted(start_value)), stop
+
+    def get_window(self, current_time, hold_time=None):
+        """
+        Calculate the range of chunks in the partitioned data source that overlap the current time range.
+
+        Parameters
+        ----------
+        current_time : None, numeric, pandas.Timestamp with tz
+            The current time value for the animation.
+        hold_time : None, numeric, pandas.Timedelta (Default: None)
+            The number of seconds prior to the current time that should be included.
+            If None, all chunks prior to the current time will be included.
+
+        Returns
+        -------
+        None, tuple
+            The first and last (inclusive) chunk indices.
+            Will be None if data isn't partitioned or there isn't a current time.
+        """
+        if self.source is None or current_time is None:
+            return None
+        return self.source.get_window(helper_functions.to_time_value(current_time), helper_functions.to_time_value(hold_time))
+
+    def prepare_field_index(self, field):
+        """
+        Start building the distinct-value index for a field in a background thread if the data is large.
+
+        Parameters
+        ----------
+        field : None, str
+            The name of the field.
+        """
+        if field is None or len(self.data.index) < background_index_size:
+            return
+        with self.index_lock:
+            if field in self.field_indices or field in self.index_threads:
+                return
+            thread = threading.Thread(target=self.build_field_index, args=(self.data, field), daemon=True)
+            self.index_threads[field] = thread
+        thread.start()
+
+    def remove_field_index(self, field):
+        """
+        Discard the distinct-value index for a field. It will be built again the next time it is needed.
+
+        Parameters
+        ----------
+        field : str
+            The name of the field.
+        """
+        with self.index_lock:
+            self.field_indices.pop(field, None)
 
     def reset_filter(self):
-        self.filtered_idx = np.ones(len(self.data.index), dtype='bool')
+        self.filtered_idx = bit_mask.BitMask.full(len(self.data.index), True)
 
     def reset_selection(self):
         self.selection = None
 
+    def restore_state(self, data, state):
+        """
+        Restore the state of this data object from a saved session (see "get_session_state").
+        The state isn't validated and the saved derived values are used instead of being recalculated.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+            The saved data.
+        state : dict
+            The saved state.
+        """
+        with self.index_lock:
+            for attr in ['name', 'id_field', 'time_field', 'selection', 'filtered_idx', 'field_indices']:
+                setattr(self, attr, state[attr])
+            self.data, self.index_threads, self.shared = data, {}, None
+            self.field_facts = state.get('field_facts', {})
+            self.time_values = None if self.time_field is None else self.calc_time_values(data.loc[:, self.time_field])
+        self.prepare_field_index(self.id_field)
+
     def set_state(self, data_names, state):
         attrs = self.get_state(as_copy=False)
         data_changed = selection_changed = False
+        source, shared = self.source, self.shared
+        field_facts = self.field_facts
 
         # Validate parameters
         if 'name' in state and attrs['name'] is None:
@@ -66,14 +309,31 @@ class DIVEData:
             elif attrs['name'] in data_names:
                 return 'Name "{}" is already in use.'.format(attrs['name'])
         if 'data' in state:
+            refresh = attrs['data'] is not None # Data that is edited may have been modified in place, so its shared values aren't reused
             attrs['data'] = state['data']
+            source = shared = None
+            if data_sources.is_data_source(attrs['data']):
+                try:
+                    if data_sources.is_partitioned(attrs['data']):
+                        source = data_sources.PartitionedSource(attrs['data'], self.max_chunks)
+                        attrs['data'] = data_sources.load_data_source(source.chunk_paths[0]) # The first chunk is used to validate the fields
+                    elif self.store is not None:
+                        shared = self.store.get_shared_data(attrs['data'], refresh)
+                        attrs['data'] = shared.data
+                    else:
+                        attrs['data'] = data_sources.load_data_source(attrs['data'])
+                except Exception as error:
+                    return 'Cannot open data source. {}'.format(error)
+            elif self.store is not None and isinstance(attrs['data'], pd.DataFrame):
+                shared = self.store.get_shared_data(attrs['data'], refresh)
             if not isinstance(attrs['data'], pd.DataFrame):
-                return 'data must be of type: pandas.DataFrame'
+                return 'data must be one of the following types: pandas.DataFrame, str, pathlib.Path'
             elif attrs['data'].size == 0:
                 return 'data must have at least one value.'
             elif not all(isinstance(val, str) for val in attrs['data'].columns):
                 return 'All data column names must be of type: str'
             data_changed = True
+            field_facts = {} if shared is None else shared.field_facts # Shared properties may have already been calculated by another widget
         if 'id_field' in state or data_changed:
             if 'id_field' in state:
                 attrs['id_field'] = state['id_field']
@@ -89,14 +349,18 @@ class DIVEData:
             elif attrs['time_field'] is not None:
                 if attrs['time_field'] not in attrs['data']:
                     return '"{}" is not a valid field name.'.format(attrs['time_field'])
-                time_vals = attrs['data'].loc[:, attrs['time_field']]
-                is_numeric = pd.api.types.is_numeric_dtype(time_vals)
-                if not pd.api.types.is_datetime64tz_dtype(time_vals) and (not is_numeric or pd.api.types.is_complex_dtype(time_vals)):
-                    return 'Time values must be one of the following types: numeric (not complex), pandas.Timestamp with tz'
-                elif is_numeric and not np.isfinite(time_vals).all():
-                    return 'Time values must all be finite.'
-                elif not time_vals.is_monotonic_increasing:
-                    return 'Time values must be monotonic increasing.'
+                err_msg = self.validate_time_field(field_facts, attrs['data'], attrs['time_field'])
+                if err_msg is not None:
+                    return err_msg
+            if source is not None:
+                if attrs['time_field'] is None:
+                    return 'A time_field must be given for partitioned data.'
+                err_msg = source.set_time_field(attrs['time_field'], lambda data: self.validate_time_field({}, data, attrs['time_field']))
+                if err_msg is not None:
+                    return err_msg
+                attrs['data'] = source.get_window_data((0, 0))
+                data_changed = True
+                field_facts = {}
         if 'selection' in state or data_changed:
             if 'selection' in state:
                 attrs['selection'] = state['selection']
@@ -109,21 +373,171 @@ class DIVEData:
                     attrs['selection'] = attrs['selection'].to_numpy()
                 elif isinstance(attrs['selection'], (list, tuple)):
                     attrs['selection'] = np.array(attrs['selection'])
-                else:
+                elif not isinstance(attrs['selection'], bit_mask.BitMask): # The current selection is already stored as a BitMask
                     return 'selection must be one of the following types: None, list, tuple, numpy.ndarray, pandas.Series'
-                if not pd.api.types.is_bool_dtype(attrs['selection']):
+                if not isinstance(attrs['selection'], bit_mask.BitMask) and not pd.api.types.is_bool_dtype(attrs['selection']):
                     return 'Values in selection must be of type: bool'
                 elif len(attrs['selection']) != len(attrs['data'].index):
                     return 'selection length doesn\'t match the length of the data.'
-                attrs['selection'] = copy.deepcopy(attrs['selection'])
+                if not isinstance(attrs['selection'], bit_mask.BitMask):
+                    attrs['selection'] = bit_mask.BitMask(attrs['selection'])
 
-        for attr in attrs:
-            setattr(self, attr, attrs[attr])
+        with self.index_lock:
+            for attr in attrs:
+                setattr(self, attr, attrs[attr])
+            if data_changed:
+                if shared is None:
+                    self.field_indices, self.index_threads, self.field_facts = {}, {}, field_facts
+                else: # The derived values are shared with every other data object in the store that uses the same data
+                    self.field_indices, self.index_threads, self.field_facts = shared.field_indices, shared.index_threads, shared.field_facts
+                    self.index_lock = shared.index_lock
+                self.source, self.window, self.shared = source, None if source is None else (0, 0), shared
+            if data_changed or 'time_field' in state:
+                if self.time_field is None:
+                    self.time_values = None
+                elif self.shared is None:
+                    self.time_values = self.calc_time_values(self.data.loc[:, self.time_field])
+                else:
+                    self.time_values = self.shared.get_time_values(self.time_field)
 
         if data_changed:
             self.reset_filter()
             if self.selection is not None and not selection_changed:
                 self.apply_selection(None)
+        self.prepare_field_index(self.id_field)
+
+    def update_window(self, current_time, hold_time=None):
+        """
+        Load the chunks of the partitioned data source that overlap the current time range.
+        Filters and the selection have to be recalculated if the data changes.
+
+        Parameters
+        ----------
+        current_time : None, numeric, pandas.Timestamp with tz
+            The current time value for the animation.
+        hold_time : None, numeric, pandas.Timedelta (Default: None)
+            The number of seconds prior to the current time that should be included.
+            If None, all chunks prior to the current time will be included.
+
+        Returns
+        -------
+        bool
+            Whether the data has changed.
+        """
+        window = self.get_window(current_time, hold_time)
+        if window is None or window == self.window:
+            return False
+        data = self.source.get_window_data(window)
+        with self.index_lock:
+            self.data, self.window = data, window
+            self.field_indices, self.index_threads, self.field_facts = {}, {}, {}
+            self.time_values = self.calc_time_values(data.loc[:, self.time_field])
+        self.reset_filter()
+        if self.selection is not None:
+            self.apply_selection(None)
+        self.prepare_field_index(self.id_field)
+        return True
+
+    @staticmethod
+    def calc_field_fact(values, fact):
+        """
+        Calculate a property of a field that is used for validation.
+
+        Parameters
+        ----------
+        values : pandas.Series
+            The values of the field.
+        fact : str
+            The name of the property. One of the following:
+
+            * dtype: The type of the values ("numeric", "complex", "datetime" for pandas.Timestamps with tz, or "other").
+            * finite: Whether all of the values are finite.
+            * monotonic: Whether the values are monotonic increasing.
+            * non_negative: Whether none of the values are less than 0.
+            * array_shapes: The shape of each value as a pandas.Series (None if any of the values aren't numpy arrays).
+
+        Returns
+        -------
+        object
+            The value of the property.
+        """
+        if fact == 'dtype':
+            if pd.api.types.is_datetime64tz_dtype(values):
+                return 'datetime'
+            elif pd.api.types.is_complex_dtype(values):
+                return 'complex'
+            return 'numeric' if pd.api.types.is_numeric_dtype(values) else 'other'
+        elif fact == 'finite':
+            return bool(np.isfinite(values).all())
+        elif fact == 'monotonic':
+            return bool(values.is_monotonic_increasing)
+        elif fact == 'non_negative':
+            return not values.min() < 0
+        elif fact == 'array_shapes':
+            if not values.map(lambda value: isinstance(value, np.ndarray)).all():
+                return None
+            return values.map(np.shape)
+        raise ValueError('"{}" is not a valid field fact.'.format(fact))
+
+    @staticmethod
+    def calc_field_index(data, field):
+        """
+        Calculate the distinct-value index for a field.
+        Values are compared by their str representation, the same way they are displayed in the filter dialogs.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+            The data containing the field.
+        field : str
+            The name of the field.
+
+        Returns
+        -------
+        dict
+            codes : numpy.ndarray
+                The code of the distinct value in each row of data.
+            strs : numpy.ndarray
+                The str representation of each distinct value, indexed by code.
+            first_idx : numpy.ndarray
+                The first row in data that contains each distinct value, indexed by code.
+            natural_idx : numpy.ndarray
+                The codes sorted by the natural order of "strs".
+        """
+        values = data.loc[:, field]
+        try:
+            codes, uniques = pd.factorize(values)
+            strs = pd.Series(uniques).astype('str')
+            if len(codes) > 0 and codes.min() < 0: # Null values are given their own code
+                codes = np.where(codes < 0, len(uniques), codes)
+                strs = pd.concat([strs, values.loc[values.isnull()].iloc[:1].astype('str')], ignore_index=True)
+            str_codes, strs = pd.factorize(strs) # Merge values that have the same str representation
+            codes = str_codes[codes]
+        except TypeError: # Unhashable values have to be converted to str first
+            codes, strs = pd.factorize(values.astype('str'))
+        strs = np.asarray(strs, dtype='object')
+        first_idx = np.unique(codes, return_index=True)[1]
+        natural_idx = np.array(sorted(range(len(strs)), key=lambda i: helper_functions.natural_order(strs[i])), dtype='int64')
+        return {'codes': codes, 'strs': strs, 'first_idx': first_idx, 'natural_idx': natural_idx}
+
+    @staticmethod
+    def calc_time_values(time_vals):
+        """
+        Convert time values to the representation used for time math (see "helper_functions.to_time_value").
+
+        Parameters
+        ----------
+        time_vals : pandas.Series
+            The time values (numeric or pandas.Timestamp with tz).
+
+        Returns
+        -------
+        numpy.ndarray
+            The time values as int64 nanoseconds since the epoch (UTC) or numeric values.
+        """
+        if pd.api.types.is_datetime64tz_dtype(time_vals):
+            return time_vals.to_numpy(dtype='datetime64[ns]').view('int64')
+        return time_vals.to_numpy()
 
     @staticmethod
     def get_time_limits(data_objs, use_filter=True):
@@ -151,9 +565,15 @@ class DIVEData:
         for data_obj in data_objs.values():
             if data_obj.time_field is None:
                 data_min, data_max = None, None
+            elif data_obj.source is not None: # Partitioned data only has part of its time range loaded
+                data_min, data_max = data_obj.source.time_limits
             else:
-                time_vals = data_obj.data.loc[data_obj.filtered_idx if use_filter else slice(None), data_obj.time_field]
-                data_min, data_max = time_vals.min(), time_vals.max()
+                time_vals = data_obj.data.loc[:, data_obj.time_field]
+                if use_filter: # Time values are monotonic increasing, so the limits are at the first and last rows in the filter
+                    first_idx, last_idx = data_obj.filtered_idx.first(), data_obj.filtered_idx.last()
+                    data_min, data_max = (None, None) if first_idx is None else (time_vals.iat[first_idx], time_vals.iat[last_idx])
+                else:
+                    data_min, data_max = time_vals.min(), time_vals.max()
                 data_min, data_max = None if pd.isna(data_min) else data_min, None if pd.isna(data_max) else data_max
             if data_min is not None:
                 if isinstance(data_min, pd.Timestamp):
@@ -167,4 +587,57 @@ class DIVEData:
                 else:
                     if data_min < min_time: min_time = data_min
                     if data_max > max_time: max_time = data_max
-        return min_time, max_time
\ No newline at end of file
+        return min_time, max_time
+
+    @staticmethod
+    def lookup_field_fact(field_facts, data, field, fact):
+        """
+        Get a property of a field from a cache of field properties, calculating and storing it if it isn't in the cache.
+
+        Parameters
+        ----------
+        field_facts : dict
+            The cached properties of each field in "data".
+        data : pandas.DataFrame
+            The data containing the field.
+        field : str
+            The name of the field.
+        fact : str
+            The name of the property (see "calc_field_fact").
+
+        Returns
+        -------
+        object
+            The value of the property.
+        """
+        facts = field_facts.setdefault(field, {})
+        if fact not in facts:
+            facts[fact] = DIVEData.calc_field_fact(data.loc[:, field], fact)
+        return facts[fact]
+
+    @staticmethod
+    def validate_time_field(field_facts, data, time_field):
+        """
+        Check that the values of a field can be used as time values.
+
+        Parameters
+        ----------
+        field_facts : dict
+            The cached properties of each field in "data" (see "lookup_field_fact").
+        data : pandas.DataFrame
+            The data containing the field.
+        time_field : str
+            The name of the time field.
+
+        Returns
+        -------
+        None, str
+            An error message if the values can't be used as time values.
+        """
+        time_dtype = DIVEData.lookup_field_fact(field_facts, data, time_field, 'dtype')
+        if time_dtype not in ['numeric', 'datetime']:
+            return 'Time values must be one of the following types: numeric (not complex), pandas.Timestamp with tz'
+        elif time_dtype == 'numeric' and not DIVEData.lookup_field_fact(field_facts, data, time_field, 'finite'):
+            return 'Time values must all be finite.'
+        elif not DIVEData.lookup_field_fact(field_facts, data, time_field, 'monotonic'):
+            return 'Time values must be monotonic increasing.'
\ No newline at end of file
@@ -0,0 +1,86 @@
+from . import dive_data
+from .._utilities import data_sources
+import pathlib
+import threading
+import weakref
+
+class DIVEDataStore:
+    """
+    This class is a store of data that can be shared by multiple DIVEWidgets in the same application.
+    Data is registered by reference, so each pandas.DataFrame (or on-disk data source path) is only held once,
+    and the values derived from it (distinct-value indices, validation properties and time values) are only calculated once
+    no matter how many widgets use it. Each widget still has its own filters and selection.
+
+    Data is kept in the store for as long as at least one widget has a data object that uses it.
+    Partitioned data sources aren't shared since each widget can have a different time range loaded.
+
+    pandas.DataFrames are registered by identity, so a registered pandas.DataFrame must not be modified in place while it is in the store.
+    If it is, it should be passed to "DIVEWidget.edit_data" again, which replaces its entry so that the derived values are recalculated.
+    """
+    def __init__(self):
+        self.entries = weakref.WeakValueDictionary()
+        self.lock = threading.Lock()
+
+    def get_shared_data(self, data, refresh=False):
+        """
+        Get the shared entry for a pandas.DataFrame or on-disk data source, creating it if needed.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame, str, pathlib.Path
+            The data (see "data_sources.load_data_source" for paths).
+        refresh : bool (Default: False)
+            Toggle whether the entry should be replaced by a new one (reloading data sources) even if it exists.
+            Data objects that already use the old entry keep using it.
+
+        Returns
+        -------
+        SharedData
+            The shared entry for the data.
+        """
+        if data_sources.is_data_source(data):
+            key = str(pathlib.Path(data).resolve())
+        else:
+            key = id(data)
+        with self.lock: # Sources are loaded while holding the lock so that two widgets adding the same path only load it once
+            shared = self.entries.get(key)
+            if refresh or shared is None or (not isinstance(key, str) and shared.data is not data):
+                shared = SharedData(data_sources.load_data_source(key) if isinstance(key, str) else data)
+                self.entries[key] = shared
+        return shared
+
+class SharedData:
+    """
+    This class holds data and the values derived from it that are shared by the data objects in a DIVEDataStore.
+    The derived values must not be modified once calculated (see "DIVEData").
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The data.
+    """
+    def __init__(self, data):
+        self.data = data
+        self.field_indices = {}
+        self.field_facts = {}
+        self.index_threads = {}
+        self.index_lock = threading.Lock()
+        self.time_values = {} # Holds the time values for each field that has been used as a time field
+
+    def get_time_values(self, time_field):
+        """
+        Get the time values for a field, calculating them if they haven't been calculated yet (see "DIVEData.calc_time_values").
+
+        Parameters
+        ----------
+        time_field : str
+            The name of the time field.
+
+        Returns
+        -------
+        numpy.ndarray
+            The time values.
+        """
+        if time_field not in self.time_values: # If two widgets calculate the same values at once, the first values to be stored are used by both
+            self.time_values.setdefault(time_field, dive_data.DIVEData.calc_time_values(self.data.loc[:, time_field]))
+        return self.time_values[time_field]
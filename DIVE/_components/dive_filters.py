@@ -1,8 +1,50 @@
-from .._utilities import helper_functions
+from .._utilities import bit_mask, helper_functions, memory
 import copy
 import numpy as np
+import operator
 import pandas as pd
 
+parallel_min_rows = 100000 # The minimum number of rows (summed over all of the filter groups) for the filter groups to be calculated in the thread pool. Below this, the overhead of the threads outweighs the speedup
+
+def expand_masks(filter_idx):
+    """
+    Convert the BitMasks in a dict of filter indices to bool arrays.
+
+    Parameters
+    ----------
+    filter_idx : dict
+        The filter indices for each data name.
+
+    Returns
+    -------
+    dict
+        The filter indices for each data name as bool arrays.
+    """
+    return {data_name: idx.to_bool() if isinstance(idx, bit_mask.BitMask) else idx for data_name, idx in filter_idx.items()}
+
+def get_filter_masks(filter_obj, data_objs, data_subset):
+    """
+    Calculate the filter indices of a filter group as BitMasks.
+    This is run in the thread pool from "helper_functions.get_thread_pool", so it must not modify the filter group or the data objects.
+
+    Parameters
+    ----------
+    filter_obj : DIVECustomFilter, DIVEIDFilter, DIVEValueFilter
+        The filter group.
+    data_objs : dict
+        The data objects that have been added to DIVE.
+    data_subset : None, array
+        The names of the data objects to calculate the filter indices for.
+        If None, the filter indices will be calculated for all data objects in the filter group.
+
+    Returns
+    -------
+    dict
+        The filter indices for each data name as BitMasks.
+    """
+    idx = filter_obj.get_filter_indices(data_objs, data_subset)
+    return {data_name: value if isinstance(value, bit_mask.BitMask) else bit_mask.BitMask(value) for data_name, value in idx.items()}
+
 class DIVECustomFilter:
     """
     This class stores a custom filter group.
@@ -14,15 +56,18 @@ class DIVECustomFilter:
         return list(self.values)
 
     def get_filter_indices(self, data_objs, data_subset):
+        # BitMasks are never modified in place, so they don't need to be copied
         if data_subset is None:
-            return copy.deepcopy(self.values)
+            return dict(self.values)
         else:
-            return {key: copy.deepcopy(value) for key, value in self.values.items() if key in data_subset}
+            return {key: value for key, value in self.values.items() if key in data_subset}
 
     def get_state(self, as_copy=True):
         state = {attr: getattr(self, attr, None) for attr in ['name', 'values', 'enabled']}
         state['values'] = dict(sorted(state['values'].items(), key=lambda item: helper_functions.natural_order(item[0])))
-        return copy.deepcopy(state) if as_copy else state
+        if as_copy:
+            return {attr: expand_masks(state[attr]) if attr == 'values' else copy.deepcopy(state[attr]) for attr in state}
+        return state
 
     def remove_data(self, name):
         if name is None:
@@ -50,6 +95,8 @@ class DIVECustomFilter:
                     return 'data names in values must be of type: str'
                 elif key not in data_objs:
                     return '"{}" is not a valid data name.'.format(key)
+                elif data_objs[key].source is not None:
+                    return 'Custom filters can\'t be applied to partitioned data ("{}").'.format(key)
                 if isinstance(value, np.ndarray):
                     if value.ndim > 1:
                         value = value.flatten()
@@ -57,13 +104,13 @@ class DIVECustomFilter:
                     value = value.to_numpy()
                 elif isinstance(value, (list, tuple)):
                     value = np.array(value)
-                else:
+                elif not isinstance(value, bit_mask.BitMask): # Current values are already stored as BitMasks
                     return 'Each value in values must be one of the following types: list, tuple, numpy.ndarray, pandas.Series'
-                if not pd.api.types.is_bool_dtype(value):
+                if not isinstance(value, bit_mask.BitMask) and not pd.api.types.is_bool_dtype(value):
                     return 'Array for "{}" must be of type: bool'.format(key)
                 elif len(value) != len(data_objs[key].data.index):
                     return 'Array length for "{}" doesn\'t match the length of the data.'.format(key)
-                values[key] = copy.deepcopy(value)
+                values[key] = value if isinstance(value, bit_mask.BitMask) else bit_mask.BitMask(value)
             attrs['values'] = values
         if 'enabled' in state:
             attrs['enabled'] = state['enabled']
@@ -92,12 +139,12 @@ class DIVEIDFilter:
         filter_idx = {}
         for data_name, value in self.values.items():
             if data_subset is None or data_name in data_subset:
-                id_vals = data_objs[data_name].data.loc[:, data_objs[data_name].id_field]
                 id_dtype = data_objs[data_name].data.dtypes.at[data_objs[data_name].id_field]
                 if not pd.api.types.is_numeric_dtype(id_dtype) and not pd.api.types.is_datetime64tz_dtype(id_dtype):
-                    id_vals = id_vals.astype('str')
-                    value = pd.Series(value, dtype='str')
-                filter_idx[data_name] = id_vals.isin(value).to_numpy()
+                    field_index = data_objs[data_name].get_field_index(data_objs[data_name].id_field)
+                    filter_idx[data_name] = np.isin(field_index['strs'], pd.Series(value, dtype='str').to_numpy())[field_index['codes']]
+                else:
+                    filter_idx[data_name] = data_objs[data_name].data.loc[:, data_objs[data_name].id_field].isin(value).to_numpy()
         return filter_idx
 
     def get_state(self, as_copy=True):
@@ -453,31 +500,68 @@ class DIVEFilters:
             err_msg = '"{}" is not a valid {} filter group name.'.format(name, filter_type)
         return filters, err_msg
 
-    def get_filter_indices(self, data_objs, filter_type, name, and_filters, data_subset):
+    def get_filter_indices(self, data_objs, filter_type, name, and_filters, data_subset, as_masks=False):
         filter_idx, err_msg = {}, None
         if filter_type is None:
-            logical_op = np.logical_and if and_filters else np.logical_or
+            logical_op = operator.and_ if and_filters else operator.or_
+            # ID filter groups are split by data object since each data object is filtered independently
+            tasks = []
             for filter_objs in [self.custom, self.ID, self.value]:
                 for filter_obj in filter_objs.values():
                     if filter_obj.enabled:
-                        idx = filter_obj.get_filter_indices(data_objs, data_subset)
-                        for data_name in idx:
-                            filter_idx[data_name] = logical_op(filter_idx[data_name], idx[data_name]) if data_name in filter_idx else idx[data_name]
+                        if isinstance(filter_obj, DIVEIDFilter):
+                            tasks.extend((filter_obj, [data_name]) for data_name in filter_obj.get_data_names() if data_subset is None or data_name in data_subset)
+                        else:
+                            tasks.append((filter_obj, data_subset))
+            n_rows = sum(len(data_objs[data_name].data.index) for filter_obj, subset in tasks if not isinstance(filter_obj, DIVECustomFilter) for data_name in (filter_obj.get_data_names() if subset is None else subset) if data_name in data_objs)
+            if len(tasks) > 1 and n_rows >= parallel_min_rows:
+                pool = helper_functions.get_thread_pool()
+                results = [future.result() for future in [pool.submit(get_filter_masks, filter_obj, data_objs, subset) for filter_obj, subset in tasks]]
+            else:
+                results = [get_filter_masks(filter_obj, data_objs, subset) for filter_obj, subset in tasks]
+            for idx in results: # The results are combined in the same order as the filter groups so that the output doesn't depend on which task finishes first
+                for data_name in idx:
+                    filter_idx[data_name] = logical_op(filter_idx[data_name], idx[data_name]) if data_name in filter_idx else idx[data_name]
             for data_name in sorted(list(filter_idx), key=helper_functions.natural_order):
                 filter_idx[data_name] = filter_idx.pop(data_name)
+            if not as_masks:
+                filter_idx = expand_masks(filter_idx)
         else:
             filter_objs = getattr(self, filter_type)
             if not isinstance(name, (type(None), str)):
                 err_msg = 'name must be one of the following types: None, str'
             elif name is None:
                 filter_names = sorted(list(filter_objs), key=helper_functions.natural_order)
-                filter_idx = [{'name': filter_name, 'indices': filter_objs[filter_name].get_filter_indices(data_objs, data_subset)} for filter_name in filter_names]
+                filter_idx = [{'name': filter_name, 'indices': expand_masks(filter_objs[filter_name].get_filter_indices(data_objs, data_subset))} for filter_name in filter_names]
             elif name in filter_objs:
-                filter_idx = filter_objs[name].get_filter_indices(data_objs, data_subset)
+                filter_idx = expand_masks(filter_objs[name].get_filter_indices(data_objs, data_subset))
             else:
                 err_msg = '"{}" is not a valid {} filter group name.'.format(name, filter_type)
         return filter_idx, err_msg
 
+    def get_memory_usage(self, seen):
+        """
+        Estimate the memory used by the values of each filter group.
+
+        Parameters
+        ----------
+        seen : set
+            The keys of the arrays that have already been counted (see "memory.get_nbytes").
+
+        Returns
+        -------
+        dict
+            The bytes used by each filter group name for each filter type.
+        """
+        usage = {'custom': {}, 'ID': {}, 'value': {}}
+        for name, filter_obj in self.custom.items():
+            usage['custom'][name] = memory.get_nbytes(filter_obj.values, seen)
+        for name, filter_obj in self.ID.items():
+            usage['ID'][name] = memory.get_nbytes(filter_obj.values, seen)
+        for name, filter_obj in self.value.items():
+            usage['value'][name] = memory.get_nbytes(filter_obj.filters, seen)
+        return usage
+
     def remove_data(self, name):
         for filter_objs in [self.custom, self.ID, self.value]:
             for filter_obj in filter_objs.values():
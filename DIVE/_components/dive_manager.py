@@ -1,11 +1,13 @@
-from . import dive_axis, dive_axis_group, dive_data, dive_filters, dive_table_row
+from . import dive_axis, dive_axis_group, dive_data, dive_data_store, dive_filters, dive_table_row
 from .._gui import custom_qt, dialogs
 from .._plotting import custom_vispy
-from .._utilities import helper_functions
+from .._utilities import data_sources, helper_functions, memory, video_encoders
 import importlib
 import numpy as np
+import os
 import pandas as pd
 import pathlib
+import pickle
 import pytz
 import vispy as vp
 import vispy.app as vpapp
@@ -18,10 +20,6 @@ try:
 except:
     pass
 del qt
-try:
-    import cv2
-except:
-    pass
 try:
     import pint
 except:
@@ -31,6 +29,8 @@ try:
 except:
     pass
 
+memory_check_interval = 5000 # The number of milliseconds between checks of the memory budget
+
 class DIVEManager:
     """
     This class manages the GUI for DIVE and handles all function calls from the DIVEWidget.
@@ -40,7 +40,7 @@ class DIVEManager:
     widget : DIVEWidget
         The DIVEWidget to be managed.
     """
-    def __init__(self, widget, unit_reg):
+    def __init__(self, widget, unit_reg, data_store):
         vp.use(gl='gl2')
         self.widget = widget
         self.widget.setLayout(qtwidgets.QVBoxLayout())
@@ -52,13 +52,25 @@ class DIVEManager:
         self.axes = {}
         self.axis_groups = {}
         self.data = {}
+        self.data_store = None
+        if isinstance(data_store, dive_data_store.DIVEDataStore):
+            self.data_store = data_store
+        elif data_store is not None:
+            helper_functions.print_error('Invalid data_store. data_store must be one of the following types: None, DIVEDataStore')
         self.table_rows = []
 
         self.filters = dive_filters.DIVEFilters()
         self.timer = qtcore.QTimer()
         self.timer.timeout.connect(self.callback_timer)
+        self.memory_timer = qtcore.QTimer()
+        self.memory_timer.timeout.connect(self.enforce_memory_budget)
+        self.last_memory_check = next(dive_data.field_index_clock) # Distinct-value indices used after this aren't discarded by the memory budget
+        self.memory_budget_warned = False
         self.reverse_animation = self.recording = False
+        self.update_depth = 0 # The number of nested batch updates that are in progress
+        self.reset_pending_updates()
         self.min_time = self.max_time = self.current_time = None
+        self.min_time_value = self.max_time_value = self.current_time_value = None # The time limits and current time as int64 nanoseconds (for pandas.Timestamps) or numeric values
         self.settings = {'time_step': 1.0,
                          'fps': 10,
                          'hold_time': 30.0,
@@ -73,7 +85,8 @@ class DIVEManager:
                          'axis_label_size': 14,
                          'axis_tick_size': 10,
                          'apply_limits_filter': True,
-                         'and_filters': True}
+                         'and_filters': True,
+                         'memory_budget': None}
         if 'qdarkstyle' not in globals():
             self.settings['gui_theme'] = 'default'
 
@@ -136,10 +149,9 @@ class DIVEManager:
         screenshot_action = qtwidgets.QAction('Take Screenshot', self.toolbar)
         screenshot_action.triggered.connect(self.callback_screenshot)
         self.toolbar.addAction(screenshot_action)
-        if 'cv2' in globals():
-            record_action = qtwidgets.QAction('Record Video', self.toolbar)
-            record_action.triggered.connect(self.callback_record)
-            self.toolbar.addAction(record_action)
+        record_action = qtwidgets.QAction('Record Video', self.toolbar)
+        record_action.triggered.connect(self.callback_record)
+        self.toolbar.addAction(record_action)
 
         # Setup the widgets that are visible when taking a screenshot or recording a video
         self.picture_widget = qtwidgets.QWidget()
@@ -154,6 +166,7 @@ class DIVEManager:
         self.legend.setFocusPolicy(qtcore.Qt.NoFocus)
         self.legend.setSelectionMode(qtwidgets.QAbstractItemView.NoSelection)
         self.legend.setIconSize(qtcore.QSize(32, 32))
+        self.legend_key = None # Used to skip updating the legend when its entries could not have changed
         splitter.addWidget(self.legend)
 
         self.canvas = custom_vispy.Canvas(self.callback_selection)
@@ -240,6 +253,49 @@ class DIVEManager:
             if data_obj.selection is None and has_selection:
                 data_obj.apply_selection(None)
 
+    def enforce_memory_budget(self):
+        """
+        Discard derived values until the estimated memory used by DIVE is within the "memory_budget" setting.
+        The values that are cheapest to recalculate are discarded first: cached tick labels and artist buffers,
+        then the cached chunks of partitioned data outside of the current window, then distinct-value indices in least recently used order.
+        Distinct-value indices that have been used since the last check (such as the index of the ID field during an animation) are kept so that they aren't rebuilt every few seconds.
+        The data, filters, selections and chunks in the current window are never discarded, so nothing is discarded and a warning is printed if they need more memory than the budget allows.
+        """
+        if self.settings['memory_budget'] is None or self.canvas.busy:
+            return
+        budget = self.settings['memory_budget'] * 2 ** 20
+        last_check, self.last_memory_check = self.last_memory_check, next(dive_data.field_index_clock)
+        if self.get_memory_usage()['total'] <= budget:
+            self.memory_budget_warned = False
+            return
+        seen = set()
+        usage = memory.sum_nbytes(self.filters.get_memory_usage(seen)) + sum(memory.sum_nbytes(data_obj.get_memory_usage(seen, False)) for data_obj in self.data.values())
+        if usage <= budget: # Otherwise discarding the caches, chunks and indices can't meet the budget and they would just have to be rebuilt
+            self.canvas.clear_caches()
+            for data_obj in self.data.values():
+                if data_obj.source is not None:
+                    data_obj.source.evict_chunks(data_obj.window)
+            seen = set()
+            usage = self.get_memory_usage(seen, discardable=False)['total'] # Measured first so that arrays that are also used elsewhere (such as by artists) aren't counted as memory that discarding an index frees
+            fixed_usage = usage
+            field_uses = []
+            for data_obj in self.data.values():
+                for last_use, field, nbytes in data_obj.get_field_index_uses(seen):
+                    usage += nbytes
+                    if last_use < last_check:
+                        field_uses.append((last_use, field, nbytes, data_obj))
+            if fixed_usage <= budget:
+                for _, field, nbytes, data_obj in sorted(field_uses, key=lambda item: item[0]):
+                    if usage <= budget:
+                        break
+                    data_obj.remove_field_index(field)
+                    usage -= nbytes
+        if usage <= budget:
+            self.memory_budget_warned = False
+        elif not self.memory_budget_warned: # Only warn once until the budget is met again
+            self.memory_budget_warned = True
+            helper_functions.print_error('Cannot stay within the memory budget of {} MB. DIVE is using an estimated {:.1f} MB that can\'t be discarded.'.format(self.settings['memory_budget'], usage / 2 ** 20))
+
     def get_hold_time(self):
         if isinstance(self.min_time, pd.Timestamp):
             return pd.Timedelta.max if self.settings['hold_time'] == 0 else pd.Timedelta(self.settings['hold_time'], unit='S')
@@ -249,23 +305,62 @@ class DIVEManager:
     def get_time_step(self):
         return pd.Timedelta(self.settings['time_step'], unit='S') if isinstance(self.min_time, pd.Timestamp) else self.settings['time_step']
 
-    def grab_picture(self):
+    def get_time_step_value(self):
+        return int(round(self.settings['time_step'] * 1e9)) if isinstance(self.min_time, pd.Timestamp) else self.settings['time_step']
+
+    def grab_canvas(self):
+        return qtgui.QPixmap.fromImage(self.canvas.native.grabFramebuffer())
+
+    def grab_picture(self, canvas_pixmap=None):
         """
         Return an image of the widgets that are visible when taking a screenshot or recording a video.
 
+        Parameters
+        ----------
+        canvas_pixmap : None, QPixmap (Default: None)
+            A previous image of the canvas to use instead of grabbing the canvas again.
+
         Returns
         -------
         QPixmap
             The image data for the picture_widget.
         """
         pixmap = self.picture_widget.grab()
-        canvas_pixmap = qtgui.QPixmap.fromImage(self.canvas.native.grabFramebuffer())
+        if canvas_pixmap is None:
+            canvas_pixmap = self.grab_canvas()
         painter = qtgui.QPainter(pixmap)
         painter.setCompositionMode(qtgui.QPainter.CompositionMode_Source)
         painter.drawPixmap(self.canvas.native.pos(), canvas_pixmap)
         painter.end()
         return pixmap
 
+    def recreate_grid_cell(self, axis_obj):
+        """
+        Recreate the grid cell for an axis.
+        If a batch update is in progress, the grid cell will be recreated when the batch update ends.
+
+        Parameters
+        ----------
+        axis_obj : DIVEAxis
+            The axis object to recreate the grid cell for.
+
+        Returns
+        -------
+        bool
+            Toggle whether the canvas needs to be updated.
+        """
+        if self.update_depth > 0:
+            self.pending_updates['grid_cells'].add(axis_obj.name)
+            self.update_canvas()
+            return False
+        return self.canvas.recreate_grid_cell(self.data, axis_obj, self.settings['apply_limits_filter'])
+
+    def reset_pending_updates(self):
+        """
+        Clear the refreshes that have been deferred by a batch update.
+        """
+        self.pending_updates = {'grid_cells': set(), 'filters_changed': False, 'limits_changed': False, 'data_subset': set(), 'canvas': None, 'table': False}
+
     def set_clock(self):
         """
         Set the clock to the current time range.
@@ -291,8 +386,7 @@ class DIVEManager:
         Set the visibility of the widgets that control the animation.
         """
         visible = self.min_time is not None
-        if 'cv2' in globals():
-            self.toolbar.actions()[-1].setEnabled(visible) # The record video button
+        self.toolbar.actions()[-1].setEnabled(visible) # The record video button
         self.control_bar.setVisible(visible)
 
     def set_font_sizes(self):
@@ -337,6 +431,9 @@ class DIVEManager:
                 action.setIcon(qtgui.QIcon(str(resource_path / '{}_{}.svg'.format(action_names.pop(0), theme))))
 
     def update_canvas(self, time_updated=False):
+        if self.update_depth > 0:
+            self.pending_updates['canvas'] = time_updated if self.pending_updates['canvas'] is None else self.pending_updates['canvas'] and time_updated
+            return
         if not time_updated:
             self.update_legend()
         self.canvas.update_axes(self.data, self.axes, self.current_time, self.get_hold_time(), self.settings['timezone'], self.unit_reg, time_updated=time_updated)
@@ -355,12 +452,19 @@ class DIVEManager:
             The names of the data objects to recalculate the filter indices for.
             If None, all data objects will have their filter indices recalculated.
         """
+        if self.update_depth > 0:
+            if filters_changed:
+                pending_subset = self.pending_updates['data_subset']
+                self.pending_updates['data_subset'] = None if data_subset is None or pending_subset is None else pending_subset.union(data_subset)
+            self.pending_updates['filters_changed'] |= filters_changed
+            self.pending_updates['limits_changed'] |= limits_changed
+            return
         if filters_changed or limits_changed:
             if filters_changed:
                 data_names = list(self.data) if data_subset is None else data_subset
                 for data_name in data_names:
                     self.data[data_name].reset_filter()
-                filter_idx = self.get_filter_indices(None, None, data_subset=data_subset)
+                filter_idx, _ = self.filters.get_filter_indices(self.data, None, None, self.settings['and_filters'], data_subset, as_masks=True)
                 for data_name in filter_idx:
                     self.data[data_name].apply_filter(filter_idx[data_name])
 
@@ -371,15 +475,29 @@ class DIVEManager:
             self.update_table()
 
     def update_legend(self):
-        self.legend.clear()
-        entries = self.canvas.get_legend(self.data, self.axes, self.settings['apply_limits_filter'])
-        for entry in entries:
-            item = custom_qt.CompactTreeWidgetItem(parent=self.legend, text=entry[0])
-            item.setIcon(0, qtgui.QIcon(qtgui.QPixmap.fromImage(qtgui.QImage.fromData(entry[1].encode()))))
-            item.setExpanded(True)
-            for subentry in entry[2]:
-                subitem = custom_qt.CompactTreeWidgetItem(parent=item, text=subentry[0], enable_flags=[qtcore.Qt.ItemNeverHasChildren])
-                subitem.setIcon(0, qtgui.QIcon(qtgui.QPixmap.fromImage(qtgui.QImage.fromData(subentry[1].encode()))))
+        """
+        Update the legend entries.
+        Existing legend items are reused and only have their text/icon changed if needed.
+        """
+        legend_key = self.canvas.get_legend_key(self.settings['apply_limits_filter'])
+        if legend_key != self.legend_key:
+            self.legend_key = legend_key
+            entries = self.canvas.get_legend(self.data, self.axes, self.settings['apply_limits_filter'])
+            for i, entry in enumerate(entries):
+                item = self.legend.topLevelItem(i)
+                if item is None:
+                    item = custom_qt.CompactTreeWidgetItem(parent=self.legend)
+                custom_qt.set_item_info(item, entry[0], entry[1])
+                for j, subentry in enumerate(entry[2]):
+                    subitem = item.child(j)
+                    if subitem is None:
+                        subitem = custom_qt.CompactTreeWidgetItem(parent=item, enable_flags=[qtcore.Qt.ItemNeverHasChildren])
+                    custom_qt.set_item_info(subitem, subentry[0], subentry[1])
+                for j in reversed(range(len(entry[2]), item.childCount())):
+                    item.removeChild(item.child(j))
+                item.setExpanded(True)
+            for i in reversed(range(len(entries), self.legend.topLevelItemCount())):
+                self.legend.takeTopLevelItem(i)
         self.set_splitter_visible()
 
     def update_limit_buttons(self):
@@ -407,6 +525,9 @@ class DIVEManager:
             The index of the table row to update.
             If None, all rows will be updated.
         """
+        if self.update_depth > 0:
+            self.pending_updates['table'] = True
+            return
         change_idx = {}
         table_change_time = pd.Timedelta(self.settings['table_change_time'], unit='S') if isinstance(self.min_time, pd.Timestamp) else self.settings['table_change_time']
         rows = range(len(self.table_rows)) if row_index is None else [row_index]
@@ -426,7 +547,9 @@ class DIVEManager:
         Update the widgets that can set the current time.
         """
         if self.min_time is not None:
-            time_delta = self.current_time.timestamp() - self.min_time.timestamp() if isinstance(self.min_time, pd.Timestamp) else self.current_time - self.min_time
+            time_delta = self.current_time_value - self.min_time_value
+            if isinstance(self.min_time, pd.Timestamp):
+                time_delta /= 1e9
             self.time_slider.blockSignals(True)
             self.time_slider.setValue(int(np.ceil(time_delta)))
             self.time_slider.blockSignals(False)
@@ -440,8 +563,11 @@ class DIVEManager:
         self.min_time, self.max_time, self.current_time = helper_functions.safe_tz_convert(self.min_time, self.settings['timezone']), helper_functions.safe_tz_convert(self.max_time, self.settings['timezone']), helper_functions.safe_tz_convert(self.current_time, self.settings['timezone'])
         if self.min_time is None:
             self.current_time = None
-        else:
-            time_delta = self.max_time.timestamp() - self.min_time.timestamp() if isinstance(self.min_time, pd.Timestamp) else self.max_time - self.min_time
+        self.min_time_value, self.max_time_value, self.current_time_value = helper_functions.to_time_value(self.min_time), helper_functions.to_time_value(self.max_time), helper_functions.to_time_value(self.current_time)
+        if self.min_time is not None:
+            time_delta = self.max_time_value - self.min_time_value
+            if isinstance(self.min_time, pd.Timestamp):
+                time_delta /= 1e9
             self.time_slider.setRange(0, int(np.ceil(time_delta)))
             self.date_edit.set_limits(self.min_time, self.max_time)
             if self.current_time is None or isinstance(self.current_time, pd.Timestamp) != isinstance(self.min_time, pd.Timestamp) or self.current_time < self.min_time:
@@ -479,7 +605,7 @@ class DIVEManager:
                         if self.canvas.axes[0].state['name'] in removed_names:
                             self.display_axis(None)
                         else:
-                            self.canvas.recreate_grid_cell(self.data, self.axes[self.canvas.axes[0].state['name']], self.settings['apply_limits_filter'])
+                            self.recreate_grid_cell(self.axes[self.canvas.axes[0].state['name']])
                             self.update_canvas()
                 else:
                     self.edit_axis_group(self.canvas.current_axis_group['name'], {})
@@ -498,7 +624,7 @@ class DIVEManager:
             for data_name in self.data:
                 data_obj = self.data[data_name]
                 if data_obj.selection is not None:
-                    selection[data_name] = data_obj.selection
+                    selection[data_name] = data_obj.selection.to_bool()
             selection, ok = dialogs.SelectDataDialog.get_selected(self.widget, self.data, self.settings['timezone'], selection)
             if ok:
                 if len(selection) == 0:
@@ -556,7 +682,7 @@ class DIVEManager:
 
     def callback_record(self):
         if not self.recording:
-            details, ok = dialogs.RecordDialog.get_video_details(self.widget, self.min_time, self.max_time, self.settings['fps'])
+            details, ok = dialogs.RecordDialog.get_video_details(self.widget, self.min_time, self.max_time, self.settings['fps'], video_encoders.get_available_encoders())
             if ok:
                 self.record_video(**details)
 
@@ -579,18 +705,22 @@ class DIVEManager:
 
     def callback_settings(self):
         if not self.recording:
-            settings, ok = dialogs.SettingsDialog.get_settings(self.widget, 'qdarkstyle' in globals(), **self.settings.copy())
+            settings, ok = dialogs.SettingsDialog.get_settings(self.widget, 'qdarkstyle' in globals(), **{key: value for key, value in self.settings.items() if key != 'memory_budget'}) # The memory budget can only be set through the API
             if ok:
                 self.set_settings(settings)
 
     def callback_time_slider(self, time):
-        self.set_current_time(helper_functions.safe_time_math(self.min_time, pd.Timedelta(time, unit='S') if isinstance(self.min_time, pd.Timestamp) else time, add=True))
+        self.set_current_time_value(self.min_time_value + (time * 1000000000 if isinstance(self.min_time, pd.Timestamp) else time))
 
     def callback_timer(self):
-        time = helper_functions.safe_time_math(self.current_time, self.get_time_step(), add=not self.reverse_animation)
-        if time <= self.min_time or time >= self.max_time:
+        if self.canvas.busy: # The canvas is waiting for axis limits, so this frame is skipped
+            return
+        # Playback only does math on the internal time values, a pandas.Timestamp is only created for display
+        time_step = self.get_time_step_value()
+        time = self.current_time_value - time_step if self.reverse_animation else self.current_time_value + time_step
+        if time <= self.min_time_value or time >= self.max_time_value:
             self.set_animation_state(False)
-        self.set_current_time(time)
+        self.set_current_time_value(time)
 
     def callback_toolbar_group(self, action):
         if action.text() == 'Pan':
@@ -612,7 +742,7 @@ class DIVEManager:
             axis_obj = self.axes[axis_name]
             err_msg = axis_obj.add_artist(self.data, artist_type, self.unit_reg, state)
             if err_msg is None:
-                need_update = self.canvas.recreate_grid_cell(self.data, axis_obj, self.settings['apply_limits_filter'])
+                need_update = self.recreate_grid_cell(axis_obj)
                 if need_update:
                     self.update_canvas()
             else:
@@ -642,7 +772,7 @@ class DIVEManager:
         if self.recording:
             helper_functions.print_error('Cannot add data. A video recording is in progress.')
         else:
-            data_obj = dive_data.DIVEData()
+            data_obj = dive_data.DIVEData(self.data_store)
             data_names = list(self.data)
             err_msg = data_obj.set_state(data_names, state)
             if err_msg is None:
@@ -702,6 +832,9 @@ class DIVEManager:
         else:
             helper_functions.print_error('Cannot reset axis limits. "{}" is not a valid axis name.'.format(name))
 
+    def begin_update(self):
+        self.update_depth += 1
+
     def display_axis(self, name):
         if not isinstance(name, (type(None), str)):
             helper_functions.print_error('Cannot display axis. name must be one of the following types: None, str')
@@ -731,9 +864,16 @@ class DIVEManager:
             helper_functions.print_error('Cannot edit artist. axis_name must be of type: str')
         elif axis_name in self.axes:
             axis_obj = self.axes[axis_name]
+            old_state = axis_obj.artists[name].get_state() if name in axis_obj.artists else None
             err_msg = axis_obj.edit_artist(self.data, name, self.unit_reg, state)
             if err_msg is None:
-                need_update = self.canvas.recreate_grid_cell(self.data, axis_obj, self.settings['apply_limits_filter'])
+                impact = axis_obj.artists[name].get_edit_impact(old_state)
+                if impact is None:
+                    return
+                elif impact == 'limits' or self.update_depth > 0: # Only edits that can change the axis limits need the grid cell to be recreated
+                    need_update = self.recreate_grid_cell(axis_obj)
+                else:
+                    need_update = self.canvas.edit_artist(self.data, axis_obj, name, impact, self.settings['apply_limits_filter'])
                 if need_update:
                     self.update_canvas()
             else:
@@ -791,7 +931,7 @@ class DIVEManager:
                         self.remove_table_row(i)
                 if self.canvas.current_axis_group is None:
                     if len(self.canvas.axes) > 0:
-                        self.canvas.recreate_grid_cell(self.data, self.axes[self.canvas.axes[0].state['name']], self.settings['apply_limits_filter'])
+                        self.recreate_grid_cell(self.axes[self.canvas.axes[0].state['name']])
                 else:
                     self.canvas.edit_axis_group(self.data, self.axes, self.axis_groups[self.canvas.current_axis_group['name']], self.settings['apply_limits_filter'])
                 self.update_filters(filters_changed=True)
@@ -841,6 +981,26 @@ class DIVEManager:
             else:
                 helper_functions.print_error('Cannot edit table row. {}'.format(err_msg))
 
+    def end_update(self):
+        if self.update_depth == 0:
+            helper_functions.print_error('Cannot end update. A batch update is not in progress.')
+            return
+        self.update_depth -= 1
+        if self.update_depth == 0:
+            pending_updates = self.pending_updates
+            self.reset_pending_updates()
+            for axis_name in pending_updates['grid_cells']:
+                if axis_name in self.axes:
+                    self.canvas.recreate_grid_cell(self.data, self.axes[axis_name], self.settings['apply_limits_filter'])
+            if pending_updates['filters_changed'] or pending_updates['limits_changed']: # Also updates the canvas and table
+                data_subset = None if pending_updates['data_subset'] is None else [data_name for data_name in pending_updates['data_subset'] if data_name in self.data]
+                self.update_filters(filters_changed=pending_updates['filters_changed'], limits_changed=pending_updates['limits_changed'], data_subset=data_subset)
+            else:
+                if pending_updates['canvas'] is not None:
+                    self.update_canvas(time_updated=pending_updates['canvas'])
+                if pending_updates['table']:
+                    self.update_table()
+
     def get_animation_direction(self):
         return self.reverse_animation
 
@@ -912,6 +1072,15 @@ class DIVEManager:
         mode_names = ['pan', 'zoom', 'rectangle', 'ellipse', 'lasso']
         return mode_names[self.toolbar_group.actions().index(self.toolbar_group.checkedAction())]
 
+    def get_memory_usage(self, seen=None, discardable=True):
+        if seen is None:
+            seen = set() # Arrays that are shared (such as data shared through a DIVEDataStore) are only counted once
+        usage = {'data': {name: data_obj.get_memory_usage(seen, discardable) for name, data_obj in self.data.items()}, 'filters': self.filters.get_memory_usage(seen)}
+        canvas_usage = self.canvas.get_memory_usage(seen)
+        usage['artists'], usage['caches'] = canvas_usage['artists'], {'tick_cache': canvas_usage['tick_cache'], 'unit_conversions': memory.get_nbytes(helper_functions.unit_conversions, seen)}
+        usage['total'] = memory.sum_nbytes(usage)
+        return usage
+
     def get_recording_state(self):
         return self.recording
 
@@ -935,13 +1104,95 @@ class DIVEManager:
     def get_time_limits(self):
         return self.min_time, self.max_time
 
-    def record_video(self, file_path, start_time, stop_time, fps):
+    def load_session(self, file_path):
+        err_msg = None
+        if self.recording:
+            err_msg = 'A video recording is in progress.'
+        elif self.update_depth > 0:
+            err_msg = 'A batch update is in progress.'
+        elif not isinstance(file_path, str):
+            err_msg = 'file_path must be of type: str'
+        else:
+            p = pathlib.Path(file_path)
+            try:
+                with open(p / 'session.pickle', 'rb') as f:
+                    session = pickle.load(f)
+            except Exception as error:
+                err_msg = '"{}" isn\'t a valid session. {}'.format(file_path, error)
+        if err_msg is not None:
+            helper_functions.print_error('Cannot load session. {}'.format(err_msg))
+            return
+
+        self.set_animation_state(False)
+        self.begin_update()
+        try:
+            self.remove_table_row(None)
+            self.remove_axis_group(None)
+            self.remove_axis(None)
+            for filter_type in ['custom', 'ID', 'value']:
+                self.remove_filter(filter_type, None)
+            self.remove_data(None)
+            self.set_settings(session['settings'])
+            self.pending_updates['filters_changed'], self.pending_updates['data_subset'] = False, set() # The saved filter indices are restored below
+            partitioned_names = []
+            for i, data_state in enumerate(session['data']):
+                source_state = data_state['source']
+                data_obj = dive_data.DIVEData(self.data_store)
+                if source_state is None: # The saved columns, filter indices and distinct-value indices are used without being validated or recalculated
+                    data_obj.restore_state(data_sources.load_columns(p / 'data_{}'.format(i), data_state['columns']), data_state)
+                else:
+                    data_obj.max_chunks = source_state[1]
+                    err_msg = data_obj.set_state([], {'name': data_state['name'], 'data': source_state[0], 'id_field': data_state['id_field'], 'time_field': data_state['time_field']})
+                    if err_msg is not None:
+                        helper_functions.print_error('Cannot load data "{}". {}'.format(data_state['name'], err_msg))
+                        continue
+                    partitioned_names.append(data_obj.name)
+                self.data[data_obj.name] = data_obj
+            self.data = dict(sorted(self.data.items(), key=lambda item: helper_functions.natural_order(item[0])))
+            for axis_state in session['axes']:
+                self.add_axis(axis_state)
+            for axis_group_state in session['axis_groups']:
+                self.add_axis_group(axis_group_state)
+            # Display the axis before the artists are added so that its grid cell is only created once when the batch update ends
+            if session['display'] is not None:
+                getattr(self, 'display_{}'.format(session['display'][0]))(session['display'][1])
+            for axis_name, artist_states in session['artists'].items():
+                for artist_state in artist_states:
+                    artist_state = dict(artist_state)
+                    self.add_artist(axis_name, artist_state.pop('artist_type'), artist_state)
+            for filter_type, filter_states in session['filters'].items():
+                for filter_state in filter_states:
+                    err_msg = self.filters.add_filter(self.data, filter_type, filter_state)
+                    if err_msg is not None:
+                        helper_functions.print_error('Cannot load {} filter group. {}'.format(filter_type, err_msg))
+            if len(partitioned_names) > 0: # Partitioned data is loaded from its source, so its filters have to be recalculated
+                self.update_filters(filters_changed=True, data_subset=partitioned_names)
+            for table_row_state in session['table_rows']:
+                self.add_table_row(table_row_state)
+            self.update_time_limits()
+            if session['current_time'] is not None and self.min_time is not None:
+                self.set_current_time(session['current_time'])
+            self.set_animation_direction(session['reverse_animation'])
+            self.set_interact_mode(session['interact_mode'])
+        except Exception as error: # Such as missing data files
+            helper_functions.print_error('Cannot load session. "{}" isn\'t a valid session. {}'.format(file_path, error))
+        finally:
+            self.end_update()
+
+    def record_video(self, file_path, start_time, stop_time, fps, encoder):
         err_msg = None
+        available_encoders = video_encoders.get_available_encoders()
 
-        if 'cv2' not in globals():
-            err_msg = 'The "opencv-python" module must be installed in order to record a video.'
-        elif self.recording:
+        if self.recording:
             err_msg = 'A video recording is in progress.'
+        elif self.update_depth > 0:
+            err_msg = 'A batch update is in progress.'
+        elif not isinstance(encoder, (type(None), str)):
+            err_msg = 'encoder must be one of the following types: None, str'
+        elif encoder is not None and encoder not in ['opencv', 'ffmpeg', 'png', 'npy']:
+            err_msg = 'encoder must be one of the following values: None, opencv, ffmpeg, png, npy'
+        elif encoder is not None and encoder not in available_encoders:
+            err_msg = 'The "{}" encoder isn\'t available. {}'.format(encoder, 'The "opencv-python" module must be installed.' if encoder == 'opencv' else 'The ffmpeg executable must be on the PATH.')
         elif not isinstance(file_path, str):
             err_msg = 'file_path must be of type: str'
         else:
@@ -951,12 +1202,18 @@ class DIVEManager:
                 valid = p.parent.exists()
             except:
                 valid = False
-            if valid:
-                if p.suffix.lower() != '.mp4':
+            if not valid:
+                err_msg = '"{}" isn\'t a valid file path.'.format(file_path)
+            elif encoder is None and available_encoders[0] not in ['opencv', 'ffmpeg'] and p.suffix != '': # A video file was expected, so a directory of frames isn't written in its place
+                err_msg = 'A video encoder isn\'t available. The "opencv-python" module must be installed or the ffmpeg executable must be on the PATH. Set encoder to "png" or "npy" to save the frames to a directory instead.'
+            else:
+                if encoder is None:
+                    encoder = available_encoders[0] if available_encoders[0] in ['opencv', 'ffmpeg'] else 'png'
+                if encoder in ['opencv', 'ffmpeg'] and p.suffix.lower() != '.mp4':
                     p = p.parent / (p.name + '.mp4')
+                elif encoder in ['png', 'npy'] and p.exists() and not p.is_dir():
+                    err_msg = '"{}" must be a directory when frames are saved as {} files.'.format(file_path, encoder.upper())
                 file_path = str(p)
-            else:
-                err_msg = '"{}" isn\'t a valid file path.'.format(file_path)
         if err_msg is None:
             times = [start_time, stop_time]
             for i in range(2):
@@ -987,40 +1244,49 @@ class DIVEManager:
         if err_msg is None:
             self.set_animation_state(False)
             orig_time = self.current_time
-            time_step = self.get_time_step()
-            is_timestamp = isinstance(self.min_time, pd.Timestamp)
+            time_step = self.get_time_step_value()
+            start_time, stop_time = helper_functions.to_time_value(start_time), helper_functions.to_time_value(stop_time)
             min_size, max_size = self.widget.minimumSize(), self.widget.maximumSize()
             self.progress_bar.setValue(self.progress_bar.minimum())
             self.control_bar.setCurrentIndex(1)
             self.widget.setFixedSize(self.widget.size())
 
-            frames, time = [], start_time
-            self.recording = True
+            try:
+                video = video_encoders.create_encoder(encoder, file_path, fps)
+            except Exception as error:
+                video = None
+                print(error)
+            time = start_time
+            hold_time = self.get_hold_time()
+            canvas_key = canvas_pixmap = write_error = None
+            self.recording = video is not None
             while True:
                 if not self.recording:
                     break
-                self.set_current_time(time, recording_override=True)
+                # The canvas only has to be redrawn if rows have entered/left the time range or a camera has moved
+                prev_key, canvas_key = canvas_key, ([(data_obj.get_window(time, hold_time), data_obj.get_valid_range(time, hold_time)) for data_obj in self.data.values()], self.canvas.get_camera_state())
+                canvas_changed = canvas_pixmap is None or canvas_key != prev_key
+                self.set_current_time_value(time, canvas_changed=canvas_changed)
                 # Process events to be able to catch cancel button press
                 qtwidgets.QApplication.processEvents()
-                buffer = qtcore.QBuffer()
-                buffer.open(qtcore.QBuffer.ReadWrite)
-                self.grab_picture().save(buffer, 'PNG')
-                b = buffer.data()
-                buffer.close()
-                frames.append(cv2.imdecode(np.frombuffer(b, dtype='uint8'), flags=1))
-                if is_timestamp:
-                    self.progress_bar.setValue(int((self.current_time.timestamp() - start_time.timestamp() + time_step.total_seconds()) / (stop_time.timestamp() - start_time.timestamp() + time_step.total_seconds()) * self.progress_bar.maximum()))
-                else:
-                    self.progress_bar.setValue(int((self.current_time - start_time + time_step) / (stop_time - start_time + time_step) * self.progress_bar.maximum()))
-                if self.current_time == stop_time:
+                if canvas_changed:
+                    canvas_pixmap = self.grab_canvas()
+                try:
+                    video.write(custom_qt.pixmap_to_array(self.grab_picture(canvas_pixmap)))
+                except Exception as error:
+                    print(error)
+                    write_error = error
+                    break
+                self.progress_bar.setValue(int((self.current_time_value - start_time + time_step) / (stop_time - start_time + time_step) * self.progress_bar.maximum()))
+                if self.current_time_value == stop_time:
                     break
-                time = np.clip(helper_functions.safe_time_math(self.current_time, time_step, add=True), None, stop_time)
-            if self.recording and len(frames) > 0:
-                height, width, _ = frames[0].shape
-                video = cv2.VideoWriter(file_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
-                for frame in frames:
-                    video.write(frame)
-                video.release()
+                time = min(self.current_time_value + time_step, stop_time)
+            if video is not None:
+                try:
+                    video.close()
+                except Exception as error:
+                    if error is not write_error: # The error from the writer thread is raised again when closing
+                        print(error)
             self.recording = False
 
             self.widget.setMinimumSize(min_size)
@@ -1038,7 +1304,7 @@ class DIVEManager:
                 axis_obj.remove_artist(None)
             if self.canvas.current_axis_group is None:
                 if len(self.canvas.axes) > 0:
-                    self.canvas.recreate_grid_cell(self.data, self.axes[self.canvas.axes[0].state['name']], self.settings['apply_limits_filter'])
+                    self.recreate_grid_cell(self.axes[self.canvas.axes[0].state['name']])
                     self.update_canvas()
             else:
                 self.edit_axis_group(self.canvas.current_axis_group['name'], {})
@@ -1046,7 +1312,7 @@ class DIVEManager:
             axis_obj = self.axes[axis_name]
             err_msg = axis_obj.remove_artist(name)
             if err_msg is None:
-                need_update = self.canvas.recreate_grid_cell(self.data, axis_obj, self.settings['apply_limits_filter'])
+                need_update = self.recreate_grid_cell(axis_obj)
                 if need_update:
                     self.update_canvas()
             else:
@@ -1109,7 +1375,7 @@ class DIVEManager:
                 self.remove_table_row(i)
             if self.canvas.current_axis_group is None:
                 if len(self.canvas.axes) > 0:
-                    self.canvas.recreate_grid_cell(self.data, self.axes[self.canvas.axes[0].state['name']], self.settings['apply_limits_filter'])
+                    self.recreate_grid_cell(self.axes[self.canvas.axes[0].state['name']])
             else:
                 self.canvas.edit_axis_group(self.data, self.axes, self.axis_groups[self.canvas.current_axis_group['name']], self.settings['apply_limits_filter'])
             self.update_filters(filters_changed=True)
@@ -1123,7 +1389,7 @@ class DIVEManager:
                     self.remove_table_row(i)
             if self.canvas.current_axis_group is None:
                 if len(self.canvas.axes) > 0:
-                    self.canvas.recreate_grid_cell(self.data, self.axes[self.canvas.axes[0].state['name']], self.settings['apply_limits_filter'])
+                    self.recreate_grid_cell(self.axes[self.canvas.axes[0].state['name']])
             else:
                 self.canvas.edit_axis_group(self.data, self.axes, self.axis_groups[self.canvas.current_axis_group['name']], self.settings['apply_limits_filter'])
             self.update_filters(filters_changed=True)
@@ -1169,6 +1435,59 @@ class DIVEManager:
             self.table.removeRow(index)
             self.set_splitter_visible()
 
+    def save_session(self, file_path):
+        err_msg = None
+        if self.recording:
+            err_msg = 'A video recording is in progress.'
+        elif not isinstance(file_path, str):
+            err_msg = 'file_path must be of type: str'
+        else:
+            try:
+                p = pathlib.Path(file_path)
+                p.exists() # Causes exception if file_path is invalid
+                valid = p.parent.exists() and (not p.exists() or p.is_dir())
+            except:
+                valid = False
+            if not valid:
+                err_msg = '"{}" isn\'t a valid directory path.'.format(file_path)
+        if err_msg is not None:
+            helper_functions.print_error('Cannot save session. {}'.format(err_msg))
+            return
+
+        try:
+            p.mkdir(exist_ok=True)
+            data_states = []
+            for i, data_obj in enumerate(self.data.values()):
+                data_states.append(data_obj.get_session_state())
+                if data_obj.source is None: # Partitioned data is reopened from its source instead of being copied into the session
+                    data_states[-1]['columns'] = data_sources.save_columns(data_obj.data, p / 'data_{}'.format(i))
+        except Exception as error:
+            helper_functions.print_error('Cannot save session. {}'.format(error))
+            return
+        if self.canvas.current_axis_group is not None:
+            display = ('axis_group', self.canvas.current_axis_group['name'])
+        elif len(self.canvas.axes) > 0:
+            display = ('axis', self.canvas.axes[0].state['name'])
+        else:
+            display = None
+        session = {'settings': self.get_settings(),
+                   'data': data_states,
+                   'axes': self.get_axis(None),
+                   'artists': self.get_artist(None, None),
+                   'axis_groups': self.get_axis_group(None),
+                   'filters': {filter_type: [filter_obj.get_state(as_copy=False) for filter_obj in getattr(self.filters, filter_type).values()] for filter_type in ['custom', 'ID', 'value']}, # Custom filters are saved as BitMasks
+                   'table_rows': self.get_table_row(None),
+                   'display': display,
+                   'current_time': self.current_time,
+                   'reverse_animation': self.reverse_animation,
+                   'interact_mode': self.get_interact_mode()}
+        try:
+            with open(p / 'session.pickle.tmp', 'wb') as f:
+                pickle.dump(session, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(p / 'session.pickle.tmp', p / 'session.pickle')
+        except Exception as error:
+            helper_functions.print_error('Cannot save session. {}'.format(error))
+
     def set_animation_direction(self, reverse):
         if isinstance(reverse, (bool, np.bool_)):
             resource_path = pathlib.Path(__file__).absolute().parent.parent / '_resources'
@@ -1215,14 +1534,41 @@ class DIVEManager:
             helper_functions.print_error('Cannot set current time. time must be one of the following types: numeric, pandas.Timestamp with tz')
             return
 
-        clipped_time = np.clip(time, self.min_time, self.max_time)
-        if self.current_time == clipped_time:
+        self.set_current_time_value(helper_functions.to_time_value(time))
+
+    def set_current_time_value(self, time, canvas_changed=True):
+        """
+        Set the current time from an internal time value.
+
+        Parameters
+        ----------
+        time : numeric
+            The time value (see "helper_functions.to_time_value").
+        canvas_changed : bool (Default: True)
+            Toggle whether the canvas has to be updated for the new time.
+        """
+        time = min(max(time, self.min_time_value), self.max_time_value)
+        if self.current_time_value == time:
             return
-        self.current_time = clipped_time
+        self.current_time_value = time
+        self.current_time = helper_functions.from_time_value(time, self.settings['timezone'] if isinstance(self.min_time, pd.Timestamp) else None)
+        hold_time = self.get_hold_time()
+        windows_changed = set()
+        for data_name, data_obj in self.data.items():
+            try:
+                if data_obj.update_window(self.current_time, hold_time):
+                    windows_changed.add(data_name)
+            except Exception as error: # Such as a chunk that can't be read, in which case the chunks that were loaded are kept
+                self.set_animation_state(False)
+                helper_functions.print_error('Cannot load the data for "{}" at the current time. {}'.format(data_name, error))
         self.update_time_controls()
         self.set_clock()
-        self.update_canvas(time_updated=True)
-        self.update_table()
+        if len(windows_changed) > 0: # Partitioned data has loaded different chunks, so its filters have to be recalculated
+            self.update_filters(filters_changed=True, data_subset=windows_changed)
+        else:
+            if canvas_changed:
+                self.update_canvas(time_updated=True)
+            self.update_table()
         self.widget.current_time_changed.emit()
 
     def set_interact_mode(self, mode):
@@ -1304,6 +1650,17 @@ class DIVEManager:
                 settings[attr] = state[attr]
                 if not isinstance(settings[attr], (bool, np.bool_)):
                     err_msg = '{} must be of type: bool'.format(attr)
+        if 'memory_budget' in state:
+            settings['memory_budget'] = state['memory_budget']
+            if settings['memory_budget'] is not None:
+                if not pd.api.types.is_numeric_dtype(type(settings['memory_budget'])) or isinstance(settings['memory_budget'], (bool, np.bool_)):
+                    err_msg = 'memory_budget must be one of the following types: None, numeric'
+                elif not np.isfinite(settings['memory_budget']):
+                    err_msg = 'memory_budget must be finite.'
+                else:
+                    settings['memory_budget'] = settings['memory_budget'].real
+                    if settings['memory_budget'] <= 0:
+                        err_msg = 'memory_budget must be greater than 0.'
 
         if err_msg is None:
             old_settings = self.settings.copy()
@@ -1337,6 +1694,13 @@ class DIVEManager:
                     self.update_table()
             if old_settings['gui_theme'] != self.settings['gui_theme'] or old_settings['canvas_theme'] != self.settings['canvas_theme']:
                 self.set_theme()
+            if old_settings['memory_budget'] != self.settings['memory_budget']:
+                self.memory_budget_warned = False
+                if self.settings['memory_budget'] is None:
+                    self.memory_timer.stop()
+                else:
+                    self.memory_timer.start(memory_check_interval)
+                    self.enforce_memory_budget()
         else:
             helper_functions.print_error('Cannot set settings. {}'.format(err_msg))
 
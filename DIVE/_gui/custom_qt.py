@@ -1,4 +1,5 @@
 from .._utilities import helper_functions
+from .._utilities.lru_cache import LRUCache
 import importlib
 import numpy as np
 import pandas as pd
@@ -31,6 +32,37 @@ for colormap in colormaps:
     colormaps[colormap] = qtgui.QImage.fromData('<svg width="100" height="15"><defs>{}</defs><rect x="0" y="0" width="100" height="15" fill="url(#color)" /></svg>'.format(colormap_str).encode())
 del colormap, color_hex, color_pct, colormap_str
 
+# Holds the QIcons for SVG strings so that each SVG only has to be rendered once
+svg_icons = LRUCache(2000)
+
+def get_svg_icon(svg):
+    icon = svg_icons.get(svg)
+    if icon is None:
+        icon = qtgui.QIcon(qtgui.QPixmap.fromImage(qtgui.QImage.fromData(svg.encode())))
+        svg_icons.set(svg, icon)
+    return icon
+
+def pixmap_to_array(pixmap):
+    """
+    Return the RGB image data of a QPixmap as a uint8 numpy.ndarray with shape (height, width, 3).
+    """
+    image = pixmap.toImage().convertToFormat(qtgui.QImage.Format_RGB888)
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    bits = image.constBits()
+    if hasattr(bits, 'setsize'): # PyQt returns a sip.voidptr that needs its size set
+        bits.setsize(height * stride)
+    return np.frombuffer(bits, dtype='uint8', count=height * stride).reshape(height, stride)[:, :width * 3].reshape(height, width, 3).copy()
+
+def set_item_info(item, text, svg):
+    """
+    Set the text and SVG icon of a QTreeWidgetItem if they have changed.
+    """
+    if item.text(0) != text:
+        item.setText(0, text)
+    if getattr(item, 'icon_svg', None) != svg:
+        item.setIcon(0, get_svg_icon(svg))
+        item.icon_svg = svg
+
 class ColorButton(qtwidgets.QPushButton):
     """
     This class is a QPushButton that allows a color to be selected.
@@ -322,6 +354,10 @@ class PandasTableModel(qtcore.QAbstractTableModel):
         self.sort_order = qtcore.Qt.AscendingOrder
         self.sort_idx = None
         self.sort_filtered_idx = None
+        self.row_count = 0
+        self.sort_cache = {} # Holds the ascending sort indices for each column of each DataFrame so they don't have to be recalculated
+        self.display_cache = LRUCache(500) # Holds the display text for blocks of rows
+        self.block_size = 256
 
     def change_data(self, data_frame, filtered_idx, check_state):
         self.beginResetModel()
@@ -345,10 +381,12 @@ class PandasTableModel(qtcore.QAbstractTableModel):
                     return qtcore.Qt.Checked if self.check_state[self.sort_filtered_idx[index.row()]] else qtcore.Qt.Unchecked
             elif role == qtcore.Qt.DisplayRole:
                 col = index.column() - self.check_col_offset
-                value = self.data_frame.iat[self.sort_filtered_idx[index.row()], col]
-                if pd.api.types.is_datetime64tz_dtype(self.data_frame.dtypes.iat[col]):
-                    return helper_functions.strftime(helper_functions.safe_tz_convert(value, self.timezone), include_tz=True)
-                return str(value)
+                block, block_row = divmod(index.row(), self.block_size)
+                text = self.display_cache.get((col, block))
+                if text is None:
+                    text = self.get_display_text(col, block)
+                    self.display_cache.set((col, block), text)
+                return text[block_row]
         return None
 
     def flags(self, index):
@@ -356,6 +394,17 @@ class PandasTableModel(qtcore.QAbstractTableModel):
             return super().flags(index) | qtcore.Qt.ItemIsUserCheckable | qtcore.Qt.ItemIsEnabled
         return super().flags(index)
 
+    def get_display_text(self, col, block):
+        """
+        Return the display text for a block of rows in a column.
+        """
+        values = self.data_frame.iloc[self.sort_filtered_idx[block * self.block_size:(block + 1) * self.block_size], col]
+        if pd.api.types.is_datetime64tz_dtype(values):
+            edge_offset = pd.Timedelta(days=365)
+            values = values.clip((pd.Timestamp.min + edge_offset).replace(nanosecond=0).tz_localize('UTC'), (pd.Timestamp.max - edge_offset).replace(nanosecond=0).tz_localize('UTC')).dt.tz_convert(self.timezone)
+            return values.dt.strftime('%m/%d/%Y %H:%M:%S.%f ({})'.format(values.dt.tz)).fillna('NaT').to_numpy()
+        return values.astype('str').to_numpy()
+
     def headerData(self, idx, orientation, role=qtcore.Qt.DisplayRole):
         if role == qtcore.Qt.DisplayRole:
             if orientation == qtcore.Qt.Horizontal:
@@ -365,7 +414,7 @@ class PandasTableModel(qtcore.QAbstractTableModel):
         return super().headerData(idx, orientation, role)
 
     def rowCount(self, parent=None):
-        return self.data_frame.shape[0] if self.filtered_idx is None else self.filtered_idx.sum()
+        return self.row_count
 
     def set_checked(self, state):
         if self.check_state is not None:
@@ -390,13 +439,14 @@ class PandasTableModel(qtcore.QAbstractTableModel):
             elif col != self.sort_col: # Sort column has changed
                 self.sort_col = col
                 self.sort_order = qtcore.Qt.AscendingOrder
-                column_data = self.data_frame.iloc[:, col].reset_index(drop=True)
-                if pd.api.types.is_numeric_dtype(column_data) or pd.api.types.is_datetime64tz_dtype(column_data):
-                    column_data.sort_values(inplace=True, kind='mergesort')
-                else:
-                    column_data = column_data.astype('str')
-                    column_data.sort_values(inplace=True, kind='mergesort', key=lambda s: s.map(helper_functions.natural_order))
-                self.sort_idx = column_data.index.to_numpy()
+                frame_cache = self.sort_cache.setdefault(id(self.data_frame), (self.data_frame, {}))[1]
+                if col not in frame_cache:
+                    column_data = self.data_frame.iloc[:, col].reset_index(drop=True)
+                    if pd.api.types.is_numeric_dtype(column_data) or pd.api.types.is_datetime64tz_dtype(column_data):
+                        frame_cache[col] = column_data.sort_values(kind='mergesort').index.to_numpy()
+                    else:
+                        frame_cache[col] = helper_functions.natural_argsort(column_data)
+                self.sort_idx = frame_cache[col]
             if order != self.sort_order: # Change from ascending order to descending order or vice versa
                 self.sort_order = order
                 self.sort_idx = self.sort_idx[::-1]
@@ -411,6 +461,8 @@ class PandasTableModel(qtcore.QAbstractTableModel):
 
     def update_sort_filter_indices(self):
         self.sort_filtered_idx = self.sort_idx if self.filtered_idx is None else self.sort_idx[self.filtered_idx[self.sort_idx]]
+        self.row_count = len(self.sort_filtered_idx)
+        self.display_cache.clear()
 
 class PandasTableView(qtwidgets.QTableView):
     """
@@ -692,11 +692,8 @@ class FilterDialog(qtwidgets.QDialog):
             # Convert the bool indices for ID filter groups to int indices
             for filter_indices in id_indices:
                 for data_name in filter_indices['indices']:
-                    data_ids = self.data_objs[data_name].data.loc[filter_indices['indices'][data_name], self.data_objs[data_name].id_field].astype('str')
-                    data_ids.reset_index(drop=True, inplace=True)
-                    data_ids.drop_duplicates(inplace=True)
-                    unique_idx = data_ids.index.to_numpy()
-                    filter_indices['indices'][data_name] = np.arange(len(self.data_objs[data_name].data.index))[filter_indices['indices'][data_name]][unique_idx]
+                    field_index = self.data_objs[data_name].get_field_index(self.data_objs[data_name].id_field)
+                    filter_indices['indices'][data_name] = field_index['first_idx'][np.unique(field_index['codes'][filter_indices['indices'][data_name]])]
             for i, id_obj in enumerate(filters.get_filter('ID', None)[0]):
                 item = custom_qt.CompactListWidgetItem(text=id_obj['name'], parent=self.id_list, enable_flags=[qtcore.Qt.ItemIsUserCheckable], checked=id_obj['enabled'])
                 item.id_filter = {'name': id_obj['name'], 'values': id_indices[i]['indices']}
@@ -961,11 +958,8 @@ class IDFilterDialog(qtwidgets.QDialog):
         self.data_name = data_name
         data_obj = self.data_objs[data_name]
         if data_name not in self.sort_idx:
-            data_ids = data_obj.data.loc[:, data_obj.id_field].astype('str')
-            data_ids.reset_index(drop=True, inplace=True)
-            data_ids.drop_duplicates(inplace=True)
-            data_ids.sort_values(inplace=True, kind='mergesort', key=lambda s: s.map(helper_functions.natural_order))
-            self.sort_idx[data_name] = data_ids.index.to_numpy()
+            field_index = data_obj.get_field_index(data_obj.id_field)
+            self.sort_idx[data_name] = field_index['first_idx'][field_index['natural_idx']]
         checked = np.isin(self.sort_idx[data_name], self.check_idx[data_name])
         self.id_list.change_data(data_obj.data.iloc[self.sort_idx[data_name], data_obj.data.columns.get_loc(data_obj.id_field)].tolist(), checked)
 
@@ -1091,18 +1085,14 @@ class InputValueDialog(qtwidgets.QDialog):
                 self.value.set_time(time_val)
         else:
             self.value = custom_qt.LargeListView()
-            data_field = data_field.astype('str')
-            data_field.reset_index(drop=True, inplace=True)
-            data_field.drop_duplicates(inplace=True)
-            data_field.sort_values(inplace=True, kind='mergesort', key=lambda s: s.map(helper_functions.natural_order))
-            self.sort_idx = data_field.index.to_numpy()
-            self.value.change_data(data_field.tolist(), None)
+            field_index = self.data_obj.get_field_index(self.field_name)
+            self.sort_idx = field_index['first_idx'][field_index['natural_idx']]
+            sorted_strs = field_index['strs'][field_index['natural_idx']]
+            self.value.change_data(sorted_strs.tolist(), None)
             if value is None:
                 self.value.setCurrentIndex(self.value.model().index(0))
             else:
-                idx = data_field.isin(pd.Series([value], dtype='str'))
-                idx.reset_index(drop=True, inplace=True)
-                idx = idx.loc[idx].index
+                idx = np.flatnonzero(sorted_strs == str(value))
                 self.value.setCurrentIndex(self.value.model().index(idx[0] if len(idx) > 0 else 0))
 
         value_group.layout().addWidget(self.value)
@@ -1215,13 +1205,13 @@ class InspectDataDialog(qtwidgets.QDialog):
             self.data_list.setCurrentRow(0)
 
     def calc_filters(self, data_name):
-        selected_idx = self.data_objs[data_name].selection
+        filtered_idx, selected_idx = self.data_objs[data_name].filtered_idx, self.data_objs[data_name].selection
         if self.use_filters.isChecked() and self.use_selected.isChecked():
-            return self.data_objs[data_name].filtered_idx if selected_idx is None else np.logical_and(self.data_objs[data_name].filtered_idx, selected_idx)
+            return (filtered_idx if selected_idx is None else filtered_idx & selected_idx).to_bool()
         elif self.use_filters.isChecked():
-            return self.data_objs[data_name].filtered_idx
+            return filtered_idx.to_bool()
         elif self.use_selected.isChecked():
-            return np.ones(len(self.data_objs[data_name].filtered_idx), 'bool') if selected_idx is None else selected_idx
+            return np.ones(len(filtered_idx), 'bool') if selected_idx is None else selected_idx.to_bool()
         return None
 
     def column_moved(self, logical_idx, old_idx, new_idx):
@@ -1378,12 +1368,16 @@ class RecordDialog(qtwidgets.QDialog):
     This class is a dialog used to specify inputs for
     DIVEManager.record_video.
     """
-    def __init__(self, min_time, max_time, fps, **kwargs):
+    def __init__(self, min_time, max_time, fps, encoders, **kwargs):
         super().__init__(**kwargs)
         self.setWindowTitle('Record Video')
         self.setWindowFlags(self.windowFlags() & ~qtcore.Qt.WindowContextHelpButtonHint)
         self.setLayout(qtwidgets.QFormLayout())
 
+        self.encoder = qtwidgets.QComboBox()
+        self.encoder.addItems(encoders)
+        self.encoder.currentTextChanged.connect(lambda _: self.file_path.setText(''))
+        self.layout().addRow('Encoder:', self.encoder)
         path_hbox = qtwidgets.QHBoxLayout()
         self.layout().addRow('File Path:', path_hbox)
         self.file_path = qtwidgets.QLineEdit()
@@ -1410,6 +1404,11 @@ class RecordDialog(qtwidgets.QDialog):
         self.layout().addRow(buttons)
 
     def specify_path(self):
+        if self.encoder.currentText() in ['png', 'npy']:
+            dir_name = qtwidgets.QFileDialog.getExistingDirectory(self, 'Directory for Frame Files')
+            if dir_name:
+                self.file_path.setText(dir_name)
+            return
         file_name, _ = qtwidgets.QFileDialog.getSaveFileName(self, 'Path to Video File', '', 'MP4 File (*.mp4)')
         if file_name:
             if not file_name.lower().endswith('.mp4'):
@@ -1435,12 +1434,13 @@ class RecordDialog(qtwidgets.QDialog):
             return {'file_path': self.file_path.text(),
                     'start_time': self.start_time.get_time(),
                     'stop_time': self.stop_time.get_time(),
-                    'fps': int(self.fps.value())}
+                    'fps': int(self.fps.value()),
+                    'encoder': self.encoder.currentText()}
         return {}
 
     @staticmethod
-    def get_video_details(parent, min_time, max_time, fps):
-        dialog = RecordDialog(min_time, max_time, fps, parent=parent)
+    def get_video_details(parent, min_time, max_time, fps, encoders):
+        dialog = RecordDialog(min_time, max_time, fps, encoders, parent=parent)
         status = dialog.exec() == qtwidgets.QDialog.Accepted
         results = dialog.get_results(status)
         dialog.deleteLater()
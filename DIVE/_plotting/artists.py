@@ -1,4 +1,8 @@
-from .._utilities import validators
+from . import text_metrics
+from .image_pyramid import ImagePyramid
+from .._utilities import memory, validators
+from .._utilities.lru_cache import LRUCache
+import concurrent.futures
 import copy
 import numpy as np
 import pandas as pd
@@ -7,25 +11,47 @@ import vispy.geometry as vpgeometry
 import vispy.io as vpio
 import vispy.scene as vpscene
 import vispy.visuals as vpvisuals
+import threading
+import weakref
+
+visual_attrs = ['arrow_color', 'arrow_shape', 'arrow_size', 'arrow_spacing', 'bold', 'color', 'draw_order', 'edge_color', 'faces', 'font_size', 'interpolation', 'italic', 'label_culling', 'label_draw_order', 'label_field', 'label_size', 'legend_text',
+                'line_color', 'marker', 'marker_color', 'selectable', 'show_last_arrow', 'span_angle', 'span_angle_field', 'start_angle', 'start_angle_field', 'text_field', 'tile_size', 'x_anchor', 'y_anchor'] # Attributes that don't affect any limits
+color_attrs = ['edge_width', 'edge_width_field', 'line_width', 'marker_size'] # Attributes (besides the color fields/colormaps/labels/units) that only affect color limits
+limits_cache_lock = threading.Lock() # Guards the limits caches that are shared by artists whose limits are calculated in parallel (see "Artist.get_shared_limits")
 
 class Artist:
     def __init__(self):
         self.selectable = False
-
-    def calc_limits(self, data_obj, valid_idx, field, is_1d, get_last=False, size=None, radius_size=False, color_keys=None):
+        self.frame_cache = None # Holds the converted fields and colors that are shared by all artists while the canvas is being updated
+        self.limits_version = None # The version of the axis limits that are passed to "update"
+        self.last_updates = weakref.WeakKeyDictionary() # Holds the row and limits version that each visual was last updated with (for artists that only show the last valid row)
+        self.buffers = weakref.WeakKeyDictionary() # Holds the arrays that are reused when a visual is updated
+        self.label_states = weakref.WeakKeyDictionary() # Holds the view and all of the current labels for each text visual that uses label culling
+        self.id_segments = None # Holds the segments between rows with the same ID from the last update (see "get_id_segments")
+
+    def calc_limits(self, data_obj, valid_idx, field, is_1d, get_last=False, size=None, radius_size=False, color_keys=None, limits_cache=None):
         if field is None:
             return [], [], []
+        elif limits_cache is not None and isinstance(field, str) and isinstance(valid_idx, (slice, np.ndarray)):
+            # Only the full data (slice) and the filter indices (which are kept alive by the cache) are used with a cache, so the id of valid_idx identifies the scope
+            key = ('limits', id(data_obj), 'all' if isinstance(valid_idx, slice) else id(valid_idx), field, is_1d, get_last, size, radius_size)
+            return self.get_shared_limits(limits_cache, key, lambda: self.calc_limits(data_obj, valid_idx, field, is_1d, get_last=get_last, size=size, radius_size=radius_size))
         elif color_keys is not None:
             limits, strs, source = {}, {}, {}
             for i in range(len(field)):
                 color_field, color_key = field[i], color_keys[i]
-                color_limits, color_strs, color_source = self.calc_limits(data_obj, valid_idx, color_field, is_1d=is_1d, get_last=get_last)
+                color_limits, color_strs, color_source = self.calc_limits(data_obj, valid_idx, color_field, is_1d=is_1d, get_last=get_last, limits_cache=limits_cache)
                 if len(color_source) > 0:
                     limits[color_key] = limits.get(color_key, []) + color_limits
                     strs[color_key] = strs.get(color_key, []) + color_strs
                     source[color_key] = source.get(color_key, []) + color_source
             return limits, strs, source
         elif isinstance(field, str):
+            field_dtype = data_obj.data.dtypes.at[field]
+            if is_1d and not get_last and size is None and isinstance(valid_idx, np.ndarray) and valid_idx.dtype == 'bool' and not pd.api.types.is_numeric_dtype(field_dtype) and not pd.api.types.is_datetime64tz_dtype(field_dtype):
+                field_index = data_obj.get_field_index(field) # Use the cached distinct values instead of converting every row to str
+                codes = field_index['codes'][valid_idx]
+                return ([], field_index['strs'][np.unique(codes)].tolist(), ['str']) if len(codes) > 0 else ([], [], [])
             val_array = data_obj.data.loc[valid_idx, field]
             if len(val_array.index) == 0:
                 return [], [], []
@@ -67,6 +93,28 @@ class Artist:
         else:
             return [], val_array.astype('str').drop_duplicates().tolist(), ['str']
 
+    def clear_caches(self):
+        """
+        Discard the values that are only kept to speed up updates. They are recalculated the next time they are needed.
+        """
+        self.buffers = weakref.WeakKeyDictionary()
+        self.id_segments = None
+
+    def convert_field(self, data_obj, valid_idx, str_map, field, is_1d, get_last):
+        array = data_obj.data.loc[valid_idx, field]
+        if get_last:
+            array = array.iat[-1]
+            if is_1d:
+                return self.value_to_numeric(str_map, array)
+        if pd.api.types.is_numeric_dtype(array):
+            return np.real(array)
+        elif pd.api.types.is_datetime64tz_dtype(array):
+            nulls = array.isnull()
+            array = array.view('int64') / 1e9
+            array[nulls] = np.nan
+            return array
+        return str_map.loc[array.astype('str')]
+
     def create_color(self, data_obj, valid_idx, str_map, color_limits, color, color_field, colormap, color_label, color_unit, is_1d, get_last, to_shape):
         if color_field is None: # Data array with single color
             if len(to_shape) == 1:
@@ -75,14 +123,20 @@ class Artist:
                 output = np.tile(vpcolor.Color(color=color).rgba.reshape(1, 4), (to_shape[0] * to_shape[1], 1)).reshape(to_shape[0], to_shape[1], 4)
         else: # Color array
             color_key = (colormap, color_label, color_unit)
-            color_data = self.field_to_numeric(data_obj, valid_idx, str_map[color_key], color_field, is_1d=is_1d, get_last=get_last)
-            if not pd.api.types.is_list_like(color_data):
-                color_data = np.array([color_data])
             min_color, max_color = color_limits[color_key][0], color_limits[color_key][1]
-            normalized_vals = np.array((color_data - min_color) / (max_color - min_color))
-            output = vpcolor.get_colormap(colormap).map(normalized_vals.reshape(-1, 1))
-            if normalized_vals.ndim > 1:
-                output = output.reshape(*normalized_vals.shape, 4)
+            cache_key = ('color', id(data_obj), id(valid_idx), id(str_map[color_key]), color_field, is_1d, get_last, colormap, min_color, max_color)
+            if self.frame_cache is not None and cache_key in self.frame_cache:
+                output = self.frame_cache[cache_key].copy() # The alpha values are set below
+            else:
+                color_data = self.field_to_numeric(data_obj, valid_idx, str_map[color_key], color_field, is_1d=is_1d, get_last=get_last)
+                if not pd.api.types.is_list_like(color_data):
+                    color_data = np.array([color_data])
+                normalized_vals = np.array((color_data - min_color) / (max_color - min_color))
+                output = vpcolor.get_colormap(colormap).map(normalized_vals.reshape(-1, 1))
+                if normalized_vals.ndim > 1:
+                    output = output.reshape(*normalized_vals.shape, 4)
+                if self.frame_cache is not None:
+                    self.frame_cache[cache_key] = output.copy()
         if self.selectable and not get_last and data_obj is not None and data_obj.selection is not None:
             alpha = output[tuple([slice(None)] * (output.ndim - 1) + [-1])]
             selected_alpha = np.full(len(alpha), 0.3)
@@ -137,34 +191,219 @@ class Artist:
         return []
 
     def field_to_numeric(self, data_obj, valid_idx, str_map, field, is_1d, get_last=False, norm_limits=None, is_size=False):
-        if isinstance(field, str):
-            array = data_obj.data.loc[valid_idx, field]
-            if get_last:
-                array = array.iat[-1]
-                if is_1d:
-                    return self.value_to_numeric(str_map, array, norm_limits=norm_limits, is_size=is_size)
-            if pd.api.types.is_numeric_dtype(array):
-                output = np.real(array)
-            elif pd.api.types.is_datetime64tz_dtype(array):
-                nulls = array.isnull()
-                array = array.view('int64') / 1e9
-                array[nulls] = np.nan
-                output = array
+        if not isinstance(field, str):
+            return field
+        if self.frame_cache is None:
+            output = self.convert_field(data_obj, valid_idx, str_map, field, is_1d, get_last)
+        else:
+            # The converted values only depend on the str_map if the field isn't numeric, so artists in other axes can share them
+            field_dtype = data_obj.data.dtypes.at[field]
+            uses_str_map = not pd.api.types.is_numeric_dtype(field_dtype) and not pd.api.types.is_datetime64tz_dtype(field_dtype)
+            cache_key = ('numeric', id(data_obj), id(valid_idx), id(str_map) if uses_str_map else None, field, is_1d, get_last)
+            norm_key = cache_key + (None if norm_limits is None else tuple(norm_limits), is_size)
+            if norm_key in self.frame_cache:
+                return self.frame_cache[norm_key]
+            elif cache_key in self.frame_cache:
+                output = self.frame_cache[cache_key]
             else:
-                output = str_map.loc[array.astype('str')]
-            if norm_limits is not None:
-                if is_size:
-                    return output / abs(norm_limits[0] - norm_limits[1])
-                return -0.5 + (output - norm_limits[0]) / (norm_limits[1] - norm_limits[0])
-            return output
-        return field
+                output = self.convert_field(data_obj, valid_idx, str_map, field, is_1d, get_last)
+                self.frame_cache[cache_key] = output
+        if norm_limits is not None:
+            if is_size:
+                output = output / abs(norm_limits[0] - norm_limits[1])
+            else:
+                output = -0.5 + (output - norm_limits[0]) / (norm_limits[1] - norm_limits[0])
+            if self.frame_cache is not None:
+                self.frame_cache[norm_key] = output
+        return output
+
+    def field_to_str(self, data_obj, valid_idx, field):
+        field_index = data_obj.get_field_index(field) # Each distinct value is only converted to str once
+        return field_index['strs'][field_index['codes'][valid_idx]]
+
+    def get_buffer(self, visual, name, shape, dtype):
+        buffers = self.buffers.setdefault(visual, {})
+        buffer = buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
 
     def get_coordinates(self, data_obj, valid_idx, norm_limits, str_maps):
         pass
 
+    def get_edit_impact(self, old_state):
+        """
+        Determine how much of the axis has to be updated after the artist has been edited.
+
+        Parameters
+        ----------
+        old_state : dict
+            The state of the artist before it was edited.
+
+        Returns
+        -------
+        None, str
+            None if nothing changed, "visual" if only the artist's visuals need to be updated,
+            "color" if the color limits also need to be updated, or "limits" if all limits need to be updated.
+        """
+        impact = None
+        for attr, value in self.get_state(as_copy=False).items():
+            try:
+                changed = bool(old_state[attr] != value)
+            except: # Values that can't be compared are assumed to have changed
+                changed = True
+            if not changed:
+                continue
+            elif attr in visual_attrs:
+                impact = 'visual' if impact is None else impact
+            elif attr in color_attrs or attr.endswith(('color_field', 'colormap', 'color_label', 'color_unit')):
+                impact = 'color'
+            else:
+                return 'limits'
+        return impact
+
+    def get_id_segments(self, data_obj, valid_idx):
+        """
+        Get the line segments that connect consecutive valid rows with the same ID.
+        The segments from the last update are kept, so if rows were only added after the previous valid rows (such as during playback without a hold time),
+        only the segments of the new rows are calculated.
+
+        Returns
+        -------
+        dict
+            start : numpy.ndarray
+                The position (within the valid rows) of the first point of each segment.
+            end : numpy.ndarray
+                The position (within the valid rows) of the second point of each segment.
+            seg_num : numpy.ndarray
+                The number of each segment within its ID.
+            seg_code : numpy.ndarray
+                The code of the ID of each segment (see "DIVEData.calc_field_index").
+            last_pos : numpy.ndarray
+                The position of the last valid row of each ID (-1 for IDs without valid rows), indexed by code.
+        """
+        codes = data_obj.get_field_index(data_obj.id_field)['codes']
+        rows = np.flatnonzero(valid_idx)
+        segments = self.id_segments
+        if segments is None or segments['codes'] is not codes or len(rows) < len(segments['rows']) or not np.array_equal(rows[:len(segments['rows'])], segments['rows']):
+            n_codes = int(codes.max()) + 1 if len(codes) > 0 else 0
+            segments = {'codes': codes, 'rows': rows[:0], 'last_pos': np.full(n_codes, -1, dtype='int64'), 'counts': np.zeros(n_codes, dtype='int64')}
+            for key in ['start', 'end', 'seg_num', 'seg_code']:
+                segments[key] = np.zeros(0, dtype='int64')
+        n_old = len(segments['rows'])
+        if len(rows) > n_old:
+            new_codes = codes[rows[n_old:]]
+            order = np.argsort(new_codes, kind='stable')
+            sorted_codes, sorted_pos = new_codes[order], order + n_old
+            first, last = np.ones(len(order), dtype='bool'), np.ones(len(order), dtype='bool')
+            first[1:] = last[:-1] = sorted_codes[1:] != sorted_codes[:-1]
+            # The first new row of each ID continues from the last row of that ID in the previous update
+            prev_pos = np.where(first, segments['last_pos'][sorted_codes], np.concatenate([[-1], sorted_pos[:-1]]))
+            has_prev = prev_pos >= 0
+            seg_code = sorted_codes[has_prev]
+            seg_idx = np.arange(len(seg_code))
+            seg_first = np.ones(len(seg_code), dtype='bool')
+            seg_first[1:] = seg_code[1:] != seg_code[:-1]
+            seg_num = segments['counts'][seg_code] + seg_idx - np.maximum.accumulate(np.where(seg_first, seg_idx, 0))
+            for key, values in [('start', prev_pos[has_prev]), ('end', sorted_pos[has_prev]), ('seg_num', seg_num), ('seg_code', seg_code)]:
+                segments[key] = np.concatenate([segments[key], values])
+            segments['last_pos'][sorted_codes[last]] = sorted_pos[last]
+            segments['counts'] += np.bincount(seg_code, minlength=len(segments['counts']))
+            segments['rows'] = rows
+        self.id_segments = segments
+        return segments
+
+    def get_memory_usage(self, seen):
+        """
+        Estimate the memory used by the values that this artist keeps between updates (the data sent to its visuals isn't included).
+
+        Parameters
+        ----------
+        seen : set
+            The keys of the arrays that have already been counted (see "memory.get_nbytes").
+
+        Returns
+        -------
+        int
+            The estimated number of bytes.
+        """
+        label_states = [state['labels'] for state in list(self.label_states.values())]
+        return memory.get_nbytes([list(self.buffers.values()), self.id_segments, label_states], seen)
+
+    def get_shared_limits(self, limits_cache, key, calc):
+        """
+        Get a value from a limits cache that is shared by all artists while the limits of several axes are being calculated, calculating it if no other artist has requested it yet.
+        If another thread is already calculating the value, this waits for it instead of calculating it again.
+
+        Parameters
+        ----------
+        limits_cache : dict
+            The shared limits cache.
+        key : tuple
+            The key of the value in the cache.
+        calc : function
+            The function that calculates the value.
+
+        Returns
+        -------
+        object
+            The value. It must not be modified since it is shared.
+        """
+        with limits_cache_lock:
+            future = limits_cache.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = limits_cache[key] = concurrent.futures.Future()
+        if is_owner:
+            try:
+                future.set_result(calc())
+            except Exception as error:
+                future.set_exception(error)
+        return future.result()
+
+    def layout_labels(self, visual):
+        """
+        Show the labels of a text visual that are in view, keeping at most one label (the most recent one) in each cell of a screen-space grid.
+        The cells are as tall as a line of text and as wide as the median label.
+        """
+        state = self.label_states.get(visual)
+        if state is None or state['labels'] is None:
+            return
+        labels, view = state['labels'], state['view']
+        idx = []
+        if len(labels['text']) > 0 and view.canvas is not None:
+            pos = view.scene.node_transform(view).map(labels['pos'])
+            pos = pos[:, :2] / pos[:, 3:4]
+            font_scale = visual.font_size / 72 * view.canvas.dpi
+            sizes = text_metrics.measure_text(labels['text'][::max(len(labels['text']) // 1000, 1)], visual._font) * font_scale # A sample of the labels is enough to estimate the cell width
+            idx = text_metrics.cull_labels(pos, view.size, (max(np.median(sizes[:, 0]), 1), max(1.5 * font_scale, 1)))
+        if len(idx) > 0:
+            for attr in labels:
+                setattr(visual, attr, labels[attr][idx])
+        else:
+            visual.text = np.array([''])
+            visual.pos = np.zeros((1, labels['pos'].shape[1]))
+
     def set_theme(self, visuals, theme):
         pass
 
+    def skip_update(self, data_obj, visuals, valid_idx):
+        """
+        Check whether the visuals of an artist that only shows the last valid row are already showing that row with the current limits.
+        If they aren't, the row and limits version are stored so that the next update can be skipped if neither of them changes.
+        """
+        if data_obj is None:
+            key = (None, self.limits_version)
+        else:
+            key = (id(data_obj.data), len(valid_idx) - 1 - int(np.argmax(valid_idx[::-1])), self.limits_version)
+        if self.limits_version is not None and self.last_updates.get(visuals[0]) == key:
+            return True
+        self.last_updates[visuals[0]] = key
+        return False
+
+    def update_view(self, visuals):
+        pass
+
     def value_to_numeric(self, str_map, value, norm_limits=None, is_size=False):
         if pd.api.types.is_numeric_dtype(type(value)):
             output = value.real
@@ -185,6 +424,17 @@ class ArrowArtist(Artist):
         super().__init__()
         self.artist_type = 'arrow'
 
+    def get_arrow_mask(self, seg_num, is_last):
+        """
+        Get which segments have an arrow head: every "arrow_spacing"-th segment of each ID (and the last segment if "show_last_arrow" is True),
+        or only the last segment of each ID if "arrow_spacing" is 0.
+        """
+        if self.arrow_spacing == 0:
+            return is_last
+        first_arrow = max(self.arrow_spacing - 2, 0)
+        is_arrow = (seg_num >= first_arrow) & ((seg_num - first_arrow) % self.arrow_spacing == 0)
+        return is_arrow | is_last if self.show_last_arrow else is_arrow
+
     def get_coordinates(self, data_obj, valid_idx, norm_limits, str_maps):
         x = self.field_to_numeric(data_obj, valid_idx, str_maps['x'], self.x_field, is_1d=True, norm_limits=norm_limits['x'])
         y = self.field_to_numeric(data_obj, valid_idx, str_maps['y'], self.y_field, is_1d=True, norm_limits=norm_limits['y'])
@@ -197,64 +447,30 @@ class ArrowArtist(Artist):
         to_shape = (visual_input['pos'].shape[0],)
         visual_input['arrow_color'] = self.create_color(data_obj, valid_idx, str_maps['color'], color_limits, self.arrow_color, self.arrow_color_field, self.arrow_colormap, self.arrow_color_label, self.arrow_color_unit, is_1d=True, get_last=False, to_shape=to_shape)
         visual_input['color'] = self.create_color(data_obj, valid_idx, str_maps['color'], color_limits, self.line_color, self.line_color_field, self.line_colormap, self.line_color_label, self.line_color_unit, is_1d=True, get_last=False, to_shape=to_shape) if self.line_width > 0 else self.line_color
+        n_rows, n_cols = visual_input['pos'].shape
         if data_obj.id_field is not None:
-            id_vals = data_obj.data.loc[valid_idx, data_obj.id_field]
-            id_vals.reset_index(drop=True, inplace=True)
-            id_vals.sort_values(inplace=True, kind='mergesort')
-            id_names = id_vals.loc[id_vals.duplicated(keep='last')]
-            id_connect = pd.DataFrame({0: id_names.index, 1: id_vals.loc[id_vals.duplicated(keep='first')].index})
-            visual_input['connect'] = id_connect.to_numpy()
-            id_groups = id_connect.groupby(id_names.to_numpy(), as_index=False, dropna=False, sort=False)
-            if self.arrow_spacing == 0:
-                arrows = id_groups.tail(1)
-            else:
-                nth_arrow = id_groups.nth(list(range(np.max([self.arrow_spacing - 2, 0]), id_connect.shape[0], self.arrow_spacing)))
-                if self.show_last_arrow:
-                    arrows = nth_arrow.append(id_groups.tail(1)).drop_duplicates()
-                    arrows.sort_index(inplace=True)
-                else:
-                    arrows = nth_arrow
-            n_cols = visual_input['pos'].shape[1]
-            arrow_color_idx = arrows.loc[:, 1]
-            visual_input['arrows'] = np.empty((arrows.shape[0], n_cols * 2))
-            visual_input['arrows'][:, :n_cols] = visual_input['pos'][arrows.loc[:, 0]]
-            visual_input['arrows'][:, n_cols:] = visual_input['pos'][arrow_color_idx]
+            segments = self.get_id_segments(data_obj, valid_idx)
+            visual_input['connect'] = np.column_stack([segments['start'], segments['end']])
+            is_arrow = self.get_arrow_mask(segments['seg_num'], segments['end'] == segments['last_pos'][segments['seg_code']])
+            arrow_start, arrow_end = segments['start'][is_arrow], segments['end'][is_arrow]
         else:
             visual_input['connect'] = 'strip'
-            n_rows, n_cols = visual_input['pos'].shape
-            arrow_color_idx = []
-            if n_rows > 1:
-                if self.arrow_spacing == 0:
-                    visual_input['arrows'] = np.empty((1, n_cols * 2))
-                    visual_input['arrows'][0, :n_cols] = visual_input['pos'][-2]
-                    visual_input['arrows'][0, n_cols:] = visual_input['pos'][-1]
-                    arrow_color_idx = [-1]
-                else:
-                    from_pos = visual_input['pos'][:-1][np.max([self.arrow_spacing - 2, 0])::self.arrow_spacing]
-                    to_pos = visual_input['pos'][1:][np.max([self.arrow_spacing - 2, 0])::self.arrow_spacing]
-                    n_spaced = from_pos.shape[0]
-                    arrow_color_idx = to_pos
-                    if self.show_last_arrow and n_rows % self.arrow_spacing != 0:
-                        visual_input['arrows'] = np.empty((n_spaced + 1, n_cols * 2))
-                        visual_input['arrows'][-1, :n_cols] = visual_input['pos'][-2]
-                        visual_input['arrows'][-1, n_cols:] = visual_input['pos'][-1]
-                        arrow_color_idx = np.append(arrow_color_idx, [-1])
-                    else:
-                        visual_input['arrows'] = np.empty((n_spaced, n_cols * 2))
-                    visual_input['arrows'][:n_spaced, :n_cols] = from_pos
-                    visual_input['arrows'][:n_spaced, n_cols:] = to_pos
-            else:
-                visual_input['arrows'] = np.empty((0, n_cols * 2))
-        visual_input['arrow_color'] = visual_input['arrow_color'][arrow_color_idx, :]
+            seg_num = np.arange(max(n_rows - 1, 0))
+            arrow_start = seg_num[self.get_arrow_mask(seg_num, seg_num == n_rows - 2)]
+            arrow_end = arrow_start + 1
+        visual_input['arrows'] = np.empty((len(arrow_start), n_cols * 2))
+        visual_input['arrows'][:, :n_cols] = visual_input['pos'][arrow_start]
+        visual_input['arrows'][:, n_cols:] = visual_input['pos'][arrow_end]
+        visual_input['arrow_color'] = visual_input['arrow_color'][arrow_end, :]
         if self.label_field is not None:
             if data_obj.time_field is None:
                 last_idx = slice(None)
             elif data_obj.id_field is not None:
-                last_idx = id_vals.drop_duplicates(keep='last').index
+                last_idx = segments['last_pos'][segments['last_pos'] >= 0]
             else:
                 last_idx = [-1]
             text_input['pos'] = visual_input['pos'][last_idx]
-            text_input['text'] = ('  ' + data_obj.data.loc[valid_idx, self.label_field].iloc[last_idx].astype(str)).to_numpy()
+            text_input['text'] = '  ' + self.field_to_str(data_obj, valid_idx, self.label_field)[last_idx]
         return visual_input, text_input
 
     def get_legend_info(self, str_map, limits_source):
@@ -293,22 +509,22 @@ class ArrowArtist(Artist):
         icon = '<svg width="30" height="30"><defs>{}{}</defs>{}{}</svg>'.format(arrow_colormap, line_colormap, line, arrow)
         return icon, list(merged_subentries.items())
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=True, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=True, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, self.z_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.z_field, is_1d=True, limits_cache=limits_cache)
         else:
             color_fields, color_keys = [self.arrow_color_field], [(self.arrow_colormap, self.arrow_color_label, self.arrow_color_unit)]
             if self.line_width > 0:
                 color_fields.append(self.line_color_field)
                 color_keys.append((self.line_colormap, self.line_color_label, self.line_color_unit))
-            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, color_keys=color_keys)
+            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, color_keys=color_keys, limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
-        state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'x_field', 'y_field', 'z_field', 'label_field', 'label_size', 'visible', 'draw_order', 'label_draw_order', 'legend_text', 'selectable',
+        state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'x_field', 'y_field', 'z_field', 'label_field', 'label_size', 'label_culling', 'visible', 'draw_order', 'label_draw_order', 'legend_text', 'selectable',
                                                               'line_width', 'line_color', 'line_color_field', 'line_colormap', 'line_color_label', 'line_color_unit',
                                                               'arrow_shape', 'arrow_spacing', 'show_last_arrow', 'arrow_size',
                                                               'arrow_color', 'arrow_color_field', 'arrow_colormap', 'arrow_color_label', 'arrow_color_unit']}
@@ -319,6 +535,8 @@ class ArrowArtist(Artist):
         arrow.order = self.draw_order
         text = vpscene.Text(anchor_x='left', font_size=self.label_size, parent=view.scene)
         text.order = self.label_draw_order
+        if self.label_culling:
+            self.label_states[text] = {'view': view, 'labels': None}
         return [arrow, text]
 
     def set_state(self, data_objs, axis_type, artist_names, unit_reg, state):
@@ -396,7 +614,7 @@ class ArrowArtist(Artist):
                 attrs[attr], err_msg = validators.validate_unit(attr, unit_reg, state[attr])
                 if err_msg is not None:
                     return err_msg
-        for attr in ['visible', 'selectable']:
+        for attr in ['visible', 'selectable', 'label_culling']:
             if attr in state:
                 attrs[attr] = state[attr]
                 if not isinstance(attrs[attr], (bool, np.bool_)):
@@ -416,7 +634,10 @@ class ArrowArtist(Artist):
             show_labels = len(text_input) > 0
             if not visuals[0].visible:
                 visuals[0].visible = True
-            if show_labels:
+            if show_labels and self.label_culling:
+                self.label_states[visuals[1]]['labels'] = text_input
+                self.layout_labels(visuals[1])
+            elif show_labels:
                 for attr in text_input:
                     setattr(visuals[1], attr, text_input[attr])
             if show_labels != visuals[1].visible:
@@ -426,6 +647,11 @@ class ArrowArtist(Artist):
                 visuals[0].visible = False
             if visuals[1].visible:
                 visuals[1].visible = False
+            if visuals[1] in self.label_states:
+                self.label_states[visuals[1]]['labels'] = None
+
+    def update_view(self, visuals):
+        self.layout_labels(visuals[1])
 
 class BoxArtist(Artist):
     def __init__(self):
@@ -471,15 +697,15 @@ class BoxArtist(Artist):
     def get_legend_info(self, str_map, limits_source):
         return self.create_legend_default(str_map, limits_source, self.color, self.color_field, self.colormap, self.color_label, self.color_unit)
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_pos if self.x_pos_field is None else self.x_pos_field, is_1d=True, get_last=is_time, size=self.width if self.width_field is None else self.width_field)
+            return self.calc_limits(data_obj, valid_idx, self.x_pos if self.x_pos_field is None else self.x_pos_field, is_1d=True, get_last=is_time, size=self.width if self.width_field is None else self.width_field, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_pos if self.y_pos_field is None else self.y_pos_field, is_1d=True, get_last=is_time, size=self.height if self.height_field is None else self.height_field)
+            return self.calc_limits(data_obj, valid_idx, self.y_pos if self.y_pos_field is None else self.y_pos_field, is_1d=True, get_last=is_time, size=self.height if self.height_field is None else self.height_field, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, self.z_pos if self.z_pos_field is None else self.z_pos_field, is_1d=True, get_last=is_time, size=self.depth if self.depth_field is None else self.depth_field)
+            return self.calc_limits(data_obj, valid_idx, self.z_pos if self.z_pos_field is None else self.z_pos_field, is_1d=True, get_last=is_time, size=self.depth if self.depth_field is None else self.depth_field, limits_cache=limits_cache)
         else:
-            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=True, get_last=is_time, color_keys=[(self.colormap, self.color_label, self.color_unit)])
+            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=True, get_last=is_time, color_keys=[(self.colormap, self.color_label, self.color_unit)], limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
         state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'visible', 'draw_order', 'legend_text', 'x_pos', 'x_pos_field', 'y_pos', 'y_pos_field', 'z_pos', 'z_pos_field', 'width', 'width_field', 'height', 'height_field', 'depth', 'depth_field', 'color', 'color_field', 'colormap', 'color_label', 'color_unit', 'faces']}
@@ -568,14 +794,16 @@ class BoxArtist(Artist):
 
     def update(self, data_obj, visuals, valid_idx, norm_limits, str_maps, color_limits):
         if self.visible and (self.data_name is None or valid_idx.any()):
-            visual_input, transform = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
-            vertices, faces, _ = vpgeometry.create_box(width=visual_input['width'], height=visual_input['height'], depth=visual_input['depth'], planes=visual_input['planes'])
-            visuals[0].set_data(vertices=vertices['position'], faces=faces, color=visual_input['color'])
-            visuals[0].transform = transform
+            if not self.skip_update(data_obj, visuals, valid_idx):
+                visual_input, transform = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
+                vertices, faces, _ = vpgeometry.create_box(width=visual_input['width'], height=visual_input['height'], depth=visual_input['depth'], planes=visual_input['planes'])
+                visuals[0].set_data(vertices=vertices['position'], faces=faces, color=visual_input['color'])
+                visuals[0].transform = transform
             if not visuals[0].visible:
                 visuals[0].visible = True
         elif visuals[0].visible:
             visuals[0].visible = False
+            self.last_updates.pop(visuals[0], None)
 
 class EllipseArtist(Artist):
     def __init__(self):
@@ -622,19 +850,19 @@ class EllipseArtist(Artist):
     def get_legend_info(self, str_map, limits_source):
         return self.create_legend_default(str_map, limits_source, self.color, self.color_field, self.colormap, self.color_label, self.color_unit, edge_color=self.edge_color, edge_color_field=self.edge_color_field, edge_colormap=self.edge_colormap, edge_color_label=self.edge_color_label, edge_color_unit=self.edge_color_unit, edge_width=self.edge_width)
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_pos if self.x_pos_field is None else self.x_pos_field, is_1d=True, get_last=is_time, size=self.x_radius if self.x_radius_field is None else self.x_radius_field, radius_size=True)
+            return self.calc_limits(data_obj, valid_idx, self.x_pos if self.x_pos_field is None else self.x_pos_field, is_1d=True, get_last=is_time, size=self.x_radius if self.x_radius_field is None else self.x_radius_field, radius_size=True, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_pos if self.y_pos_field is None else self.y_pos_field, is_1d=True, get_last=is_time, size=self.y_radius if self.y_radius_field is None else self.y_radius_field, radius_size=True)
+            return self.calc_limits(data_obj, valid_idx, self.y_pos if self.y_pos_field is None else self.y_pos_field, is_1d=True, get_last=is_time, size=self.y_radius if self.y_radius_field is None else self.y_radius_field, radius_size=True, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time, limits_cache=limits_cache)
         else:
             color_fields, color_keys = [self.color_field], [(self.colormap, self.color_label, self.color_unit)]
             if self.edge_width > 0 or self.edge_width_field is not None:
                 color_fields.append(self.edge_color_field)
                 color_keys.append((self.edge_colormap, self.edge_color_label, self.edge_color_unit))
-            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, get_last=is_time, color_keys=color_keys)
+            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, get_last=is_time, color_keys=color_keys, limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
         state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'visible', 'draw_order', 'legend_text', 'start_angle', 'start_angle_field', 'span_angle', 'span_angle_field', 'x_pos', 'x_pos_field', 'y_pos', 'y_pos_field', 'edge_width', 'edge_width_field', 'x_radius', 'x_radius_field', 'y_radius', 'y_radius_field', 'color', 'color_field', 'colormap', 'color_label', 'color_unit', 'edge_color', 'edge_color_field', 'edge_colormap', 'edge_color_label', 'edge_color_unit']}
@@ -671,10 +899,10 @@ class EllipseArtist(Artist):
                 if err_msg is not None:
                     return err_msg
                 elif attr in ['start_angle_field', 'span_angle_field'] and attrs[attr] is not None:
-                    data = data_objs[attrs['data_name']].data.loc[:, attrs[attr]]
-                    if not pd.api.types.is_numeric_dtype(data):
+                    data_obj = data_objs[attrs['data_name']]
+                    if data_obj.get_field_fact(attrs[attr], 'dtype') not in ['numeric', 'complex']:
                         return '{} must have numeric values.'.format(attr)
-                    elif not np.isfinite(data).all():
+                    elif not data_obj.get_field_fact(attrs[attr], 'finite'):
                         return '{} must have finite values.'.format(attr)
             if attrs[attr] is not None:
                 no_fields = False
@@ -723,25 +951,39 @@ class EllipseArtist(Artist):
 
     def update(self, data_obj, visuals, valid_idx, norm_limits, str_maps, color_limits):
         if self.visible and (self.data_name is None or valid_idx.any()):
-            visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
-            border_width = visual_input.pop('border_width')
-            for attr in visual_input:
-                setattr(visuals[0], attr, visual_input[attr])
-            visuals[0].border.set_data(width=border_width)
+            if not self.skip_update(data_obj, visuals, valid_idx):
+                visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
+                border_width = visual_input.pop('border_width')
+                for attr in visual_input:
+                    setattr(visuals[0], attr, visual_input[attr])
+                visuals[0].border.set_data(width=border_width)
             if not visuals[0].visible:
                 visuals[0].visible = True
         elif visuals[0].visible:
             visuals[0].visible = False
+            self.last_updates.pop(visuals[0], None)
 
 class ImageArtist(Artist):
     def __init__(self):
         super().__init__()
         self.artist_type = 'image'
+        self.pyramid_cache = LRUCache(4) # Holds the image pyramids of the most recently shown rows
+        self.tile_states = weakref.WeakKeyDictionary() # Holds the view, current frame, and tiles for each visual that uses an image pyramid
+
+    def clear_caches(self):
+        super().clear_caches()
+        self.pyramid_cache.clear() # The pyramid that is being shown is still held by its visual's tile state
 
     def get_current_data(self, data_obj, valid_idx, norm_limits, str_maps, color_limits):
         visual_input = {}
-        visual_input['data'] = np.flipud(self.create_color(data_obj, valid_idx, str_maps['color'], color_limits, None, self.color_field, self.colormap, self.color_label, self.color_unit, is_1d=False, get_last=True, to_shape=None)).astype('float32')
-        x_shape, y_shape, _ = visual_input['data'].shape
+        if self.tile_size is None:
+            visual_input['data'] = np.flipud(self.create_color(data_obj, valid_idx, str_maps['color'], color_limits, None, self.color_field, self.colormap, self.color_label, self.color_unit, is_1d=False, get_last=True, to_shape=None))
+            x_shape, y_shape, _ = visual_input['data'].shape
+        else:
+            color_key = (self.colormap, self.color_label, self.color_unit)
+            visual_input['pyramid'] = self.get_pyramid(data_obj, valid_idx, str_maps['color'][color_key])
+            visual_input['clim'] = color_limits[color_key]
+            x_shape, y_shape = visual_input['pyramid'].shape
         if self.x_pos_field is None:
             x = self.value_to_numeric(str_maps['x'], self.x_pos, norm_limits=norm_limits['x'])
         else:
@@ -766,23 +1008,39 @@ class ImageArtist(Artist):
     def get_legend_info(self, str_map, limits_source):
         return self.create_legend_default(str_map, limits_source, None, self.color_field, self.colormap, self.color_label, self.color_unit)
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_memory_usage(self, seen):
+        with self.pyramid_cache.lock:
+            pyramids = list(self.pyramid_cache.entries.values())
+        pyramids += [state['frame'][0] for state in list(self.tile_states.values()) if state['frame'] is not None]
+        return super().get_memory_usage(seen) + memory.get_nbytes([pyramid.levels for pyramid in pyramids], seen)
+
+    def get_pyramid(self, data_obj, valid_idx, str_map):
+        key = (id(data_obj.data), len(valid_idx) - 1 - int(np.argmax(valid_idx[::-1])), self.color_field, self.tile_size)
+        pyramid = self.pyramid_cache.get(key)
+        if pyramid is None:
+            pyramid = ImagePyramid(self.field_to_numeric(data_obj, valid_idx, str_map, self.color_field, is_1d=False, get_last=True), self.tile_size)
+            self.pyramid_cache.set(key, pyramid)
+        return pyramid
+
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_pos if self.x_pos_field is None else self.x_pos_field, is_1d=True, get_last=is_time, size=self.width if self.width_field is None else self.width_field)
+            return self.calc_limits(data_obj, valid_idx, self.x_pos if self.x_pos_field is None else self.x_pos_field, is_1d=True, get_last=is_time, size=self.width if self.width_field is None else self.width_field, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_pos if self.y_pos_field is None else self.y_pos_field, is_1d=True, get_last=is_time, size=self.height if self.height_field is None else self.height_field)
+            return self.calc_limits(data_obj, valid_idx, self.y_pos if self.y_pos_field is None else self.y_pos_field, is_1d=True, get_last=is_time, size=self.height if self.height_field is None else self.height_field, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time, limits_cache=limits_cache)
         else:
-            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=False, get_last=is_time, color_keys=[(self.colormap, self.color_label, self.color_unit)])
+            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=False, get_last=is_time, color_keys=[(self.colormap, self.color_label, self.color_unit)], limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
-        state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'visible', 'draw_order', 'legend_text', 'x_pos', 'x_pos_field', 'y_pos', 'y_pos_field', 'width', 'width_field', 'height', 'height_field', 'color_field', 'colormap', 'color_label', 'color_unit', 'interpolation']}
+        state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'visible', 'draw_order', 'legend_text', 'x_pos', 'x_pos_field', 'y_pos', 'y_pos_field', 'width', 'width_field', 'height', 'height_field', 'color_field', 'colormap', 'color_label', 'color_unit', 'interpolation', 'tile_size']}
         return copy.deepcopy(state) if as_copy else state
 
     def initialize(self, view):
         image = vpscene.Image(interpolation=self.interpolation, parent=view.scene)
         image.order = self.draw_order
+        if self.tile_size is not None: # The tiles are added to the visuals as they are needed (see "update_view")
+            self.tile_states[image] = {'view': view, 'frame': None, 'tiles': []}
         return [image]
 
     def set_state(self, data_objs, axis_type, artist_names, unit_reg, state):
@@ -812,13 +1070,12 @@ class ImageArtist(Artist):
                     return err_msg
                 if attrs[attr] is not None:
                     if attr == 'color_field':
-                        data = data_objs[attrs['data_name']].data.loc[:, attrs[attr]]
-                        dtypes = data.map(type).unique()
-                        if len(dtypes) > 1 or dtypes[0] is not np.ndarray:
+                        shapes = data_objs[attrs['data_name']].get_field_fact(attrs[attr], 'array_shapes')
+                        if shapes is None:
                             return '{} must contain numpy arrays.'.format(attr)
-                        elif (data.map(np.ndim) != 2).any():
+                        elif (shapes.map(len) != 2).any():
                             return '{} must contain 2D numpy arrays.'.format(attr)
-                        elif (data.map(np.shape).map(np.prod) == 0).any():
+                        elif (shapes.map(np.prod) == 0).any():
                             return '{} must contain 2D numpy arrays with at least one row and one column.'
         for attr in ['legend_text', 'color_label']:
             if attr in state:
@@ -852,6 +1109,14 @@ class ImageArtist(Artist):
             interp_names = [interp_name.lower() for interp_name in vpio.load_spatial_filters()[1]]
             if attrs['interpolation'] not in interp_names:
                 return '{} must be one of the following: {}'.format(attr, str(interp_names)[1:-1])
+        if 'tile_size' in state:
+            attrs['tile_size'] = state['tile_size']
+            if attrs['tile_size'] is not None:
+                if not pd.api.types.is_integer_dtype(type(attrs['tile_size'])):
+                    return 'tile_size must be one of the following types: None, int'
+                elif not 16 <= attrs['tile_size'] <= 4096:
+                    return 'tile_size must be between 16 and 4096.'
+                attrs['tile_size'] = int(attrs['tile_size'])
         if 'visible' in state:
             attrs['visible'] = state['visible']
             if not isinstance(attrs['visible'], (bool, np.bool_)):
@@ -862,13 +1127,78 @@ class ImageArtist(Artist):
 
     def update(self, data_obj, visuals, valid_idx, norm_limits, str_maps, color_limits):
         if self.visible and valid_idx.any():
-            visual_input, transform = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
-            visuals[0].set_data(visual_input['data'])
-            visuals[0].transform = transform
+            if not self.skip_update(data_obj, visuals, valid_idx):
+                visual_input, transform = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
+                if self.tile_size is None:
+                    data = self.get_buffer(visuals[0], 'data', visual_input['data'].shape, 'float32')
+                    np.copyto(data, visual_input['data'])
+                    visuals[0].set_data(data)
+                    visuals[0].transform = transform
+                else:
+                    self.tile_states[visuals[0]]['frame'] = (visual_input['pyramid'], transform, visual_input['clim'])
+                    self.update_view(visuals)
             if not visuals[0].visible:
                 visuals[0].visible = True
         elif visuals[0].visible:
-            visuals[0].visible = False
+            for visual in visuals:
+                visual.visible = False
+            self.last_updates.pop(visuals[0], None)
+            if visuals[0] in self.tile_states:
+                self.tile_states[visuals[0]]['frame'] = None
+                self.tile_states[visuals[0]]['tiles'] = [None] * len(self.tile_states[visuals[0]]['tiles'])
+
+    def update_view(self, visuals):
+        """
+        Show the tiles of the image pyramid that are in view at the level that best matches the screen resolution.
+        Tiles that are already being shown are kept, and the visuals of tiles that went out of view are reused for the new ones.
+        """
+        state = self.tile_states.get(visuals[0])
+        if state is None or state['frame'] is None:
+            return
+        pyramid, transform, clim = state['frame']
+        (x_scale, y_scale), (x_offset, y_offset) = transform.scale[:2], transform.translate[:2]
+        n_rows, n_cols = pyramid.shape
+        view = state['view']
+        if x_scale == 0 or y_scale == 0:
+            needed = []
+        else:
+            if hasattr(view.camera, 'rect'): # Only the part of the image in the camera's rectangle is needed for a 2D axis
+                rect = view.camera.rect
+                col_min, col_max = sorted([(rect.left - x_offset) / x_scale, (rect.right - x_offset) / x_scale])
+                row_min, row_max = sorted([n_rows - (rect.top - y_offset) / y_scale, n_rows - (rect.bottom - y_offset) / y_scale])
+            else:
+                col_min, col_max, row_min, row_max = 0, n_cols, 0, n_rows
+            view_width, view_height = max(view.size[0], 1), max(view.size[1], 1)
+            level = pyramid.get_level_for_scale(max((col_max - col_min) / view_width, (row_max - row_min) / view_height))
+            needed = [(pyramid, level, row, col, tuple(clim)) for row, col in pyramid.get_visible_tiles(level, row_min, row_max, col_min, col_max)]
+        tiles = state['tiles']
+        new_tiles = [tile for tile in needed if tile not in tiles]
+        for i in range(len(tiles)):
+            if tiles[i] is not None and tiles[i] not in needed:
+                tiles[i] = None
+                visuals[i + 1].visible = False
+        for tile in new_tiles:
+            if None in tiles:
+                i = tiles.index(None)
+            else:
+                visual = vpscene.Image(cmap=self.colormap, interpolation=self.interpolation, texture_format='auto', parent=visuals[0].parent)
+                visual.order = self.draw_order
+                visuals.append(visual)
+                tiles.append(None)
+                i = len(tiles) - 1
+            _, level, row, col, _ = tile
+            min_color, max_color = clim
+            # The values are uploaded as a single channel relative to the min color value and the colormap is applied on the GPU
+            data = pyramid.get_tile(level, row, col, offset=min_color)
+            level_scale = 2 ** level
+            tile_transform = vpvisuals.transforms.STTransform()
+            tile_transform.scale = (x_scale * level_scale, y_scale * level_scale)
+            tile_transform.translate = (x_offset + col * pyramid.tile_size * level_scale * x_scale, y_offset + (n_rows - (row * pyramid.tile_size + data.shape[0]) * level_scale) * y_scale)
+            visuals[i + 1].set_data(data)
+            visuals[i + 1].clim = (0, max_color - min_color if max_color > min_color else 1)
+            visuals[i + 1].transform = tile_transform
+            visuals[i + 1].visible = True
+            tiles[i] = tile
 
 class InfiniteLineArtist(Artist):
     def __init__(self):
@@ -888,19 +1218,19 @@ class InfiniteLineArtist(Artist):
     def get_legend_info(self, str_map, limits_source):
         return self.create_legend_default(str_map, limits_source, self.color, self.color_field, self.colormap, self.color_label, self.color_unit, is_line=True)
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
             if self.is_vertical:
-                return self.calc_limits(data_obj, valid_idx, self.pos if self.pos_field is None else self.pos_field, is_1d=True, get_last=is_time)
-            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time)
+                return self.calc_limits(data_obj, valid_idx, self.pos if self.pos_field is None else self.pos_field, is_1d=True, get_last=is_time, limits_cache=limits_cache)
+            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time, limits_cache=limits_cache)
         elif limit_type == 'y':
             if self.is_vertical:
-                return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time)
-            return self.calc_limits(data_obj, valid_idx, self.pos if self.pos_field is None else self.pos_field, is_1d=True, get_last=is_time)
+                return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time, limits_cache=limits_cache)
+            return self.calc_limits(data_obj, valid_idx, self.pos if self.pos_field is None else self.pos_field, is_1d=True, get_last=is_time, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time, limits_cache=limits_cache)
         else:
-            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=True, get_last=is_time, color_keys=[(self.colormap, self.color_label, self.color_unit)])
+            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=True, get_last=is_time, color_keys=[(self.colormap, self.color_label, self.color_unit)], limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
         state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'visible', 'draw_order', 'legend_text', 'pos', 'pos_field', 'color', 'color_field', 'colormap', 'color_label', 'color_unit', 'is_vertical']}
@@ -979,12 +1309,14 @@ class InfiniteLineArtist(Artist):
 
     def update(self, data_obj, visuals, valid_idx, norm_limits, str_maps, color_limits):
         if self.visible and (self.data_name is None or valid_idx.any()):
-            visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
-            visuals[0].set_data(**visual_input)
+            if not self.skip_update(data_obj, visuals, valid_idx):
+                visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
+                visuals[0].set_data(**visual_input)
             if not visuals[0].visible:
                 visuals[0].visible = True
         elif visuals[0].visible:
             visuals[0].visible = False
+            self.last_updates.pop(visuals[0], None)
 
 class PolygonArtist(Artist):
     def __init__(self):
@@ -1008,19 +1340,19 @@ class PolygonArtist(Artist):
     def get_legend_info(self, str_map, limits_source):
         return self.create_legend_default(str_map, limits_source, self.color, self.color_field, self.colormap, self.color_label, self.color_unit, edge_color=self.edge_color, edge_color_field=self.edge_color_field, edge_colormap=self.edge_colormap, edge_color_label=self.edge_color_label, edge_color_unit=self.edge_color_unit, edge_width=self.edge_width)
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=False, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=False, get_last=is_time, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=False, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=False, get_last=is_time, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time, limits_cache=limits_cache)
         else:
             color_fields, color_keys = [self.color_field], [(self.colormap, self.color_label, self.color_unit)]
             if self.edge_width > 0 or self.edge_width_field is not None:
                 color_fields.append(self.edge_color_field)
                 color_keys.append((self.edge_colormap, self.edge_color_label, self.edge_color_unit))
-            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, get_last=is_time, color_keys=color_keys)
+            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, get_last=is_time, color_keys=color_keys, limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
         state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'x_field', 'y_field', 'visible', 'draw_order', 'legend_text', 'edge_width', 'edge_width_field', 'color', 'color_field', 'colormap', 'color_label', 'color_unit', 'edge_color', 'edge_color_field', 'edge_colormap', 'edge_color_label', 'edge_color_unit']}
@@ -1104,15 +1436,17 @@ class PolygonArtist(Artist):
 
     def update(self, data_obj, visuals, valid_idx, norm_limits, str_maps, color_limits):
         if self.visible and valid_idx.any():
-            visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
-            border_width = visual_input.pop('border_width')
-            for attr in visual_input:
-                setattr(visuals[0], attr, visual_input[attr])
-            visuals[0].border.set_data(width=border_width)
+            if not self.skip_update(data_obj, visuals, valid_idx):
+                visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
+                border_width = visual_input.pop('border_width')
+                for attr in visual_input:
+                    setattr(visuals[0], attr, visual_input[attr])
+                visuals[0].border.set_data(width=border_width)
             if not visuals[0].visible:
                 visuals[0].visible = True
         elif visuals[0].visible:
             visuals[0].visible = False
+            self.last_updates.pop(visuals[0], None)
 
 class RectangleArtist(Artist):
     def __init__(self):
@@ -1151,19 +1485,19 @@ class RectangleArtist(Artist):
     def get_legend_info(self, str_map, limits_source):
         return self.create_legend_default(str_map, limits_source, self.color, self.color_field, self.colormap, self.color_label, self.color_unit, edge_color=self.edge_color, edge_color_field=self.edge_color_field, edge_colormap=self.edge_colormap, edge_color_label=self.edge_color_label, edge_color_unit=self.edge_color_unit, edge_width=self.edge_width)
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_pos if self.x_pos_field is None else self.x_pos_field, is_1d=True, get_last=is_time, size=self.width if self.width_field is None else self.width_field)
+            return self.calc_limits(data_obj, valid_idx, self.x_pos if self.x_pos_field is None else self.x_pos_field, is_1d=True, get_last=is_time, size=self.width if self.width_field is None else self.width_field, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_pos if self.y_pos_field is None else self.y_pos_field, is_1d=True, get_last=is_time, size=self.height if self.height_field is None else self.height_field)
+            return self.calc_limits(data_obj, valid_idx, self.y_pos if self.y_pos_field is None else self.y_pos_field, is_1d=True, get_last=is_time, size=self.height if self.height_field is None else self.height_field, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, None, is_1d=True, get_last=is_time, limits_cache=limits_cache)
         else:
             color_fields, color_keys = [self.color_field], [(self.colormap, self.color_label, self.color_unit)]
             if self.edge_width > 0 or self.edge_width_field is not None:
                 color_fields.append(self.edge_color_field)
                 color_keys.append((self.edge_colormap, self.edge_color_label, self.edge_color_unit))
-            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, get_last=is_time, color_keys=color_keys)
+            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, get_last=is_time, color_keys=color_keys, limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
         state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'visible', 'draw_order', 'legend_text', 'x_pos', 'x_pos_field', 'y_pos', 'y_pos_field', 'edge_width', 'edge_width_field', 'width', 'width_field', 'height', 'height_field', 'color', 'color_field', 'colormap', 'color_label', 'color_unit', 'edge_color', 'edge_color_field', 'edge_colormap', 'edge_color_label', 'edge_color_unit']}
@@ -1246,16 +1580,18 @@ class RectangleArtist(Artist):
 
     def update(self, data_obj, visuals, valid_idx, norm_limits, str_maps, color_limits):
         if self.visible and (self.data_name is None or valid_idx.any()):
-            visual_input, transform = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
-            border_width = visual_input.pop('border_width')
-            visuals[0].transform = transform
-            for attr in visual_input:
-                setattr(visuals[0], attr, visual_input[attr])
-            visuals[0].border.set_data(width=border_width)
+            if not self.skip_update(data_obj, visuals, valid_idx):
+                visual_input, transform = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
+                border_width = visual_input.pop('border_width')
+                visuals[0].transform = transform
+                for attr in visual_input:
+                    setattr(visuals[0], attr, visual_input[attr])
+                visuals[0].border.set_data(width=border_width)
             if not visuals[0].visible:
                 visuals[0].visible = True
         elif visuals[0].visible:
             visuals[0].visible = False
+            self.last_updates.pop(visuals[0], None)
 
 class ScatterArtist(Artist):
     def __init__(self):
@@ -1276,21 +1612,19 @@ class ScatterArtist(Artist):
         visual_input['edge_color'] = self.create_color(data_obj, valid_idx, str_maps['color'], color_limits, self.edge_color, self.edge_color_field, self.edge_colormap, self.edge_color_label, self.edge_color_unit, is_1d=True, get_last=False, to_shape=to_shape) if self.edge_width > 0 else self.edge_color
         visual_input['color'] = self.create_color(data_obj, valid_idx, str_maps['color'], color_limits, self.line_color, self.line_color_field, self.line_colormap, self.line_color_label, self.line_color_unit, is_1d=True, get_last=False, to_shape=to_shape) if self.line_width > 0 else self.line_color
         if data_obj.id_field is not None:
-            id_vals = data_obj.data.loc[valid_idx, data_obj.id_field]
-            id_vals.reset_index(drop=True, inplace=True)
-            id_vals.sort_values(inplace=True, kind='mergesort')
-            visual_input['connect'] = np.column_stack([id_vals.loc[id_vals.duplicated(keep='last')].index, id_vals.loc[id_vals.duplicated(keep='first')].index])
+            segments = self.get_id_segments(data_obj, valid_idx)
+            visual_input['connect'] = np.column_stack([segments['start'], segments['end']])
         else:
             visual_input['connect'] = 'strip'
         if self.label_field is not None:
             if data_obj.time_field is None:
                 last_idx = slice(None)
             elif data_obj.id_field is not None:
-                last_idx = id_vals.drop_duplicates(keep='last').index
+                last_idx = segments['last_pos'][segments['last_pos'] >= 0]
             else:
                 last_idx = [-1]
             text_input['pos'] = visual_input['data'][last_idx]
-            text_input['text'] = ('  ' + data_obj.data.loc[valid_idx, self.label_field].iloc[last_idx].astype(str)).to_numpy()
+            text_input['text'] = '  ' + self.field_to_str(data_obj, valid_idx, self.label_field)[last_idx]
         return visual_input, text_input
 
     def get_legend_info(self, str_map, limits_source):
@@ -1347,13 +1681,13 @@ class ScatterArtist(Artist):
         icon = '<svg width="30" height="30"><defs>{}{}{}</defs>{}{}</svg>'.format(marker_colormap, edge_colormap, line_colormap, line, marker)
         return icon, list(merged_subentries.items())
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=True, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=True, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, self.z_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.z_field, is_1d=True, limits_cache=limits_cache)
         else:
             color_fields, color_keys = [], []
             if self.line_width > 0:
@@ -1365,10 +1699,10 @@ class ScatterArtist(Artist):
             if self.edge_width > 0:
                 color_fields.append(self.edge_color_field)
                 color_keys.append((self.edge_colormap, self.edge_color_label, self.edge_color_unit))
-            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, color_keys=color_keys)
+            return self.calc_limits(data_obj, valid_idx, color_fields, is_1d=True, color_keys=color_keys, limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
-        state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'x_field', 'y_field', 'z_field', 'label_field', 'label_size', 'visible', 'draw_order', 'label_draw_order', 'legend_text', 'selectable',
+        state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'x_field', 'y_field', 'z_field', 'label_field', 'label_size', 'label_culling', 'visible', 'draw_order', 'label_draw_order', 'legend_text', 'selectable',
                                                               'line_width', 'line_color', 'line_color_field', 'line_colormap', 'line_color_label', 'line_color_unit',
                                                               'marker', 'marker_size', 'marker_color', 'marker_color_field', 'marker_colormap', 'marker_color_label', 'marker_color_unit',
                                                               'edge_width', 'edge_color', 'edge_color_field', 'edge_colormap', 'edge_color_label', 'edge_color_unit']}
@@ -1382,6 +1716,8 @@ class ScatterArtist(Artist):
         scatter.order = self.draw_order
         text = vpscene.Text(anchor_x='left', font_size=self.label_size, parent=view.scene)
         text.order = self.label_draw_order
+        if self.label_culling:
+            self.label_states[text] = {'view': view, 'labels': None}
         return [scatter, text]
 
     def set_state(self, data_objs, axis_type, artist_names, unit_reg, state):
@@ -1449,7 +1785,7 @@ class ScatterArtist(Artist):
                 attrs[attr], err_msg = validators.validate_unit(attr, unit_reg, state[attr])
                 if err_msg is not None:
                     return err_msg
-        for attr in ['visible', 'selectable']:
+        for attr in ['visible', 'selectable', 'label_culling']:
             if attr in state:
                 attrs[attr] = state[attr]
                 if not isinstance(attrs[attr], (bool, np.bool_)):
@@ -1468,7 +1804,10 @@ class ScatterArtist(Artist):
             show_labels = len(text_input) > 0
             if not visuals[0].visible:
                 visuals[0].visible = True
-            if show_labels:
+            if show_labels and self.label_culling:
+                self.label_states[visuals[1]]['labels'] = text_input
+                self.layout_labels(visuals[1])
+            elif show_labels:
                 for attr in text_input:
                     setattr(visuals[1], attr, text_input[attr])
             if show_labels != visuals[1].visible:
@@ -1478,6 +1817,11 @@ class ScatterArtist(Artist):
                 visuals[0].visible = False
             if visuals[1].visible:
                 visuals[1].visible = False
+            if visuals[1] in self.label_states:
+                self.label_states[visuals[1]]['labels'] = None
+
+    def update_view(self, visuals):
+        self.layout_labels(visuals[1])
 
 class SurfaceArtist(Artist):
     def __init__(self):
@@ -1490,21 +1834,21 @@ class SurfaceArtist(Artist):
         visual_input['y'] = self.field_to_numeric(data_obj, valid_idx, str_maps['y'], self.y_field, is_1d=False, get_last=True, norm_limits=norm_limits['y'])
         visual_input['z'] = np.rot90(self.field_to_numeric(data_obj, valid_idx, str_maps['z'], self.z_field, is_1d=False, get_last=True, norm_limits=norm_limits['z']), 3)
         to_shape = visual_input['z'].shape
-        visual_input['colors'] = np.rot90(self.create_color(data_obj, valid_idx, str_maps['color'], color_limits, self.color, self.color_field, self.colormap, self.color_label, self.color_unit, is_1d=False, get_last=True, to_shape=to_shape), 3).reshape(to_shape[0] * to_shape[1], 4)
+        visual_input['colors'] = np.rot90(self.create_color(data_obj, valid_idx, str_maps['color'], color_limits, self.color, self.color_field, self.colormap, self.color_label, self.color_unit, is_1d=False, get_last=True, to_shape=to_shape), 3)
         return visual_input
 
     def get_legend_info(self, str_map, limits_source):
         return self.create_legend_default(str_map, limits_source, self.color, self.color_field, self.colormap, self.color_label, self.color_unit)
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=False, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=False, get_last=is_time, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=False, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=False, get_last=is_time, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, self.z_field, is_1d=False, get_last=is_time)
+            return self.calc_limits(data_obj, valid_idx, self.z_field, is_1d=False, get_last=is_time, limits_cache=limits_cache)
         else:
-            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=False, get_last=is_time, color_keys=[(self.colormap, self.color_label, self.color_unit)])
+            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=False, get_last=is_time, color_keys=[(self.colormap, self.color_label, self.color_unit)], limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
         state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'x_field', 'y_field', 'z_field', 'visible', 'draw_order', 'legend_text', 'color', 'color_field', 'colormap', 'color_label', 'color_unit']}
@@ -1542,19 +1886,18 @@ class SurfaceArtist(Artist):
                 if err_msg is not None:
                     return err_msg
                 if attrs[attr] is not None:
-                    data = data_objs[attrs['data_name']].data.loc[:, attrs[attr]]
-                    dtypes = data.map(type).unique()
-                    if len(dtypes) > 1 or dtypes[0] is not np.ndarray:
+                    shapes = data_objs[attrs['data_name']].get_field_fact(attrs[attr], 'array_shapes')
+                    if shapes is None:
                         return '{} must contain numpy arrays.'.format(attr)
                     elif attr in ['x_field', 'y_field']:
-                        if (data.map(np.ndim) != 1).any():
+                        if (shapes.map(len) != 1).any():
                             return '{} must contain 1D numpy arrays.'.format(attr)
-                        elif (data.map(len) == 0).any():
+                        elif (shapes.map(np.prod) == 0).any():
                             return '{} must contain 1D numpy arrays with at least one value.'.format(attr)
                     elif attr in ['z_field', 'color_field']:
-                        if (data.map(np.ndim) != 2).any():
+                        if (shapes.map(len) != 2).any():
                             return '{} must contain 2D numpy arrays.'.format(attr)
-                        elif (data.map(np.shape).map(np.prod) == 0).any():
+                        elif (shapes.map(np.prod) == 0).any():
                             return '{} must contain 2D numpy arrays with at least one row and one column.'.format(attr)
         for attr in ['legend_text', 'color_label']:
             if attr in state:
@@ -1588,11 +1931,11 @@ class SurfaceArtist(Artist):
                 return 'visible must be of type: bool'
 
         if field_changed:
-            data = data_objs[attrs['data_name']].data
-            x_len = data.loc[:, attrs['x_field']].map(len)
-            y_len = data.loc[:, attrs['y_field']].map(len)
-            z_shape = data.loc[:, attrs['z_field']].map(np.shape)
-            color_shape = None if attrs['color_field'] is None else data.loc[:, attrs['color_field']].map(np.shape)
+            data_obj = data_objs[attrs['data_name']]
+            x_len = data_obj.get_field_fact(attrs['x_field'], 'array_shapes').map(lambda s: s[0])
+            y_len = data_obj.get_field_fact(attrs['y_field'], 'array_shapes').map(lambda s: s[0])
+            z_shape = data_obj.get_field_fact(attrs['z_field'], 'array_shapes')
+            color_shape = None if attrs['color_field'] is None else data_obj.get_field_fact(attrs['color_field'], 'array_shapes')
             if color_shape is not None and (z_shape != color_shape).any():
                 return 'Every array in color_field must have the same shape as its corresponding array in z_field.'
             elif (x_len != z_shape.map(lambda s: s[1])).any():
@@ -1605,14 +1948,18 @@ class SurfaceArtist(Artist):
 
     def update(self, data_obj, visuals, valid_idx, norm_limits, str_maps, color_limits):
         if self.visible and valid_idx.any():
-            visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
-            colors = visual_input.pop('colors')
-            visuals[0].set_data(**visual_input)
-            visuals[0].mesh_data.set_vertex_colors(colors)
+            if not self.skip_update(data_obj, visuals, valid_idx):
+                visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
+                rotated_colors = visual_input.pop('colors')
+                colors = self.get_buffer(visuals[0], 'colors', (rotated_colors.shape[0] * rotated_colors.shape[1], 4), 'float32')
+                np.copyto(colors.reshape(rotated_colors.shape), rotated_colors) # Write the rotated colors into the existing buffer instead of copying them into a new array
+                visuals[0].set_data(**visual_input)
+                visuals[0].mesh_data.set_vertex_colors(colors)
             if not visuals[0].visible:
                 visuals[0].visible = True
         elif visuals[0].visible:
             visuals[0].visible = False
+            self.last_updates.pop(visuals[0], None)
 
 class TextArtist(Artist):
     def __init__(self):
@@ -1621,7 +1968,7 @@ class TextArtist(Artist):
 
     def get_current_data(self, data_obj, valid_idx, norm_limits, str_maps, color_limits):
         visual_input = {}
-        visual_input['text'] = data_obj.data.loc[valid_idx, self.text_field].astype('str').to_numpy()
+        visual_input['text'] = self.field_to_str(data_obj, valid_idx, self.text_field)
         x = self.field_to_numeric(data_obj, valid_idx, str_maps['x'], self.x_field, is_1d=True, norm_limits=norm_limits['x'])
         y = self.field_to_numeric(data_obj, valid_idx, str_maps['y'], self.y_field, is_1d=True, norm_limits=norm_limits['y'])
         z = self.field_to_numeric(data_obj, valid_idx, str_maps['z'], self.z_field, is_1d=True, norm_limits=norm_limits['z'])
@@ -1632,24 +1979,26 @@ class TextArtist(Artist):
     def get_legend_info(self, str_map, limits_source):
         return self.create_legend_default(str_map, limits_source, self.color, self.color_field, self.colormap, self.color_label, self.color_unit)
 
-    def get_limits(self, data_obj, valid_idx, limit_type, is_time):
+    def get_limits(self, data_obj, valid_idx, limit_type, is_time, limits_cache=None):
         if limit_type == 'x':
-            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.x_field, is_1d=True, limits_cache=limits_cache)
         elif limit_type == 'y':
-            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.y_field, is_1d=True, limits_cache=limits_cache)
         elif limit_type == 'z':
-            return self.calc_limits(data_obj, valid_idx, self.z_field, is_1d=True)
+            return self.calc_limits(data_obj, valid_idx, self.z_field, is_1d=True, limits_cache=limits_cache)
         else:
-            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=True, color_keys=[self.colormap, self.color_label, self.color_unit])
+            return self.calc_limits(data_obj, valid_idx, [self.color_field], is_1d=True, color_keys=[self.colormap, self.color_label, self.color_unit], limits_cache=limits_cache)
 
     def get_state(self, as_copy=True):
         state = {attr: getattr(self, attr, None) for attr in ['artist_type', 'name', 'data_name', 'text_field', 'x_field', 'y_field', 'z_field', 'visible', 'draw_order', 'legend_text',
-                                                              'x_anchor', 'y_anchor', 'font_size', 'bold', 'italic', 'color', 'color_field', 'colormap', 'color_label', 'color_unit']}
+                                                              'x_anchor', 'y_anchor', 'font_size', 'bold', 'italic', 'label_culling', 'color', 'color_field', 'colormap', 'color_label', 'color_unit']}
         return copy.deepcopy(state) if as_copy else state
 
     def initialize(self, view):
         text = vpscene.Text(anchor_x=self.x_anchor, anchor_y=self.y_anchor, bold=self.bold, font_size=self.font_size, italic=self.italic, parent=view.scene)
         text.order = self.draw_order
+        if self.label_culling:
+            self.label_states[text] = {'view': view, 'labels': None}
         return [text]
 
     def set_state(self, data_objs, axis_type, artist_names, unit_reg, state):
@@ -1717,7 +2066,7 @@ class TextArtist(Artist):
             attrs['color_unit'], err_msg = validators.validate_unit('color_unit', unit_reg, state['color_unit'])
             if err_msg is not None:
                 return err_msg
-        for attr in ['visible', 'bold', 'italic']:
+        for attr in ['visible', 'bold', 'italic', 'label_culling']:
             if attr in state:
                 attrs[attr] = state[attr]
                 if not isinstance(attrs[attr], (bool, np.bool_)):
@@ -1729,12 +2078,21 @@ class TextArtist(Artist):
     def update(self, data_obj, visuals, valid_idx, norm_limits, str_maps, color_limits):
         if self.visible and valid_idx.any():
             visual_input = self.get_current_data(data_obj, valid_idx, norm_limits, str_maps, color_limits)
-            for attr in visual_input:
-                setattr(visuals[0], attr, visual_input[attr])
+            if self.label_culling:
+                self.label_states[visuals[0]]['labels'] = visual_input
+                self.layout_labels(visuals[0])
+            else:
+                for attr in visual_input:
+                    setattr(visuals[0], attr, visual_input[attr])
             if not visuals[0].visible:
                 visuals[0].visible = True
         elif visuals[0].visible:
             visuals[0].visible = False
+            if visuals[0] in self.label_states:
+                self.label_states[visuals[0]]['labels'] = None
+
+    def update_view(self, visuals):
+        self.layout_labels(visuals[0])
 
 def create_artist(artist_type):
     if artist_type == 'arrow':
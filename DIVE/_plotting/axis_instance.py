@@ -1,10 +1,14 @@
-from . import custom_vispy
+from . import custom_vispy, text_metrics
 from .._utilities import helper_functions
+from .._utilities.lru_cache import LRUCache
 import dateutil
+import itertools
 import numpy as np
 import pandas as pd
 import vispy.scene as vpscene
 
+legend_versions = itertools.count() # Used to give each set of limits a unique version number
+
 class AxisInstance:
     """
     This class is an instance of a DIVEAxis object that contains the vispy objects for the axis.
@@ -14,24 +18,30 @@ class AxisInstance:
     Throughout this class and the artist classes, x/y/z positions are normalized to be between -0.5 and 0.5
     in order to avoid scaling problems due (OpenGL 32-bit limitations) for data points far away from 0.
     """
-    def __init__(self, data_objs, axis_obj, grid_cell, apply_limits_filter, theme, label_size, tick_size):
+    def __init__(self, data_objs, axis_obj, grid_cell, apply_limits_filter, theme, label_size, tick_size, limits=None):
         self.state = axis_obj.get_state()
         self.artists = {}
+        self.artist_objs = {} # The artist objects are kept so that their visuals can be updated when the view changes
         self.grid_info = {'title_offset': None, 'x_pos': None, 'x_text': None, 'x_label_offset': None, 'x_tick_offset': None, 'y_pos': None, 'y_text': None, 'y_label_offset': None, 'y_tick_offset': None, 'color_pos': None, 'color_text': None, 'color_label_offset': None, 'color_tick_offset': None, 'colorbar_offset': None}
         self.current_color_key = None
         self.timezone = 'UTC'
         self.unit_reg = None
         self.str_maps = {}
-        self.label_cache = {}
-        self.tick_cache = {}
+        self.tick_cache = LRUCache(256)
         self.axis_text_padding = 10
 
-        self.limits_all, self.str_maps_all, self.limits_source_all = self.get_artist_limits(data_objs, axis_obj, 'all')
-        self.limits_filter, self.str_maps_filter, self.limits_source_filter = self.get_artist_limits(data_objs, axis_obj, 'filter')
+        if limits is None:
+            limits = {scope: self.get_artist_limits(data_objs, axis_obj, scope) for scope in ['all', 'filter']}
+        # The limits may be shared with other instances of the same axis, so the dicts are copied before any of their items can be replaced
+        self.limits_all, self.str_maps_all, self.limits_source_all = [dict(d) for d in limits['all']]
+        self.limits_filter, self.str_maps_filter, self.limits_source_filter = [dict(d) for d in limits['filter']]
 
         self.view = grid_cell.add_widget(custom_vispy.ViewBox(self, camera=custom_vispy.Camera_2D() if axis_obj.axis_type == '2d' else custom_vispy.Camera_3D(fov=0.0)))
         for artist_obj in axis_obj.artists.values():
             self.artists[artist_obj.name] = artist_obj.initialize(self.view)
+            self.artist_objs[artist_obj.name] = artist_obj
+        self.labels_2d = vpscene.Text(bold=True)
+        self.ticks_2d = vpscene.Text()
         self.labels_3d = vpscene.Text(bold=True)
         self.ticks_3d = vpscene.Text()
         if isinstance(self.view.camera, custom_vispy.Camera_3D):
@@ -48,7 +58,7 @@ class AxisInstance:
         self.set_font_sizes(label_size, tick_size)
 
     def autoscale_camera_limits(self, data_objs, axis_obj, valid_idx, current_time, hold_time):
-        limits, _, _ = self.get_artist_limits(data_objs, axis_obj, 'time', valid_idx, current_time, hold_time)
+        limits, _, _ = self.get_artist_limits(data_objs, axis_obj, 'time', valid_idx, current_time, hold_time, current_str_maps=self.str_maps)
         self.set_camera_limits(limits)
 
     def cycle_color_key(self):
@@ -67,7 +77,40 @@ class AxisInstance:
         if self.current_color_key is not None and prev_cmap != self.current_color_key[0]:
             self.colorbar.cmap = self.current_color_key[0]
 
+    def edit_artist(self, data_objs, axis_obj, name, impact, apply_limits_filter):
+        """
+        Update the axis after one of its artists was edited without recreating the axis.
+
+        Parameters
+        ----------
+        data_objs : dict
+            The data objects to use.
+        axis_obj : DIVEAxis
+            The axis object that has the artist.
+        name : str
+            The name of the artist that was edited.
+        impact : str
+            The impact of the edit ("visual" or "color") from the artist's "get_edit_impact" function.
+        apply_limits_filter : bool
+            Toggle whether filters should be applied to the limits.
+        """
+        artist_obj = axis_obj.artists[name]
+        for visual in self.artists[name]:
+            visual.parent = None
+        self.artists[name] = artist_obj.initialize(self.view)
+        self.artist_objs[name] = artist_obj
+        artist_obj.set_theme(self.artists[name], self.theme)
+        if impact == 'color':
+            for scope, limits, str_maps, limits_source in [('all', self.limits_all, self.str_maps_all, self.limits_source_all), ('filter', self.limits_filter, self.str_maps_filter, self.limits_source_filter)]:
+                color_limits, color_str_maps, color_limits_source = self.get_artist_limits(data_objs, axis_obj, scope, limit_types=['color'])
+                limits['color'], str_maps['color'], limits_source['color'] = color_limits['color'], color_str_maps['color'], color_limits_source['color']
+            if self.current_color_key not in self.limits_source['color'] or self.limits_source['color'][self.current_color_key] == 'str':
+                self.current_color_key = None
+        self.filter_limits(None, axis_obj, apply_limits_filter)
+
     def filter_limits(self, data_objs, axis_obj, apply_limits_filter):
+        self.tick_cache.clear()
+        self.legend_version = next(legend_versions)
         if data_objs is not None:
             self.limits_filter, self.str_maps_filter, self.limits_source_filter = self.get_artist_limits(data_objs, axis_obj, 'filter')
         if apply_limits_filter:
@@ -81,92 +124,17 @@ class AxisInstance:
 
     def get_artist_legend(self, data_objs, axis_obj, apply_limits_filter):
         entries = []
-        for artist in axis_obj.artists.values():
-            if (artist.visible or not apply_limits_filter) and artist.legend_text is not None and (artist.data_name is None or data_objs[artist.data_name].filtered_idx.any()):
+        for artist in self.artist_objs.values(): # The artists in the axis object can differ from the ones in this instance until a batch update recreates the grid cell
+            if (artist.visible or not apply_limits_filter) and artist.legend_text is not None and (artist.data_name is None or (artist.data_name in data_objs and data_objs[artist.data_name].filtered_idx.any())):
                 artist_icon, artist_subentries = artist.get_legend_info(self.str_maps['color'], self.limits_source['color'])
                 entries.append((artist.legend_text, artist_icon, artist_subentries))
         return entries
 
-    def get_artist_limits(self, data_objs, axis_obj, scope, valid_idx=None, current_time=None, hold_time=None):
-        temp_key = 0 # Using temp_key for x, y, and z simplifies the code for combining limits
-        limits = {'x': {temp_key: []}, 'y': {temp_key: []}, 'z': {temp_key: []}, 'color': {}}
-        str_maps = {'x': {temp_key: []}, 'y': {temp_key: []}, 'z': {temp_key: []}, 'color': {}}
-        limits_source = {'x': {temp_key: []}, 'y': {temp_key: []}, 'z': {temp_key: []}, 'color': {}}
-
-        # Get limits for each artist
-        for artist_obj in axis_obj.artists.values():
-            if scope in ['filter', 'time'] and not artist_obj.visible:
-                continue
-            data_obj = data_objs.get(artist_obj.data_name, None)
-            is_time = False
-            if scope == 'filter':
-                idx = data_obj.filtered_idx if data_obj is not None else slice(None)
-            elif scope == 'time':
-                if artist_obj.data_name is not None and artist_obj.data_name not in valid_idx:
-                    valid_idx[artist_obj.data_name] = data_obj.get_valid_idx(current_time, hold_time)
-                idx = valid_idx.get(artist_obj.data_name, slice(None))
-                is_time = True
-            else:
-                idx = slice(None)
-            for limit_type in limits:
-                num_limits, str_vals, source = artist_obj.get_limits(data_obj, idx, limit_type, is_time)
-                if limit_type == 'color':
-                    for key in num_limits:
-                        limits[limit_type][key] = limits[limit_type].get(key, []) + num_limits[key]
-                    for key in str_vals:
-                        str_maps[limit_type][key] = str_maps[limit_type].get(key, []) + str_vals[key]
-                    for key in source:
-                        limits_source[limit_type][key] = limits_source[limit_type].get(key, []) + source[key]
-                else:
-                    limits[limit_type][temp_key] += num_limits
-                    str_maps[limit_type][temp_key] += str_vals
-                    limits_source[limit_type][temp_key] += source
-
-        # Combine limits of all artists
-        for limit_type in limits:
-            for key in str_maps[limit_type]:
-                unique_strs = np.unique(str_maps[limit_type][key]).tolist()
-                unique_strs.sort(key=helper_functions.natural_order)
-                n_strs = len(unique_strs)
-                str_maps[limit_type][key] = pd.Series(np.arange(n_strs), index=unique_strs)
-                if n_strs > 0:
-                    if scope == 'time':
-                        current_map = self.str_maps[limit_type][key] if limit_type == 'color' else self.str_maps[limit_type]
-                        current_map = current_map.loc[unique_strs]
-                        limits[limit_type][key] += [np.min(current_map), np.max(current_map)]
-                    else:
-                        limits[limit_type][key] += [0, n_strs - 1]
-            for key in limits[limit_type]:
-                if len(limits[limit_type][key]) > 0:
-                    limits[limit_type][key] = [np.min(limits[limit_type][key]), np.max(limits[limit_type][key])]
-                    if limits[limit_type][key][0] == limits[limit_type][key][1]:
-                        limits[limit_type][key][0] -= 1
-                        limits[limit_type][key][1] += 1
-                else:
-                    limits[limit_type][key] = [0, 1]
-            for key in limits_source[limit_type]:
-                unique_sources = set(limits_source[limit_type][key])
-                if len(unique_sources) > 1:
-                    print('Warning: {}-axis in "{}" is using multiple data types.'.format(limit_type, self.state['name']))
-                    for s in ['str', 'date']:
-                        if s in unique_sources:
-                            limits_source[limit_type][key] = s
-                            break
-                else:
-                    limits_source[limit_type][key] = 'num' if len(unique_sources) == 0 else unique_sources.pop()
-
-        for key in ['x', 'y', 'z']:
-            limits[key] = limits[key][temp_key]
-            str_maps[key] = str_maps[key][temp_key]
-            limits_source[key] = limits_source[key][temp_key]
-
-        return limits, str_maps, limits_source
-
     def get_artist_selected(self, data_objs, axis_obj, current_time, hold_time, vertices):
         output, valid_idx = {}, {}
         norm_limits = self.limits_all if isinstance(self.view.camera, custom_vispy.Camera_2D) else self.limits
-        for artist_obj in axis_obj.artists.values():
-            if artist_obj.data_name is not None and artist_obj.visible and artist_obj.selectable:
+        for artist_obj in self.artist_objs.values():
+            if artist_obj.data_name in data_objs and artist_obj.visible and artist_obj.selectable:
                 if artist_obj.data_name not in valid_idx:
                     valid_idx[artist_obj.data_name] = data_objs[artist_obj.data_name].get_valid_idx(current_time, hold_time)
                 artist_coords = artist_obj.get_coordinates(data_objs[artist_obj.data_name], valid_idx[artist_obj.data_name], norm_limits, self.str_maps)
@@ -217,111 +185,36 @@ class AxisInstance:
         tick_scale = self.view.canvas.tick_font_size / 72 * self.view.canvas.dpi
         if self.current_color_key is not None:
             colorbar_label = self.get_label(self.current_color_key[1], self.limits_source['color'][self.current_color_key], self.current_color_key[2])
-            self.grid_info['color_pos'], color_time_interval = self.get_tick_location(self.limits['color'][self.current_color_key][0], self.limits['color'][self.current_color_key][1], False, self.limits_source['color'][self.current_color_key], self.str_maps['color'][self.current_color_key], self.current_color_key[2])
-            self.grid_info['color_text'] = self.get_tick_format(self.grid_info['color_pos'], self.limits_source['color'][self.current_color_key], color_time_interval, self.str_maps['color'][self.current_color_key], self.current_color_key[2])
-            self.grid_info['color_label_offset'] = np.ptp(label_scale * self.get_text_bbox(colorbar_label, self.view.canvas.labels_2d._font, self.view.canvas.labels_2d._font._lowres_size, self.label_cache)[:, 1]) + self.axis_text_padding if colorbar_label is not None else 0
-            self.grid_info['color_tick_offset'] = np.array([np.ptp(tick_scale * self.get_text_bbox(val, self.view.canvas.ticks_2d._font, self.view.canvas.ticks_2d._font._lowres_size, self.tick_cache)[:, 0]) + self.axis_text_padding for val in self.grid_info['color_text']])
+            self.grid_info['color_pos'], self.grid_info['color_text'] = self.get_ticks('color', self.limits['color'][self.current_color_key][0], self.limits['color'][self.current_color_key][1], False, self.limits_source['color'][self.current_color_key], self.str_maps['color'][self.current_color_key], self.current_color_key[2])
+            self.grid_info['color_label_offset'] = label_scale * text_metrics.measure_text([colorbar_label], self.labels_2d._font)[0, 1] + self.axis_text_padding if colorbar_label is not None else 0
+            self.grid_info['color_tick_offset'] = tick_scale * text_metrics.measure_text(self.grid_info['color_text'], self.ticks_2d._font)[:, 0] + self.axis_text_padding
             self.grid_info['colorbar_offset'] = self.view.parent.size[0] * 0.02
         else:
             self.grid_info['color_label_offset'] = 0
             self.grid_info['color_tick_offset'] = 0
             self.grid_info['colorbar_offset'] = 0
-        self.grid_info['title_offset'] =  np.ptp(label_scale * self.get_text_bbox(self.state['title'], self.view.canvas.labels_2d._font, self.view.canvas.labels_2d._font._lowres_size, self.label_cache)[:, 1]) + self.axis_text_padding if self.state['title'] is not None else self.axis_text_padding
+        self.grid_info['title_offset'] =  label_scale * text_metrics.measure_text([self.state['title']], self.labels_2d._font)[0, 1] + self.axis_text_padding if self.state['title'] is not None else self.axis_text_padding
         left, right, top, bottom = 0, np.max(self.grid_info['color_tick_offset']) + self.grid_info['color_label_offset'] + self.grid_info['colorbar_offset'] + self.axis_text_padding, self.grid_info['title_offset'], 0
         if isinstance(self.view.camera, custom_vispy.Camera_2D):
             x_min, x_max, y_min, y_max = self.get_camera_limits_2d() # Get non-normalized limits
 
             x_label = self.get_label(self.state['x_label'], self.limits_source['x'], self.state['x_unit'])
-            self.grid_info['x_pos'], x_time_interval = self.get_tick_location(x_min, x_max, True, self.limits_source['x'], self.str_maps['x'], self.state['x_unit'])
-            self.grid_info['x_text'] = self.get_tick_format(self.grid_info['x_pos'], self.limits_source['x'], x_time_interval, self.str_maps['x'], self.state['x_unit'])
-            self.grid_info['x_label_offset'] = np.ptp(label_scale * self.get_text_bbox(x_label, self.view.canvas.labels_2d._font, self.view.canvas.labels_2d._font._lowres_size, self.label_cache)[:, 1]) + self.axis_text_padding if x_label is not None else 0
-            self.grid_info['x_tick_offset'] = np.array([np.ptp(tick_scale * self.get_text_bbox(val, self.view.canvas.ticks_2d._font, self.view.canvas.ticks_2d._font._lowres_size, self.tick_cache)[:, 1]) + self.axis_text_padding for val in self.grid_info['x_text']])
+            self.grid_info['x_pos'], self.grid_info['x_text'] = self.get_ticks('x', x_min, x_max, True, self.limits_source['x'], self.str_maps['x'], self.state['x_unit'])
+            self.grid_info['x_label_offset'] = label_scale * text_metrics.measure_text([x_label], self.labels_2d._font)[0, 1] + self.axis_text_padding if x_label is not None else 0
+            self.grid_info['x_tick_offset'] = tick_scale * text_metrics.measure_text(self.grid_info['x_text'], self.ticks_2d._font)[:, 1] + self.axis_text_padding
             # Perform normalization
             self.grid_info['x_pos'] = -0.5 + (self.grid_info['x_pos'] - self.limits_all['x'][0]) / (self.limits_all['x'][1] - self.limits_all['x'][0])
             bottom = self.grid_info['x_label_offset'] + (np.max(self.grid_info['x_tick_offset']) if len(self.grid_info['x_tick_offset']) > 0 else 0)
 
             y_label = self.get_label(self.state['y_label'], self.limits_source['y'], self.state['y_unit'])
-            self.grid_info['y_pos'], y_time_interval = self.get_tick_location(y_min, y_max, False, self.limits_source['y'], self.str_maps['y'], self.state['y_unit'])
-            self.grid_info['y_text'] = self.get_tick_format(self.grid_info['y_pos'], self.limits_source['y'], y_time_interval, self.str_maps['y'], self.state['y_unit'])
-            self.grid_info['y_label_offset'] = np.ptp(label_scale * self.get_text_bbox(y_label, self.view.canvas.labels_2d._font, self.view.canvas.labels_2d._font._lowres_size, self.label_cache)[:, 1]) + self.axis_text_padding if y_label is not None else 0
-            self.grid_info['y_tick_offset'] = np.array([np.ptp(tick_scale * self.get_text_bbox(val, self.view.canvas.ticks_2d._font, self.view.canvas.ticks_2d._font._lowres_size, self.tick_cache)[:, 0]) + self.axis_text_padding for val in self.grid_info['y_text']])
+            self.grid_info['y_pos'], self.grid_info['y_text'] = self.get_ticks('y', y_min, y_max, False, self.limits_source['y'], self.str_maps['y'], self.state['y_unit'])
+            self.grid_info['y_label_offset'] = label_scale * text_metrics.measure_text([y_label], self.labels_2d._font)[0, 1] + self.axis_text_padding if y_label is not None else 0
+            self.grid_info['y_tick_offset'] = tick_scale * text_metrics.measure_text(self.grid_info['y_text'], self.ticks_2d._font)[:, 0] + self.axis_text_padding
             # Perform normalization
             self.grid_info['y_pos'] = -0.5 + (self.grid_info['y_pos'] - self.limits_all['y'][0]) / (self.limits_all['y'][1] - self.limits_all['y'][0])
             left = self.grid_info['y_label_offset'] + (np.max(self.grid_info['y_tick_offset']) if len(self.grid_info['y_tick_offset']) > 0 else 0)
         return (left, right, top, bottom)
 
-    def get_text_bbox(self, text, font, lowres_size, cache):
-        """
-        This is a modified version of vispy.visuals.text.text._text_to_vbo
-        """
-        if text in cache:
-            return cache[text]
-        vertices = np.zeros((len(text) * 4, 2), dtype='float32')
-        prev = None
-        width = height = ascender = descender = 0
-        ratio, slop = 1. / font.ratio, font.slop
-        x_off = -slop
-
-        for char in 'hy':
-            glyph = font[char]
-            y0 = glyph['offset'][1] * ratio + slop
-            y1 = y0 - glyph['size'][1]
-            ascender = max(ascender, y0 - slop)
-            descender = min(descender, y1 + slop)
-            height = max(height, glyph['size'][1] - 2*slop)
-
-        glyph = font[' ']
-        spacewidth = glyph['advance'] * ratio
-        lineheight = height * 1.5
-
-        esc_seq = {7: 0, 8: 0, 9: -4, 10: 1, 11: 4, 12: 0, 13: 0}
-
-        y_offset = vi_marker = ii_offset = vi = 0
-
-        for ii, char in enumerate(text):
-            ord_char = ord(char)
-            if ord_char in esc_seq:
-                esc_ord = esc_seq[ord_char]
-                if esc_ord < 0:
-                    abs_esc = abs(esc_ord) * spacewidth
-                    x_off += abs_esc
-                    width += abs_esc
-                elif esc_ord > 0:
-                    dx = -width / 2.
-                    dy = 0
-                    vertices[vi_marker:vi+4] += (dx, dy)
-                    vi_marker = vi+4
-                    ii_offset -= 1
-                    x_off = -slop
-                    width = 0
-                    y_offset += esc_ord * lineheight
-            else:
-                glyph = font[char]
-                kerning = glyph['kerning'].get(prev, 0.) * ratio
-                x0 = x_off + glyph['offset'][0] * ratio + kerning
-                y0 = glyph['offset'][1] * ratio + slop - y_offset
-                x1 = x0 + glyph['size'][0]
-                y1 = y0 - glyph['size'][1]
-                position = [[x0, y0], [x0, y1], [x1, y1], [x1, y0]]
-                vi = (ii + ii_offset) * 4
-                vertices[vi:vi+4] = position
-                x_move = glyph['advance'] * ratio + kerning
-                x_off += x_move
-                ascender = max(ascender, y0 - slop)
-                descender = min(descender, y1 + slop)
-                width += x_move
-                prev = char
-
-        dx = -width / 2.
-        dy = (-descender - ascender) / 2
-
-        vertices[0:vi_marker] += (0, dy)
-        vertices[vi_marker:] += (dx, dy)
-        vertices /= lowres_size
-
-        cache[text] = vertices
-        return vertices
-
     def get_tick_format(self, ticks, tick_type, time_interval, str_map, unit):
         """
         Get the text for every tick position.
@@ -329,7 +222,7 @@ class AxisInstance:
         if len(ticks) == 0:
             return np.array([], dtype='str')
         if self.unit_reg is not None and unit is not None and tick_type == 'num':
-            ticks = self.unit_reg.Quantity(ticks, unit[0]).to(unit[1]).magnitude
+            ticks = helper_functions.convert_units(self.unit_reg, ticks, unit[0], unit[1])
         if tick_type == 'num' or (tick_type == 'date' and time_interval == 'msecond'):
             # This code is adapted from matplotlib's Ticker class
             loc_range = np.ptp(ticks)
@@ -359,9 +252,10 @@ class AxisInstance:
         elif tick_type == 'str':
             return str_map.index[ticks].to_numpy(dtype='str')
 
-    def get_tick_location(self, vmin, vmax, horizontal, tick_type, str_map, unit):
+    def get_tick_location(self, vmin, vmax, horizontal, tick_type, str_map, unit, pad=0):
         """
         Get the tick positions based on the visible axis limits.
+        The spacing of the ticks is chosen for the visible limits, but the positions cover the limits extended by "pad" on each side.
         """
         time_interval = 'msecond'
         dim_idx, tick_mult = (0, 6 if tick_type == 'date' else 3) if horizontal else (1, 2)
@@ -369,10 +263,11 @@ class AxisInstance:
         space = int(np.floor(length / (self.view.canvas.tick_font_size * tick_mult))) if self.view.canvas.tick_font_size > 0 else 100
         if tick_type == 'date':
             edge_offset = pd.Timedelta(days=365)
-            clip_vmin, clip_vmax = np.clip([vmin, vmax], (pd.Timestamp.min + edge_offset).normalize().timestamp(), (pd.Timestamp.max.replace(nanosecond=0) - edge_offset).normalize().timestamp())
+            clip_vmin, clip_vmax, pad_vmin, pad_vmax = np.clip([vmin, vmax, vmin - pad, vmax + pad], (pd.Timestamp.min + edge_offset).normalize().timestamp(), (pd.Timestamp.max.replace(nanosecond=0) - edge_offset).normalize().timestamp())
             if clip_vmin == clip_vmax:
                 return np.array([]), time_interval
-            clip_dmin, clip_dmax = pd.Timestamp(clip_vmin * 1e9, tz='UTC').replace(nanosecond=0).tz_convert(self.timezone).to_pydatetime(), pd.Timestamp(clip_vmax * 1e9, tz='UTC').replace(nanosecond=0).tz_convert(self.timezone).to_pydatetime()
+            to_datetime = lambda value: pd.Timestamp(value * 1e9, tz='UTC').replace(nanosecond=0).tz_convert(self.timezone).to_pydatetime()
+            clip_dmin, clip_dmax, pad_dmin, pad_dmax = to_datetime(clip_vmin), to_datetime(clip_vmax), to_datetime(pad_vmin), to_datetime(pad_vmax)
             delta = dateutil.relativedelta.relativedelta(clip_dmax, clip_dmin)
             tdelta = clip_dmax - clip_dmin
             nums = [delta.years]
@@ -393,22 +288,23 @@ class AxisInstance:
                     if nums[i] <= interval * np.clip(space, 1, maxticks[i]):
                         break
                 if i == 0:
-                    byrange = list(range(clip_dmin.year // interval * interval, clip_dmax.year // interval * interval + 1, interval))
+                    byrange = list(range(pad_dmin.year // interval * interval, pad_dmax.year // interval * interval + 1, interval))
                 else:
                     byrange = list(byranges[i][::interval])
                     if i == 2 and (interval == 7 or interval == 14):
                         byrange = byrange[:-1]
-                ticks = pd.date_range(clip_dmin.replace(tzinfo=None), clip_dmax.replace(tzinfo=None), freq=freq[i]).tz_localize(self.timezone, ambiguous=False, nonexistent='shift_backward').floor(freq='D' if freq[i] in ['YS', 'MS'] else freq[i])
+                ticks = pd.date_range(pad_dmin.replace(tzinfo=None), pad_dmax.replace(tzinfo=None), freq=freq[i]).tz_localize(self.timezone, ambiguous=False, nonexistent='shift_backward').floor(freq='D' if freq[i] in ['YS', 'MS'] else freq[i])
                 ticks = ticks[np.isin(getattr(ticks, freq_map[freq[i]]), byrange)].view('int64') / 1e9
-                return ticks[(ticks >= clip_vmin) & (ticks <= clip_vmax)], freq_map[freq[i]]
+                return ticks[(ticks >= pad_vmin) & (ticks <= pad_vmax)], freq_map[freq[i]]
 
             # Use numerical tick calculation for ranges less than one second
             tick_type = 'num'
             unit = None
         if tick_type == 'num':
             # This block of code is adapted from matplotlib's Ticker class
+            pad_vmin, pad_vmax = vmin - pad, vmax + pad
             if self.unit_reg is not None and unit is not None:
-                vmin, vmax = self.unit_reg.Quantity(vmin, unit[0]).to(unit[1]).magnitude, self.unit_reg.Quantity(vmax, unit[0]).to(unit[1]).magnitude
+                vmin, vmax, pad_vmin, pad_vmax = helper_functions.convert_units(self.unit_reg, np.array([vmin, vmax, pad_vmin, pad_vmax]), unit[0], unit[1])
 
             if (not np.isfinite(vmin)) or (not np.isfinite(vmax)):
                 vmin, vmax = -1e-13, 1e-13
@@ -451,16 +347,43 @@ class AxisInstance:
                 ticks = np.arange(low, high + 1) * step + best_vmin
                 if ((ticks <= offset_vmax) & (ticks >= offset_vmin)).sum() >= 2:
                     break
+            pad_limits = [limit for limit in [pad_vmin, pad_vmax] if np.isfinite(limit)] # The padded limits may not be finite or ordered after unit conversion
+            pad_vmin, pad_vmax = min([vmin] + pad_limits), max([vmax] + pad_limits)
+            if pad_vmin < vmin or pad_vmax > vmax:
+                ticks = np.arange(low + np.floor((pad_vmin - vmin) / step), high + np.ceil((pad_vmax - vmax) / step) + 1) * step + best_vmin
             ticks += offset
-            ticks = ticks[(ticks >= vmin) & (ticks <= vmax)]
+            ticks = ticks[(ticks >= pad_vmin) & (ticks <= pad_vmax)]
 
             if self.unit_reg is not None and unit is not None:
-                ticks = self.unit_reg.Quantity(ticks, unit[1]).to(unit[0]).magnitude
+                ticks = helper_functions.convert_units(self.unit_reg, ticks, unit[1], unit[0])
             return ticks, time_interval
         elif tick_type == 'str':
-            ticks = np.arange(np.ceil(vmin), np.floor(vmax) + 1, dtype='int')
+            ticks = np.arange(np.ceil(vmin - pad), np.floor(vmax + pad) + 1, dtype='int')
             return ticks[(ticks >= str_map.iat[0]) & (ticks <= str_map.iat[-1])], time_interval
 
+    def get_ticks(self, dim, vmin, vmax, horizontal, tick_type, str_map, unit):
+        """
+        Get the tick positions and text based on the visible axis limits of a dimension ("x", "y", "z" or "color").
+        Tick positions are calculated for the visible range padded by its span on each side and are cached for each zoom level (about 1% of the span),
+        so they can be reused while the camera pans. The text depends on which ticks are visible, so it is cached for each set of visible ticks.
+        """
+        span = vmax - vmin
+        if not (np.isfinite(span) and span > 0):
+            positions, time_interval = self.get_tick_location(vmin, vmax, horizontal, tick_type, str_map, unit)
+            return positions, self.get_tick_format(positions, tick_type, time_interval, str_map, unit)
+        key = (dim, horizontal, tuple(self.view.parent.size), self.view.canvas.tick_font_size, tick_type, None if unit is None else tuple(unit), self.timezone, int(np.floor(np.log2(span) * 100)))
+        ticks = self.tick_cache.get(key)
+        if ticks is None or ticks['str_map'] is not str_map or vmin < ticks['vmin'] or vmax > ticks['vmax']: # The str values have changed or the camera has panned outside of the padded range
+            positions, time_interval = self.get_tick_location(vmin, vmax, horizontal, tick_type, str_map, unit, pad=span)
+            ticks = {'str_map': str_map, 'vmin': vmin - span, 'vmax': vmax + span, 'positions': positions, 'time_interval': time_interval, 'text': LRUCache(16)}
+            self.tick_cache.set(key, ticks)
+        positions = ticks['positions'][(ticks['positions'] >= vmin) & (ticks['positions'] <= vmax)]
+        text = ticks['text'].get(positions.tobytes())
+        if text is None:
+            text = self.get_tick_format(positions, tick_type, ticks['time_interval'], str_map, unit)
+            ticks['text'].set(positions.tobytes(), text)
+        return positions, text
+
     def reset_camera_limits(self):
         self.set_camera_limits(self.limits)
 
@@ -479,30 +402,40 @@ class AxisInstance:
             self.view.camera.set_range(x=limits['x'], y=limits['y'], z=limits['z'], margin=1e-45)
 
     def set_font_sizes(self, label_size, tick_size):
-        self.label_cache, self.tick_cache = {}, {}
+        self.labels_2d.font_size = label_size
+        self.ticks_2d.font_size = tick_size
         if isinstance(self.view.camera, custom_vispy.Camera_3D):
             self.labels_3d.font_size = label_size
             self.ticks_3d.font_size = tick_size
 
     def set_theme(self, axis_obj, theme):
+        self.theme = theme
         color = 'w' if theme == 'dark' else 'k'
+        self.labels_2d.color = color
+        self.ticks_2d.color = color
         if isinstance(self.view.camera, custom_vispy.Camera_2D):
             self.view.border_color = color
         else:
             self.labels_3d.color = color
             self.ticks_3d.color = color
-        for artist_obj in axis_obj.artists.values():
-            artist_obj.set_theme(self.artists[artist_obj.name], theme)
+        for name, artist_obj in self.artist_objs.items():
+            artist_obj.set_theme(self.artists[name], theme)
 
-    def update_artists(self, data_objs, axis_obj, valid_idx, current_time, hold_time, timezone, unit_reg, time_updated):
+    def update_artists(self, data_objs, axis_obj, valid_idx, frame_cache, current_time, hold_time, timezone, unit_reg, time_updated):
         self.timezone = timezone
         self.unit_reg = unit_reg
-        for artist_obj in axis_obj.artists.values():
-            if not ((artist_obj.data_name is None or data_objs[artist_obj.data_name].time_field is None) and time_updated): # If time was updated, don't bother updating artists that don't use a data object with a time field
+        for artist_obj in self.artist_objs.values():
+            if artist_obj.data_name is not None and artist_obj.data_name not in data_objs:
+                continue
+            elif not ((artist_obj.data_name is None or data_objs[artist_obj.data_name].time_field is None) and time_updated): # If time was updated, don't bother updating artists that don't use a data object with a time field
                 if artist_obj.data_name is not None and artist_obj.data_name not in valid_idx:
                     valid_idx[artist_obj.data_name] = data_objs[artist_obj.data_name].get_valid_idx(current_time, hold_time)
                 norm_limits = self.limits_all if isinstance(self.view.camera, custom_vispy.Camera_2D) else self.limits
-                artist_obj.update(data_objs.get(artist_obj.data_name), self.artists[artist_obj.name], valid_idx.get(artist_obj.data_name), norm_limits, self.str_maps, self.limits['color'])
+                artist_obj.frame_cache, artist_obj.limits_version = frame_cache, self.legend_version
+                try:
+                    artist_obj.update(data_objs.get(artist_obj.data_name), self.artists[artist_obj.name], valid_idx.get(artist_obj.data_name), norm_limits, self.str_maps, self.limits['color'])
+                finally: # The frame cache must not be used outside of this update
+                    artist_obj.frame_cache = None
                 if time_updated and self.state['time_autoscale']:
                     self.autoscale_camera_limits(data_objs, axis_obj, valid_idx, current_time, hold_time)
 
@@ -559,18 +492,18 @@ class AxisInstance:
             grid_pos, label_pos, label_text, label_angle, tick_pos, tick_text, tick_angle = [], [], [], [], [], [], []
 
             # X Axis
-            x_pos, x_time_interval = self.get_tick_location(x_min, x_max, True, self.limits_source['x'], self.str_maps['x'], self.state['x_unit'])
+            x_pos, x_text = self.get_ticks('x', x_min, x_max, True, self.limits_source['x'], self.str_maps['x'], self.state['x_unit'])
             if self.state['x_grid']:
                 grid_pos += list(zip(np.repeat(x_pos, 2), np.tile([y_min, y_max], len(x_pos)), np.tile([z_plane, z_plane], len(x_pos)))) + list(zip(np.repeat(x_pos, 2), np.tile([y_plane, y_plane], len(x_pos)), np.tile([z_min, z_max], len(x_pos))))
-            tick_text.append(self.get_tick_format(x_pos, self.limits_source['x'], x_time_interval, self.str_maps['x'], self.state['x_unit']))
+            tick_text.append(x_text)
             if self.limits_source['x'] == 'date':
                 if abs(cam_el) >= 15:
                     tick_text[-1] = np.array([' '.join(reversed(val)) for val in np.char.split(tick_text[-1], '\n')]) if 0 < (cam_az % 180) <= 90 else np.array([' '.join(val) for val in np.char.split(tick_text[-1], '\n')])
                 else:
                     tick_text[-1] = np.array([' '.join(val) for val in np.char.split(tick_text[-1], '\n')]) if 0 < (cam_az % 180) <= 90 else np.array([' '.join(reversed(val)) for val in np.char.split(tick_text[-1], '\n')])
             label_text.append(self.get_label(self.state['x_label'], self.limits_source['x'], self.state['x_unit']))
-            x_label_offset = (np.ptp(label_scale * self.get_text_bbox(label_text[-1], self.labels_3d._font, self.labels_3d._font._lowres_size, self.label_cache)[:, 1]) + self.axis_text_padding) / 2 if label_text[-1] is not None else 0
-            x_tick_offset = np.array([np.ptp(tick_scale * self.get_text_bbox(val, self.ticks_3d._font, self.ticks_3d._font._lowres_size, self.tick_cache)[:, 0]) + self.axis_text_padding for val in tick_text[-1]]) / 2
+            x_label_offset = (label_scale * text_metrics.measure_text([label_text[-1]], self.labels_3d._font)[0, 1] + self.axis_text_padding) / 2 if label_text[-1] is not None else 0
+            x_tick_offset = (tick_scale * text_metrics.measure_text(tick_text[-1], self.ticks_3d._font)[:, 0] + self.axis_text_padding) / 2
             x_label_offset += np.max(x_tick_offset) * 2
             label_pos.append(np.array([[(x_min + x_max) / 2, y_inv, z_plane]]) if abs(cam_el) >= 15 else np.array([[(x_min + x_max) / 2, y_plane, z_inv]]))
             tick_pos.append(np.column_stack([x_pos, [y_inv] * len(x_pos), [z_plane] * len(x_pos)]) if abs(cam_el) >= 15 else np.column_stack([x_pos, [y_plane] * len(x_pos), [z_inv] * len(x_pos)]))
@@ -586,18 +519,18 @@ class AxisInstance:
             tick_angle.append(np.repeat(x_angle, len(x_pos)))
 
             # Y Axis
-            y_pos, y_time_interval = self.get_tick_location(y_min, y_max, True, self.limits_source['y'], self.str_maps['y'], self.state['y_unit'])
+            y_pos, y_text = self.get_ticks('y', y_min, y_max, True, self.limits_source['y'], self.str_maps['y'], self.state['y_unit'])
             if self.state['y_grid']:
                 grid_pos += list(zip(np.tile([x_min, x_max], len(y_pos)), np.repeat(y_pos, 2), np.tile([z_plane, z_plane], len(y_pos)))) + list(zip(np.tile([x_plane, x_plane], len(y_pos)), np.repeat(y_pos, 2), np.tile([z_min, z_max], len(y_pos))))
-            tick_text.append(self.get_tick_format(y_pos, self.limits_source['y'], y_time_interval, self.str_maps['y'], self.state['y_unit']))
+            tick_text.append(y_text)
             if self.limits_source['y'] == 'date':
                 if abs(cam_el) >= 15:
                     tick_text[-1] = np.array([' '.join(val) for val in np.char.split(tick_text[-1], '\n')]) if 0 < (cam_az % 180) <= 90 else np.array([' '.join(reversed(val)) for val in np.char.split(tick_text[-1], '\n')])
                 else:
                     tick_text[-1] = np.array([' '.join(reversed(val)) for val in np.char.split(tick_text[-1], '\n')]) if 0 < (cam_az % 180) <= 90 else np.array([' '.join(val) for val in np.char.split(tick_text[-1], '\n')])
             label_text.append(self.get_label(self.state['y_label'], self.limits_source['y'], self.state['y_unit']))
-            y_label_offset = (np.ptp(label_scale * self.get_text_bbox(label_text[-1], self.labels_3d._font, self.labels_3d._font._lowres_size, self.label_cache)[:, 1]) + self.axis_text_padding) / 2 if label_text[-1] is not None else 0
-            y_tick_offset = np.array([np.ptp(tick_scale * self.get_text_bbox(val, self.ticks_3d._font, self.ticks_3d._font._lowres_size, self.tick_cache)[:, 0]) + self.axis_text_padding for val in tick_text[-1]]) / 2
+            y_label_offset = (label_scale * text_metrics.measure_text([label_text[-1]], self.labels_3d._font)[0, 1] + self.axis_text_padding) / 2 if label_text[-1] is not None else 0
+            y_tick_offset = (tick_scale * text_metrics.measure_text(tick_text[-1], self.ticks_3d._font)[:, 0] + self.axis_text_padding) / 2
             y_label_offset += np.max(y_tick_offset) * 2
             label_pos.append(np.array([[x_inv, (y_min + y_max) / 2, z_plane]]) if abs(cam_el) >= 15 else np.array([[x_plane, (y_min + y_max) / 2, z_inv]]))
             tick_pos.append(np.column_stack([[x_inv] * len(y_pos), y_pos, [z_plane] * len(y_pos)]) if abs(cam_el) >= 15 else np.column_stack([[x_plane] * len(y_pos), y_pos, [z_inv] * len(y_pos)]))
@@ -613,18 +546,18 @@ class AxisInstance:
             tick_angle.append(np.repeat(y_angle, len(y_pos)))
 
             # Z Axis
-            z_pos, z_time_interval = self.get_tick_location(z_min, z_max, False, self.limits_source['z'], self.str_maps['z'], self.state['z_unit'])
+            z_pos, z_text = self.get_ticks('z', z_min, z_max, False, self.limits_source['z'], self.str_maps['z'], self.state['z_unit'])
             if self.state['z_grid']:
                 grid_pos += list(zip(np.tile([x_min, x_max], len(z_pos)), np.tile([y_plane, y_plane], len(z_pos)), np.repeat(z_pos, 2))) + list(zip(np.tile([x_plane, x_plane], len(z_pos)), np.tile([y_min, y_max], len(z_pos)), np.repeat(z_pos, 2)))
-            tick_text.append(self.get_tick_format(z_pos, self.limits_source['z'], z_time_interval, self.str_maps['z'], self.state['z_unit']))
+            tick_text.append(z_text)
             if self.limits_source['z'] == 'date':
                 if abs(cam_el) >= 15:
                     tick_text[-1] = np.array([' '.join(val) for val in np.char.split(tick_text[-1], '\n')]) if 0 < (cam_az % 90) <= 45 else np.array([' '.join(reversed(val)) for val in np.char.split(tick_text[-1], '\n')])
                 else:
                     tick_text[-1] = np.array([' '.join(reversed(val)) for val in np.char.split(tick_text[-1], '\n')]) if 0 < (cam_az % 90) <= 45 else np.array([' '.join(val) for val in np.char.split(tick_text[-1], '\n')])
             label_text.append(self.get_label(self.state['z_label'], self.limits_source['z'], self.state['z_unit']))
-            z_label_offset = (np.ptp(label_scale * self.get_text_bbox(label_text[-1], self.labels_3d._font, self.labels_3d._font._lowres_size, self.label_cache)[:, 1]) + self.axis_text_padding) / 2 if label_text[-1] is not None else 0
-            z_tick_offset = np.array([np.ptp(tick_scale * self.get_text_bbox(val, self.ticks_3d._font, self.ticks_3d._font._lowres_size, self.tick_cache)[:, 0]) + self.axis_text_padding for val in tick_text[-1]]) / 2
+            z_label_offset = (label_scale * text_metrics.measure_text([label_text[-1]], self.labels_3d._font)[0, 1] + self.axis_text_padding) / 2 if label_text[-1] is not None else 0
+            z_tick_offset = (tick_scale * text_metrics.measure_text(tick_text[-1], self.ticks_3d._font)[:, 0] + self.axis_text_padding) / 2
             z_label_offset += np.max(z_tick_offset) * 2
             label_pos.append(np.array([[x_plane, y_inv, (z_min + z_max) / 2]]) if 45 < (cam_az % 180) <= 135 else np.array([[x_inv, y_plane, (z_min + z_max) / 2]]))
             tick_pos.append(np.column_stack([[x_plane] * len(z_pos), [y_inv] * len(z_pos), z_pos]) if 45 < (cam_az % 180) <= 135 else np.column_stack([[x_inv] * len(z_pos), [y_plane] * len(z_pos), z_pos]))
@@ -660,3 +593,187 @@ class AxisInstance:
             self.ticks_3d.text = np.hstack(tick_text) if len(tick_text) > 0 else np.array([''])
             self.ticks_3d.pos = tr.imap(np.vstack(tick_pos if len(tick_pos) else [[0, 0, 0]]))[:, :3]
             self.ticks_3d.rotation = np.degrees(np.hstack(tick_angle)) if len(tick_angle) > 0 else np.array([0])
+
+    def update_text(self):
+        """
+        Update the title, labels, and ticks that are drawn on the canvas (all of them for a 2D axis, only the title and colorbar for a 3D axis).
+        """
+        label_text, label_pos, label_rotation, tick_text, tick_pos = [], [], [], [], []
+        grid_left, grid_top, grid_width, grid_height = self.view.parent.pos[0], self.view.parent.pos[1], self.view.parent.size[0], self.view.parent.size[1]
+        axis_left, axis_top, axis_width, axis_height = self.view.pos[0], self.view.pos[1], self.view.size[0], self.view.size[1]
+        if self.current_color_key is not None:
+            label_pos.append([grid_left + grid_width - self.grid_info['color_label_offset'] / 2, grid_top + axis_top + axis_height / 2])
+            colorbar_label = self.get_label(self.current_color_key[1], self.limits_source['color'][self.current_color_key], self.current_color_key[2])
+            label_text.append('' if colorbar_label is None else colorbar_label)
+            label_rotation.append(90)
+            min_color, max_color = self.limits['color'][self.current_color_key]
+            colorbar_top, colorbar_bottom = grid_top + self.colorbar.pos[1] - self.colorbar.size[0] / 2, grid_top + self.colorbar.pos[1] + self.colorbar.size[0] / 2
+            color_x = grid_left + self.colorbar.pos[0] + self.colorbar.size[1] / 2 + self.grid_info['color_tick_offset'] / 2
+            color_y = colorbar_top + (max_color - self.grid_info['color_pos']) * (colorbar_bottom - colorbar_top) / (max_color - min_color)
+            tick_pos.append(np.column_stack([color_x, color_y]))
+            tick_text.append(self.grid_info['color_text'])
+        if self.state['title'] is not None:
+            label_text.append(self.state['title'])
+            label_pos.append([grid_left + axis_left + axis_width / 2, grid_top + self.grid_info['title_offset'] / 2])
+            label_rotation.append(0)
+        if isinstance(self.view.camera, custom_vispy.Camera_2D):
+            rect = self.view.camera.rect
+            tr = self.view.scene.node_transform(self.view.canvas.scene)
+
+            x_label = self.get_label(self.state['x_label'], self.limits_source['x'], self.state['x_unit'])
+            if x_label is not None:
+                label_text.append(x_label)
+                label_pos.append([grid_left + axis_left + axis_width / 2, grid_top + grid_height - self.grid_info['x_label_offset'] / 2])
+                label_rotation.append(0)
+            x_tick_pos = tr.map(np.column_stack([self.grid_info['x_pos'], [rect.bottom] * len(self.grid_info['x_pos'])]))[:, :2]
+            x_tick_pos[:, 1] += self.grid_info['x_tick_offset'] / 2
+            tick_pos.append(x_tick_pos)
+            tick_text.append(self.grid_info['x_text'])
+
+            y_label = self.get_label(self.state['y_label'], self.limits_source['y'], self.state['y_unit'])
+            if y_label is not None:
+                label_text.append(y_label)
+                label_pos.append([grid_left + self.grid_info['y_label_offset'] / 2, grid_top + axis_top + axis_height / 2])
+                label_rotation.append(-90)
+            y_tick_pos = tr.map(np.column_stack([[rect.left] * len(self.grid_info['y_pos']), self.grid_info['y_pos']]))[:, :2]
+            y_tick_pos[:, 0] -= self.grid_info['y_tick_offset'] / 2
+            tick_pos.append(y_tick_pos)
+            tick_text.append(self.grid_info['y_text'])
+        if len(label_text) > 0:
+            self.labels_2d.text = np.array(label_text)
+            self.labels_2d.pos = np.vstack(label_pos)
+            self.labels_2d.rotation = np.array(label_rotation)
+        else:
+            self.labels_2d.text = np.array([''])
+            self.labels_2d.pos = np.array([[0, 0]])
+            self.labels_2d.rotation = 0
+        if len(tick_text) > 0:
+            self.ticks_2d.text = np.hstack(tick_text)
+            self.ticks_2d.pos = np.vstack(tick_pos)
+        else:
+            self.ticks_2d.text = np.array([''])
+            self.ticks_2d.pos = np.array([[0, 0]])
+
+    def update_view(self):
+        """
+        Update the visuals of artists that depend on the part of the axis that is in view (such as image pyramid tiles).
+        """
+        for name, artist_obj in self.artist_objs.items():
+            if name in self.artists:
+                artist_obj.update_view(self.artists[name])
+
+
+    @staticmethod
+    def get_artist_limits(data_objs, axis_obj, scope, valid_idx=None, current_time=None, hold_time=None, limit_types=('x', 'y', 'z', 'color'), current_str_maps=None, limits_cache=None):
+        """
+        Calculate the limits of all of the artists in an axis.
+        This doesn't use any of the vispy objects, so it can be called from the thread pool before the axis is created (see "Canvas.calc_axis_limits").
+
+        Parameters
+        ----------
+        data_objs : dict
+            The data objects to use.
+        axis_obj : DIVEAxis
+            The axis object that has the artists.
+        scope : str
+            The rows to use: "all" (all rows), "filter" (rows in the filter) or "time" (rows in the current time range).
+        valid_idx : None, dict (Default: None)
+            The valid indices for each data name that have already been calculated. Only used when "scope" is "time" (new indices are added to it).
+        current_time : None, numeric, pandas.Timestamp with tz (Default: None)
+            The current time value. Only used when "scope" is "time".
+        hold_time : None, numeric, pandas.Timedelta (Default: None)
+            The hold time. Only used when "scope" is "time".
+        limit_types : list, tuple (Default: ('x', 'y', 'z', 'color'))
+            The types of limits to calculate.
+        current_str_maps : None, dict (Default: None)
+            The current str maps of the axis. Only used when "scope" is "time".
+        limits_cache : None, dict (Default: None)
+            The cache that holds the field limits shared with the other axes whose limits are being calculated (see "Artist.get_shared_limits"). Only used when "scope" is "all" or "filter".
+
+        Returns
+        -------
+        dict
+            The limits for each limit type.
+        dict
+            The str maps for each limit type.
+        dict
+            The source ("num", "date" or "str") of the limits for each limit type.
+        """
+        temp_key = 0 # Using temp_key for x, y, and z simplifies the code for combining limits
+        limits = {'x': {temp_key: []}, 'y': {temp_key: []}, 'z': {temp_key: []}, 'color': {}}
+        str_maps = {'x': {temp_key: []}, 'y': {temp_key: []}, 'z': {temp_key: []}, 'color': {}}
+        limits_source = {'x': {temp_key: []}, 'y': {temp_key: []}, 'z': {temp_key: []}, 'color': {}}
+
+        # Get limits for each artist
+        for artist_obj in axis_obj.artists.values():
+            if scope in ['filter', 'time'] and not artist_obj.visible:
+                continue
+            data_obj = data_objs.get(artist_obj.data_name, None)
+            is_time = False
+            if scope == 'filter':
+                if data_obj is None:
+                    idx = slice(None)
+                elif limits_cache is None:
+                    idx = data_obj.filtered_idx.to_bool()
+                else: # Artists with the same data object share the filter indices so that their field limits can be shared
+                    idx = artist_obj.get_shared_limits(limits_cache, ('filtered_idx', id(data_obj)), data_obj.filtered_idx.to_bool)
+            elif scope == 'time':
+                if artist_obj.data_name is not None and artist_obj.data_name not in valid_idx:
+                    valid_idx[artist_obj.data_name] = data_obj.get_valid_idx(current_time, hold_time)
+                idx = valid_idx.get(artist_obj.data_name, slice(None))
+                is_time = True
+            else:
+                idx = slice(None)
+            for limit_type in limit_types:
+                num_limits, str_vals, source = artist_obj.get_limits(data_obj, idx, limit_type, is_time, None if is_time else limits_cache)
+                if limit_type == 'color':
+                    for key in num_limits:
+                        limits[limit_type][key] = limits[limit_type].get(key, []) + num_limits[key]
+                    for key in str_vals:
+                        str_maps[limit_type][key] = str_maps[limit_type].get(key, []) + str_vals[key]
+                    for key in source:
+                        limits_source[limit_type][key] = limits_source[limit_type].get(key, []) + source[key]
+                else:
+                    limits[limit_type][temp_key] += num_limits
+                    str_maps[limit_type][temp_key] += str_vals
+                    limits_source[limit_type][temp_key] += source
+
+        # Combine limits of all artists
+        for limit_type in limits:
+            for key in str_maps[limit_type]:
+                unique_strs = np.unique(str_maps[limit_type][key]).tolist()
+                unique_strs.sort(key=helper_functions.natural_order)
+                n_strs = len(unique_strs)
+                str_maps[limit_type][key] = pd.Series(np.arange(n_strs), index=unique_strs)
+                if n_strs > 0:
+                    if scope == 'time':
+                        current_map = current_str_maps[limit_type][key] if limit_type == 'color' else current_str_maps[limit_type]
+                        current_map = current_map.loc[unique_strs]
+                        limits[limit_type][key] += [np.min(current_map), np.max(current_map)]
+                    else:
+                        limits[limit_type][key] += [0, n_strs - 1]
+            for key in limits[limit_type]:
+                if len(limits[limit_type][key]) > 0:
+                    limits[limit_type][key] = [np.min(limits[limit_type][key]), np.max(limits[limit_type][key])]
+                    if limits[limit_type][key][0] == limits[limit_type][key][1]:
+                        limits[limit_type][key][0] -= 1
+                        limits[limit_type][key][1] += 1
+                else:
+                    limits[limit_type][key] = [0, 1]
+            for key in limits_source[limit_type]:
+                unique_sources = set(limits_source[limit_type][key])
+                if len(unique_sources) > 1:
+                    print('Warning: {}-axis in "{}" is using multiple data types.'.format(limit_type, axis_obj.name))
+                    for s in ['str', 'date']:
+                        if s in unique_sources:
+                            limits_source[limit_type][key] = s
+                            break
+                else:
+                    limits_source[limit_type][key] = 'num' if len(unique_sources) == 0 else unique_sources.pop()
+
+        for key in ['x', 'y', 'z']:
+            limits[key] = limits[key][temp_key]
+            str_maps[key] = str_maps[key][temp_key]
+            limits_source[key] = limits_source[key][temp_key]
+
+        return limits, str_maps, limits_source
\ No newline at end of file
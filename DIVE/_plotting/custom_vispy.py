@@ -1,8 +1,20 @@
 from . import axis_instance
-from .._utilities import helper_functions
+from .._utilities import helper_functions, memory
+import concurrent.futures
+import importlib
 import numpy as np
+import vispy.app as vpapp
 import vispy.scene as vpscene
 import vispy.util as vputil
+qt = vpapp.use_app().backend_name
+try:
+    qtcore = importlib.import_module('{}.QtCore'.format(qt))
+    qtwidgets = importlib.import_module('{}.QtWidgets'.format(qt))
+except:
+    pass
+del qt
+
+placeholder_delay = 0.1 # The number of seconds to wait for axis limits before a placeholder is shown while they are calculated
 
 class Camera_2D(vpscene.PanZoomCamera):
     def __init__(self, *args, **kwargs):
@@ -68,8 +80,6 @@ class Canvas(vpscene.SceneCanvas):
         self.current_axis_group = None
         self.label_font_size = None
         self.tick_font_size = None
-        self.labels_2d = vpscene.Text(bold=True)
-        self.ticks_2d = vpscene.Text()
         self.current_axis = None
         self.current_button = None
         self.current_mode = 'pan'
@@ -77,6 +87,7 @@ class Canvas(vpscene.SceneCanvas):
         self.selection_line = vpscene.Line()
         self.selection_line.order = float('-inf')
         self.theme = None
+        self.busy = False # Whether the canvas is waiting for calculations in the thread pool (see "wait_for_futures")
         self.freeze()
         self.events.mouse_press.connect(self.callback_mouse_press)
         self.events.mouse_double_click.connect(self.callback_mouse_double_click)
@@ -94,6 +105,31 @@ class Canvas(vpscene.SceneCanvas):
             if all_axes or name == axis.state['name']:
                 axis.reset_camera_limits()
 
+    def calc_axis_limits(self, data_objs, axis_objs):
+        """
+        Calculate the limits of several axes in the thread pool before they are created.
+        Each distinct axis is only calculated once, and field limits that are requested by more than one artist
+        (the same data object, field and scope) are only calculated once across all of the axes.
+
+        Parameters
+        ----------
+        data_objs : dict
+            The data objects to use.
+        axis_objs : list
+            The axis objects to calculate the limits for (the same axis object can be given more than once).
+
+        Returns
+        -------
+        dict
+            The "all" and "filter" limits (see "AxisInstance.get_artist_limits") for each axis name.
+        """
+        axis_objs = {axis_obj.name: axis_obj for axis_obj in axis_objs}
+        limits_cache = {} # Passed to each calculation instead of being set on the artists so that other calls (such as those made while waiting) don't use it
+        pool = helper_functions.get_thread_pool()
+        futures = {name: {scope: pool.submit(axis_instance.AxisInstance.get_artist_limits, data_objs, axis_obj, scope, limits_cache=limits_cache) for scope in ['all', 'filter']} for name, axis_obj in axis_objs.items()}
+        self.wait_for_futures([future for axis_futures in futures.values() for future in axis_futures.values()], 'Calculating axis limits...')
+        return {name: {scope: future.result() for scope, future in axis_futures.items()} for name, axis_futures in futures.items()}
+
     def callback_mouse_double_click(self, event):
         self.selection_function(clear=True)
 
@@ -165,13 +201,19 @@ class Canvas(vpscene.SceneCanvas):
             self.events.mouse_move.disconnect(self.callback_mouse_move)
             self.events.mouse_release.disconnect(self.callback_mouse_release)
             self.central_widget.remove_widget(self.grid)
-            self.current_axis = self.current_axis_group = self.current_button = self.labels_2d.parent = self.grid = self.selection_line.parent = self.ticks_2d.parent = None
+            for axis in self.axes:
+                axis.labels_2d.parent = axis.ticks_2d.parent = None
+            self.current_axis = self.current_axis_group = self.current_button = self.grid = self.selection_line.parent = None
             self.axes = []
-            self.labels_2d.text, self.labels_2d.pos, self.labels_2d.rotation = np.array(['']), np.array([[0, 0]]), 0
-            self.ticks_2d.text, self.ticks_2d.pos = np.array(['']), np.array([[0, 0]])
 
-    def clone_axis(self, data_objs, axis_obj, grid_cell, axis, apply_limits_filter):
-        new_axis = axis_instance.AxisInstance(data_objs, axis_obj, grid_cell, apply_limits_filter, self.theme, self.label_font_size, self.tick_font_size)
+    def clear_caches(self):
+        for axis in self.axes:
+            axis.tick_cache.clear()
+            for artist_obj in axis.artist_objs.values():
+                artist_obj.clear_caches()
+
+    def clone_axis(self, data_objs, axis_obj, grid_cell, axis, apply_limits_filter, limits=None):
+        new_axis = self.create_axis(data_objs, axis_obj, grid_cell, apply_limits_filter, limits)
         if isinstance(axis.view.camera, Camera_2D):
             x_min, x_max, y_min, y_max = axis.get_camera_limits_2d()
             new_axis.set_camera_limits({'x': [x_min, x_max], 'y': [y_min, y_max], 'z': [0, 1]}, no_margin=True)
@@ -182,38 +224,51 @@ class Canvas(vpscene.SceneCanvas):
             new_axis.view.camera.set_state(axis.view.camera.get_state())
         return new_axis
 
+    def create_axis(self, data_objs, axis_obj, grid_cell, apply_limits_filter, limits=None):
+        axis = axis_instance.AxisInstance(data_objs, axis_obj, grid_cell, apply_limits_filter, self.theme, self.label_font_size, self.tick_font_size, limits)
+        axis.labels_2d.parent = axis.ticks_2d.parent = self.scene
+        return axis
+
     def display_axis(self, data_objs, axis_objs, name, apply_limits_filter):
         if name is not None and self.current_axis_group is None and name in [axis.state['name'] for axis in self.axes]:
             return False
         self.clear_grid()
         if name is not None:
             self.grid = self.central_widget.add_grid()
-            self.labels_2d.parent = self.ticks_2d.parent = self.scene
             grid_cell = self.grid.add_widget(GridCell(is_last=True), row=0, col=0, row_span=1, col_span=1)
-            self.axes.append(axis_instance.AxisInstance(data_objs, axis_objs[name], grid_cell, apply_limits_filter, self.theme, self.label_font_size, self.tick_font_size))
+            self.axes.append(self.create_axis(data_objs, axis_objs[name], grid_cell, apply_limits_filter))
             self.set_mode(self.current_mode)
         return True
 
     def display_axis_group(self, data_objs, axis_objs, axis_group_objs, name, apply_limits_filter):
         if name is not None and self.current_axis_group is not None and name == self.current_axis_group['name']:
             return False
+        if name is not None: # The new axes are prepared before the current ones are removed since events can be processed while waiting for the limits (see "wait_for_futures")
+            axis_group_state = axis_group_objs[name].get_state()
+            group_axis_objs = [axis_objs[axis_name] for axis_name in axis_group_state['axis_names']]
+            limits = self.calc_axis_limits(data_objs, group_axis_objs)
         self.clear_grid()
         if name is not None:
             self.grid = self.central_widget.add_grid()
-            self.labels_2d.parent = self.ticks_2d.parent = self.scene
-            axis_group_obj = axis_group_objs[name]
-            self.current_axis_group = axis_group_obj.get_state()
-            n_axes = len(axis_group_obj.axis_names)
-            for i in range(n_axes):
-                axis_obj = axis_objs[axis_group_obj.axis_names[i]]
-                grid_cell = self.grid.add_widget(GridCell(is_last=i==n_axes-1), row=axis_group_obj.rows[i], col=axis_group_obj.columns[i], row_span=axis_group_obj.row_spans[i], col_span=axis_group_obj.column_spans[i])
-                self.axes.append(axis_instance.AxisInstance(data_objs, axis_obj, grid_cell, apply_limits_filter, self.theme, self.label_font_size, self.tick_font_size))
+            self.current_axis_group = axis_group_state
+            n_axes = len(group_axis_objs)
+            for i, axis_obj in enumerate(group_axis_objs):
+                grid_cell = self.grid.add_widget(GridCell(is_last=i==n_axes-1), row=axis_group_state['rows'][i], col=axis_group_state['columns'][i], row_span=axis_group_state['row_spans'][i], col_span=axis_group_state['column_spans'][i])
+                self.axes.append(self.create_axis(data_objs, axis_obj, grid_cell, apply_limits_filter, limits[axis_obj.name]))
             n_rows, n_cols = self.grid.grid_size
-            if n_rows < axis_group_obj.row_count or n_cols < axis_group_obj.column_count:
-                self.grid.add_widget(row=axis_group_obj.row_count-1, col=axis_group_obj.column_count-1)
+            if n_rows < axis_group_state['row_count'] or n_cols < axis_group_state['column_count']:
+                self.grid.add_widget(row=axis_group_state['row_count']-1, col=axis_group_state['column_count']-1)
             self.set_mode(self.current_mode)
         return True
 
+    def edit_artist(self, data_objs, axis_obj, name, impact, apply_limits_filter):
+        need_update = False
+        for axis in self.axes:
+            if axis.state['name'] == axis_obj.name:
+                axis.edit_artist(data_objs, axis_obj, name, impact, apply_limits_filter)
+                need_update = True
+        return need_update
+
     def edit_axis(self, axis_obj):
         need_update = False
         for axis in self.axes:
@@ -224,28 +279,32 @@ class Canvas(vpscene.SceneCanvas):
 
     def edit_axis_group(self, data_objs, axis_objs, axis_group_obj, apply_limits_filter):
         if self.current_axis_group is not None and axis_group_obj.name == self.current_axis_group['name']:
+            axis_group_state = axis_group_obj.get_state()
             old_axes = list(zip(self.current_axis_group['axis_names'], self.current_axis_group['rows'], self.current_axis_group['columns']))
-            new_axes = list(zip(axis_group_obj.axis_names, axis_group_obj.rows, axis_group_obj.columns))
+            new_axes = list(zip(axis_group_state['axis_names'], axis_group_state['rows'], axis_group_state['columns']))
             unchanged_axes = {old_axis: self.axes[i] for i, old_axis in enumerate(old_axes) if old_axis in new_axes}
+            group_axis_objs = [axis_objs[axis_name] for axis_name in axis_group_state['axis_names']]
+            limits = self.calc_axis_limits(data_objs, group_axis_objs) # Calculated before the current axes are removed since events can be processed while waiting for them (see "wait_for_futures")
             self.clear_grid()
             self.grid = self.central_widget.add_grid()
-            self.labels_2d.parent = self.ticks_2d.parent = self.scene
-            self.current_axis_group = axis_group_obj.get_state()
-            n_axes = len(axis_group_obj.axis_names)
-            for i in range(n_axes):
-                grid_cell = self.grid.add_widget(GridCell(is_last=i==n_axes-1), row=axis_group_obj.rows[i], col=axis_group_obj.columns[i], row_span=axis_group_obj.row_spans[i], col_span=axis_group_obj.column_spans[i])
-                axis_key = (axis_group_obj.axis_names[i], axis_group_obj.rows[i], axis_group_obj.columns[i])
-                if axis_key in unchanged_axes:
-                    self.axes.append(self.clone_axis(data_objs, axis_objs[axis_group_obj.axis_names[i]], grid_cell, unchanged_axes[axis_key], apply_limits_filter))
+            self.current_axis_group = axis_group_state
+            n_axes = len(group_axis_objs)
+            for i, axis_obj in enumerate(group_axis_objs):
+                grid_cell = self.grid.add_widget(GridCell(is_last=i==n_axes-1), row=axis_group_state['rows'][i], col=axis_group_state['columns'][i], row_span=axis_group_state['row_spans'][i], col_span=axis_group_state['column_spans'][i])
+                if new_axes[i] in unchanged_axes:
+                    self.axes.append(self.clone_axis(data_objs, axis_obj, grid_cell, unchanged_axes[new_axes[i]], apply_limits_filter, limits[axis_obj.name]))
                 else:
-                    self.axes.append(axis_instance.AxisInstance(data_objs, axis_objs[axis_group_obj.axis_names[i]], grid_cell, apply_limits_filter, self.theme, self.label_font_size, self.tick_font_size))
+                    self.axes.append(self.create_axis(data_objs, axis_obj, grid_cell, apply_limits_filter, limits[axis_obj.name]))
             n_rows, n_cols = self.grid.grid_size
-            if n_rows < axis_group_obj.row_count or n_cols < axis_group_obj.column_count:
-                self.grid.add_widget(row=axis_group_obj.row_count-1, col=axis_group_obj.column_count-1)
+            if n_rows < axis_group_state['row_count'] or n_cols < axis_group_state['column_count']:
+                self.grid.add_widget(row=axis_group_state['row_count']-1, col=axis_group_state['column_count']-1)
             self.set_mode(self.current_mode)
             return True
         return False
 
+    def get_camera_state(self):
+        return [axis.get_camera_limits_2d() if isinstance(axis.view.camera, Camera_2D) else axis.view.camera.get_state() for axis in self.axes]
+
     def get_legend(self, data_objs, axis_objs, apply_limits_filter):
         entries, merged_entries = [], {}
         for axis in self.axes:
@@ -256,6 +315,37 @@ class Canvas(vpscene.SceneCanvas):
         legend.sort(key=lambda s: helper_functions.natural_order(s[0]))
         return legend
 
+    def get_legend_key(self, apply_limits_filter):
+        """
+        Return a value that only changes when the legend entries of the axes being displayed could have changed.
+        """
+        return (apply_limits_filter, tuple(axis.legend_version for axis in self.axes))
+
+    def get_memory_usage(self, seen):
+        """
+        Estimate the memory used by the axes being displayed.
+
+        Parameters
+        ----------
+        seen : set
+            The keys of the arrays that have already been counted (see "memory.get_nbytes").
+
+        Returns
+        -------
+        dict
+            artists : dict
+                The bytes used by each artist for each axis name.
+            tick_cache : int
+                The bytes used by the cached tick labels of all of the axes.
+        """
+        artists, tick_cache = {}, 0
+        for axis in self.axes:
+            tick_cache += memory.get_nbytes(axis.tick_cache, seen)
+            artist_usage = artists.setdefault(axis.state['name'], {})
+            for name, artist_obj in axis.artist_objs.items():
+                artist_usage[name] = artist_usage.get(name, 0) + artist_obj.get_memory_usage(seen)
+        return {'artists': artists, 'tick_cache': tick_cache}
+
     def recreate_grid_cell(self, data_objs, axis_obj, apply_limits_filter):
         need_update = False
         n_axes = len(self.axes)
@@ -263,7 +353,7 @@ class Canvas(vpscene.SceneCanvas):
             if self.axes[i].state['name'] == axis_obj.name:
                 need_update = True
                 self.grid.remove_widget(self.axes[i].view.parent)
-                self.axes[i].view.parent.parent = None
+                self.axes[i].view.parent.parent = self.axes[i].labels_2d.parent = self.axes[i].ticks_2d.parent = None
                 if self.current_axis_group is None:
                     grid_cell = self.grid.add_widget(GridCell(is_last=True), row=0, col=0, row_span=1, col_span=1)
                 else:
@@ -293,18 +383,18 @@ class Canvas(vpscene.SceneCanvas):
         for data_name in selected:
             data_obj = data_objs[data_name]
             if self.current_button == 1: # Left click
-                data_obj.apply_selection(selected[data_name] if data_obj.selection is None else np.logical_or(data_obj.selection, selected[data_name]))
+                data_obj.apply_selection(selected[data_name] if data_obj.selection is None else data_obj.selection | selected[data_name])
             elif self.current_button == 2: # Right click
                 if data_obj.selection is None:
                     return
-                data_obj.apply_selection(np.logical_and(data_obj.selection, ~selected[data_name]))
+                data_obj.apply_selection(data_obj.selection & ~selected[data_name])
         for data_obj in data_objs.values():
             if data_obj.selection is None:
                 data_obj.apply_selection(None)
 
     def set_font_sizes(self, label_size, tick_size):
-        self.label_font_size = self.labels_2d.font_size = label_size
-        self.tick_font_size = self.ticks_2d.font_size = tick_size
+        self.label_font_size = label_size
+        self.tick_font_size = tick_size
         for axis in self.axes:
             axis.set_font_sizes(label_size, tick_size)
 
@@ -328,10 +418,7 @@ class Canvas(vpscene.SceneCanvas):
         """
         self.theme = theme
         self.bgcolor = 'k' if theme == 'dark' else 'w'
-        color = 'w' if theme == 'dark' else 'k'
-        self.labels_2d.color = color
-        self.ticks_2d.color = color
-        self.selection_line.set_data(color=color)
+        self.selection_line.set_data(color='w' if theme == 'dark' else 'k')
         for axis in self.axes:
             axis.set_theme(axis_objs[axis.state['name']], theme)
 
@@ -341,76 +428,50 @@ class Canvas(vpscene.SceneCanvas):
 
     def update_axes(self, data_objs, axis_objs, current_time, hold_time, timezone, unit_reg, time_updated):
         valid_idx = {}
+        frame_cache = {} # Converted fields and colors are shared by all artists in this update and then discarded
         for axis in self.axes:
             if not time_updated:
                 axis.view.refresh()
-            axis.update_artists(data_objs, axis_objs[axis.state['name']], valid_idx, current_time, hold_time, timezone, unit_reg, time_updated)
+            axis.update_artists(data_objs, axis_objs[axis.state['name']], valid_idx, frame_cache, current_time, hold_time, timezone, unit_reg, time_updated)
 
     def update_text(self):
         """
-        This functions updates all axis titles, labels, and ticks (except for 3D axis labels and ticks).
+        This functions updates the titles, labels, and ticks (except for 3D axis labels and ticks) of each axis whose camera moved or resized.
         """
-        label_text, label_pos, label_rotation, tick_text, tick_pos = [], [], [], [], []
-        need_update = False
         for axis in self.axes:
-            need_update |= axis.view.camera.movement_occurred | axis.view.camera.resize_occurred
-            axis.view.camera.movement_occurred = axis.view.camera.resize_occurred = False
-        if need_update:
-            for axis in self.axes:
-                grid_left, grid_top, grid_width, grid_height = axis.view.parent.pos[0], axis.view.parent.pos[1], axis.view.parent.size[0], axis.view.parent.size[1]
-                axis_left, axis_top, axis_width, axis_height = axis.view.pos[0], axis.view.pos[1], axis.view.size[0], axis.view.size[1]
-                if axis.current_color_key is not None:
-                    label_pos.append([grid_left + grid_width - axis.grid_info['color_label_offset'] / 2, grid_top + axis_top + axis_height / 2])
-                    colorbar_label = axis.get_label(axis.current_color_key[1], axis.limits_source['color'][axis.current_color_key], axis.current_color_key[2])
-                    label_text.append('' if colorbar_label is None else colorbar_label)
-                    label_rotation.append(90)
-                    min_color, max_color = axis.limits['color'][axis.current_color_key]
-                    colorbar_top, colorbar_bottom = grid_top + axis.colorbar.pos[1] - axis.colorbar.size[0] / 2, grid_top + axis.colorbar.pos[1] + axis.colorbar.size[0] / 2
-                    color_x = grid_left + axis.colorbar.pos[0] + axis.colorbar.size[1] / 2 + axis.grid_info['color_tick_offset'] / 2
-                    color_y = colorbar_top + (max_color - axis.grid_info['color_pos']) * (colorbar_bottom - colorbar_top) / (max_color - min_color)
-                    tick_pos.append(np.column_stack([color_x, color_y]))
-                    tick_text.append(axis.grid_info['color_text'])
-                if axis.state['title'] is not None:
-                    label_text.append(axis.state['title'])
-                    label_pos.append([grid_left + axis_left + axis_width / 2, grid_top + axis.grid_info['title_offset'] / 2])
-                    label_rotation.append(0)
-                if isinstance(axis.view.camera, Camera_2D):
-                    rect = axis.view.camera.rect
-                    tr = axis.view.scene.node_transform(self.scene)
-
-                    x_label = axis.get_label(axis.state['x_label'], axis.limits_source['x'], axis.state['x_unit'])
-                    if x_label is not None:
-                        label_text.append(x_label)
-                        label_pos.append([grid_left + axis_left + axis_width / 2, grid_top + grid_height - axis.grid_info['x_label_offset'] / 2])
-                        label_rotation.append(0)
-                    x_tick_pos = tr.map(np.column_stack([axis.grid_info['x_pos'], [rect.bottom] * len(axis.grid_info['x_pos'])]))[:, :2]
-                    x_tick_pos[:, 1] += axis.grid_info['x_tick_offset'] / 2
-                    tick_pos.append(x_tick_pos)
-                    tick_text.append(axis.grid_info['x_text'])
-
-                    y_label = axis.get_label(axis.state['y_label'], axis.limits_source['y'], axis.state['y_unit'])
-                    if y_label is not None:
-                        label_text.append(y_label)
-                        label_pos.append([grid_left + axis.grid_info['y_label_offset'] / 2, grid_top + axis_top + axis_height / 2])
-                        label_rotation.append(-90)
-                    y_tick_pos = tr.map(np.column_stack([[rect.left] * len(axis.grid_info['y_pos']), axis.grid_info['y_pos']]))[:, :2]
-                    y_tick_pos[:, 0] -= axis.grid_info['y_tick_offset'] / 2
-                    tick_pos.append(y_tick_pos)
-                    tick_text.append(axis.grid_info['y_text'])
-            if len(label_text) > 0:
-                self.labels_2d.text = np.array(label_text)
-                self.labels_2d.pos = np.vstack(label_pos)
-                self.labels_2d.rotation = np.array(label_rotation)
-            else:
-                self.labels_2d.text = np.array([''])
-                self.labels_2d.pos = np.array([[0, 0]])
-                self.labels_2d.rotation = 0
-            if len(tick_text) > 0:
-                self.ticks_2d.text = np.hstack(tick_text)
-                self.ticks_2d.pos = np.vstack(tick_pos)
-            else:
-                self.ticks_2d.text = np.array([''])
-                self.ticks_2d.pos = np.array([[0, 0]])
+            if axis.view.camera.movement_occurred or axis.view.camera.resize_occurred:
+                axis.view.camera.movement_occurred = axis.view.camera.resize_occurred = False
+                axis.update_text()
+
+    def wait_for_futures(self, futures, message):
+        """
+        Wait for calculations in the thread pool to finish without freezing the GUI.
+        If they take longer than "placeholder_delay", a placeholder message is shown on the canvas and events other than user input
+        (such as repaints) are processed until they finish. "busy" is True while events are processed so that timer callbacks can be skipped.
+        Since other calls can change the canvas while events are processed, callers should wait before changing the axes being displayed.
+
+        Parameters
+        ----------
+        futures : list
+            The concurrent.futures.Futures to wait for.
+        message : str
+            The message to show on the canvas while waiting.
+        """
+        _, not_done = concurrent.futures.wait(futures, timeout=placeholder_delay)
+        if len(not_done) == 0 or 'qtwidgets' not in globals():
+            return
+        placeholder = vpscene.visuals.Text(message, color='w' if self.theme == 'dark' else 'k', font_size=self.label_font_size if self.label_font_size else 12, pos=(self.size[0] / 2, self.size[1] / 2), parent=self.scene)
+        qtwidgets.QApplication.setOverrideCursor(qtcore.Qt.WaitCursor)
+        self.busy = True
+        try:
+            self.update()
+            while len(not_done) > 0:
+                qtwidgets.QApplication.processEvents(qtcore.QEventLoop.ExcludeUserInputEvents)
+                _, not_done = concurrent.futures.wait(not_done, timeout=0.05)
+        finally:
+            self.busy = False
+            qtwidgets.QApplication.restoreOverrideCursor()
+            placeholder.parent = None
 
 class ViewBox(vpscene.ViewBox):
     def __init__(self, axis, *args, **kwargs):
@@ -436,3 +497,4 @@ class ViewBox(vpscene.ViewBox):
         vpscene.ViewBox.rect.fset(self, r)
         if self.camera.movement_occurred or self.camera.resize_occurred:
             self.axis.update_grid()
+            self.axis.update_view()
@@ -0,0 +1,117 @@
+import numpy as np
+
+class ImagePyramid:
+    """
+    This class splits a 2D array of values into square tiles at several resolutions so that only the tiles in view have to be uploaded.
+    Level 0 has the full resolution and each following level has half the resolution of the previous one (each value is the mean of a 2x2 block),
+    until the whole image fits in a single tile. Levels are only calculated once they are requested.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The 2D array of numeric values (the first row is the top of the image).
+    tile_size : int
+        The number of rows/columns in each tile.
+    """
+    def __init__(self, values, tile_size):
+        self.levels = [np.asarray(values)]
+        self.shape = self.levels[0].shape
+        self.tile_size = tile_size
+        self.n_levels = 1 + max(0, int(np.ceil(np.log2(max(self.shape) / tile_size))))
+
+    def get_level(self, level):
+        """
+        Get the values of a level, calculating it (and any levels before it) if needed.
+
+        Parameters
+        ----------
+        level : int
+            The index of the level.
+
+        Returns
+        -------
+        numpy.ndarray
+            The values of the level.
+        """
+        while len(self.levels) <= level:
+            values = self.levels[-1]
+            n_rows, n_cols = values.shape
+            if n_rows % 2 or n_cols % 2: # Pad with NaN so that the edges can be split into 2x2 blocks
+                values = np.pad(values.astype('float64'), ((0, n_rows % 2), (0, n_cols % 2)), constant_values=np.nan)
+            valid = np.isfinite(values)
+            blocks = (values.shape[0] // 2, 2, values.shape[1] // 2, 2)
+            sums = np.where(valid, values, 0).reshape(blocks).sum(axis=(1, 3))
+            counts = valid.reshape(blocks).sum(axis=(1, 3))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.levels.append(sums / counts) # Blocks without any finite values become NaN
+        return self.levels[level]
+
+    def get_level_for_scale(self, scale):
+        """
+        Get the level whose resolution best matches the number of image rows/columns that are shown in each screen pixel.
+
+        Parameters
+        ----------
+        scale : float
+            The number of full resolution rows/columns per screen pixel.
+
+        Returns
+        -------
+        int
+            The index of the level.
+        """
+        if not np.isfinite(scale) or scale <= 1:
+            return 0
+        return min(int(np.log2(scale)), self.n_levels - 1)
+
+    def get_tile(self, level, row, col, offset=0):
+        """
+        Get the values of a tile as a float32 array that is ready to be uploaded.
+        The rows are flipped so that the first row of the tile is at the bottom (the order vispy uses).
+
+        Parameters
+        ----------
+        level : int
+            The index of the level.
+        row : int
+            The row index of the tile in the level.
+        col : int
+            The column index of the tile in the level.
+        offset : numeric (Default: 0)
+            The value to subtract from each value before it is converted to float32 (to avoid losing precision for values far away from 0).
+
+        Returns
+        -------
+        numpy.ndarray
+            The values of the tile.
+        """
+        values = self.get_level(level)[row * self.tile_size:(row + 1) * self.tile_size, col * self.tile_size:(col + 1) * self.tile_size]
+        return (np.flipud(values) - offset).astype('float32')
+
+    def get_visible_tiles(self, level, row_min, row_max, col_min, col_max):
+        """
+        Get the tiles of a level that intersect a range of rows/columns.
+
+        Parameters
+        ----------
+        level : int
+            The index of the level.
+        row_min : float
+            The first row in the range (in full resolution rows).
+        row_max : float
+            The last row in the range (in full resolution rows).
+        col_min : float
+            The first column in the range (in full resolution columns).
+        col_max : float
+            The last column in the range (in full resolution columns).
+
+        Returns
+        -------
+        list
+            The (row, col) indices of the tiles in the level.
+        """
+        tile_extent = self.tile_size * 2 ** level
+        n_tile_rows, n_tile_cols = -(-self.shape[0] // tile_extent), -(-self.shape[1] // tile_extent)
+        rows = range(max(int(row_min // tile_extent), 0), min(int(row_max // tile_extent) + 1, n_tile_rows))
+        cols = range(max(int(col_min // tile_extent), 0), min(int(col_max // tile_extent) + 1, n_tile_cols))
+        return [(row, col) for row in rows for col in cols]
@@ -0,0 +1,132 @@
+from .._utilities.lru_cache import LRUCache
+import numpy as np
+
+# Text sizes are shared by every axis in the process since they only depend on the font and the text
+text_cache = LRUCache(50000)
+glyph_tables = {}
+esc_codes = [7, 8, 9, 10, 11, 12, 13]
+
+def cull_labels(pos, view_size, cell_size):
+    """
+    Return the indices of the labels that should be shown.
+    Labels outside of the view are removed, and then at most one label is kept in each cell of a grid over the view.
+    Later labels have priority over earlier ones, so the most recent label in each cell is kept when the labels are in time order.
+
+    Parameters
+    ----------
+    pos : numpy.ndarray
+        The screen position (in pixels from the top left corner of the view) of each label.
+    view_size : tuple
+        The width and height of the view in pixels.
+    cell_size : tuple
+        The width and height of each grid cell in pixels.
+
+    Returns
+    -------
+    numpy.ndarray
+        The sorted indices of the labels to show.
+    """
+    in_view = np.flatnonzero(np.isfinite(pos).all(axis=1) & (pos[:, 0] >= 0) & (pos[:, 0] < view_size[0]) & (pos[:, 1] >= 0) & (pos[:, 1] < view_size[1]))
+    if len(in_view) == 0:
+        return in_view
+    cells = (pos[in_view] // np.asarray(cell_size)).astype('int64')
+    cell_ids = cells[:, 0] * (int(view_size[1] // cell_size[1]) + 1) + cells[:, 1]
+    _, last = np.unique(cell_ids[::-1], return_index=True) # np.unique returns the first occurrence, so the labels are reversed to keep the last label in each cell
+    return np.sort(in_view[::-1][last])
+
+def get_glyph_metrics(font, chars):
+    """
+    Return the x offset, y offset, width, height, and advance of each glyph in chars.
+    Glyph metrics are stored per font so that each glyph only has to be looked up once.
+    """
+    table = glyph_tables.setdefault(font, {})
+    for char in chars:
+        if char not in table:
+            glyph = font[char]
+            table[char] = (glyph['offset'][0], glyph['offset'][1], glyph['size'][0], glyph['size'][1], glyph['advance'])
+    return np.array([table[char] for char in chars], dtype='float64').reshape(-1, 5)
+
+def measure_text(texts, font):
+    """
+    Return the width and height of each text for a vispy TextureFont.
+    The output is in units of the font's low resolution size, so it must be multiplied by the font size (in pixels) to get the size on the canvas.
+
+    Notes
+    -----
+    The glyph layout is the same as vispy.visuals.text.text._text_to_vbo, but all uncached texts are laid out in one vectorized pass.
+    """
+    sizes = np.zeros((len(texts), 2))
+    missing = {}
+    for i, text in enumerate(texts):
+        size = text_cache.get((font, text))
+        if size is None:
+            missing.setdefault(text, []).append(i)
+        else:
+            sizes[i] = size
+    if len(missing) == 0:
+        return sizes
+    new_texts = list(missing)
+    lengths = np.array([len(text) for text in new_texts])
+    n_chars = lengths.sum()
+    if n_chars > 0:
+        ratio, slop = 1. / font.ratio, font.slop
+        spacewidth = font[' ']['advance'] * ratio
+        lineheight = max(font[char]['size'][1] - 2 * slop for char in 'hy') * 1.5
+
+        codes = np.frombuffer(''.join(new_texts).encode('utf-32-le'), dtype='uint32')
+        text_idx = np.repeat(np.arange(len(new_texts)), lengths)
+        start_idx = (np.cumsum(lengths) - lengths)[text_idx] # Index of the first char of the text that each char belongs to
+        text_start = start_idx == np.arange(n_chars)
+        is_newline = (codes == 10) | (codes == 11)
+        is_glyph = ~np.isin(codes, esc_codes)
+
+        # Look up glyph metrics for each unique char
+        unique_codes, inverse = np.unique(codes, return_inverse=True)
+        unique_glyph = ~np.isin(unique_codes, esc_codes)
+        metrics = get_glyph_metrics(font, [chr(code) for code in unique_codes[unique_glyph]])
+        metric_idx = np.cumsum(unique_glyph) - 1
+        char_metrics = np.zeros((n_chars, 5))
+        char_metrics[is_glyph] = metrics[metric_idx[inverse.ravel()[is_glyph]]]
+
+        # Kerning depends on the previous glyph in the same text
+        glyph_pos = np.maximum.accumulate(np.where(is_glyph, np.arange(n_chars), -1))
+        prev_pos = np.concatenate([[-1], glyph_pos[:-1]])
+        prev_pos[prev_pos < start_idx] = -1
+        kerning = np.zeros(n_chars)
+        kern_idx = np.nonzero(is_glyph & (prev_pos >= 0))[0]
+        if len(kern_idx) > 0:
+            pairs = np.column_stack([codes[prev_pos[kern_idx]], codes[kern_idx]])
+            unique_pairs, pair_inverse = np.unique(pairs, axis=0, return_inverse=True)
+            pair_kerning = np.array([font[chr(char)]['kerning'].get(chr(prev), 0.) for prev, char in unique_pairs]) * ratio
+            kerning[kern_idx] = pair_kerning[pair_inverse.ravel()]
+
+        # Lay out each line
+        moves = np.where(is_glyph, char_metrics[:, 4] * ratio + kerning, np.where(codes == 9, 4 * spacewidth, 0.))
+        moves[is_newline] = 0.
+        line_idx = np.cumsum(is_newline | text_start) - 1
+        line_widths = np.bincount(line_idx, weights=moves)
+        before = np.cumsum(moves) - moves
+        line_start = np.nonzero(is_newline | text_start)[0]
+        x_off = -slop + before - before[line_start][line_idx]
+        line_offsets = np.where(codes == 11, 4, is_newline.astype('int'))
+        y_off = np.cumsum(line_offsets) - line_offsets
+        y_off = (y_off - y_off[start_idx]) * lineheight
+        x0 = x_off + char_metrics[:, 0] * ratio + kerning - line_widths[line_idx] / 2.
+        x1 = x0 + char_metrics[:, 2]
+        y0 = char_metrics[:, 1] * ratio + slop - y_off
+        y1 = y0 - char_metrics[:, 3]
+
+        bounds = np.full((len(new_texts), 4), np.inf)
+        bounds[:, [1, 3]] = -np.inf
+        np.minimum.at(bounds[:, 0], text_idx[is_glyph], x0[is_glyph])
+        np.maximum.at(bounds[:, 1], text_idx[is_glyph], x1[is_glyph])
+        np.minimum.at(bounds[:, 2], text_idx[is_glyph], y1[is_glyph])
+        np.maximum.at(bounds[:, 3], text_idx[is_glyph], y0[is_glyph])
+        new_sizes = np.column_stack([bounds[:, 1] - bounds[:, 0], bounds[:, 3] - bounds[:, 2]]) / font._lowres_size
+        new_sizes[~np.isfinite(new_sizes)] = 0
+    else:
+        new_sizes = np.zeros((len(new_texts), 2))
+    for i, text in enumerate(new_texts):
+        text_cache.set((font, text), new_sizes[i])
+        sizes[missing[text]] = new_sizes[i]
+    return sizes
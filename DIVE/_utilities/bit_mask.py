@@ -0,0 +1,143 @@
+import numpy as np
+
+popcount_table = np.array([bin(i).count('1') for i in range(256)], dtype='uint8') # Number of set bits in each possible byte
+
+class BitMask:
+    """
+    This class is a bool array that stores 8 values in each byte.
+    Indexing it with a slice, int array, or bool array returns a bool numpy.ndarray.
+
+    Parameters
+    ----------
+    values : array-like
+        The bool values to store.
+    """
+    def __init__(self, values):
+        values = np.asarray(values, dtype='bool')
+        self.size = len(values)
+        self.bits = np.packbits(values)
+
+    def __and__(self, other):
+        return self.combine(other, np.bitwise_and)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.size)
+            if step != 1:
+                return self.to_bool()[key]
+            elif stop <= start:
+                return np.zeros(0, dtype='bool')
+            byte_start = start >> 3
+            return np.unpackbits(self.bits[byte_start:(stop + 7) >> 3]).view('bool')[start - (byte_start << 3):stop - (byte_start << 3)]
+        key = np.asarray(key)
+        if key.dtype == 'bool':
+            if len(key) != self.size:
+                raise IndexError('Boolean index length {} doesn\'t match the mask length {}.'.format(len(key), self.size))
+            key = np.flatnonzero(key)
+        key = np.where(key < 0, key + self.size, key)
+        return ((self.bits[key >> 3] >> (7 - (key & 7))) & 1).astype('bool')
+
+    def __invert__(self):
+        return BitMask.from_bits(np.invert(self.bits), self.size)
+
+    def __len__(self):
+        return self.size
+
+    def __or__(self, other):
+        return self.combine(other, np.bitwise_or)
+
+    def any(self):
+        return bool(self.bits.any())
+
+    def clear_padding(self):
+        """
+        Clear the unused bits in the last byte so that they don't affect "any" and "count".
+        """
+        n_extra = self.size & 7
+        if n_extra > 0:
+            self.bits[-1] &= (0xFF << (8 - n_extra)) & 0xFF
+
+    def combine(self, other, op):
+        if not isinstance(other, BitMask):
+            other = BitMask(other)
+        if other.size != self.size:
+            raise ValueError('Mask lengths {} and {} don\'t match.'.format(self.size, other.size))
+        return BitMask.from_bits(op(self.bits, other.bits), self.size)
+
+    def copy(self):
+        return BitMask.from_bits(self.bits.copy(), self.size)
+
+    def count(self):
+        return int(popcount_table[self.bits].sum(dtype='int64'))
+
+    def first(self):
+        """
+        Return the index of the first True value or None if there aren't any.
+        """
+        if self.size == 0:
+            return None
+        nonzero = self.bits != 0
+        byte_idx = int(np.argmax(nonzero))
+        if not nonzero[byte_idx]:
+            return None
+        return (byte_idx << 3) + int(np.flatnonzero(np.unpackbits(self.bits[byte_idx:byte_idx + 1]))[0])
+
+    def last(self):
+        """
+        Return the index of the last True value or None if there aren't any.
+        """
+        if self.size == 0:
+            return None
+        nonzero = self.bits[::-1] != 0
+        byte_idx = len(self.bits) - 1 - int(np.argmax(nonzero))
+        if not self.bits[byte_idx]:
+            return None
+        return (byte_idx << 3) + int(np.flatnonzero(np.unpackbits(self.bits[byte_idx:byte_idx + 1]))[-1])
+
+    def to_bool(self):
+        return np.unpackbits(self.bits, count=self.size).view('bool')
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    @staticmethod
+    def from_bits(bits, size):
+        """
+        Create a mask from bits that have already been packed.
+
+        Parameters
+        ----------
+        bits : numpy.ndarray
+            The packed bits (as uint8).
+        size : int
+            The number of values in the mask.
+
+        Returns
+        -------
+        BitMask
+            The new mask.
+        """
+        mask = BitMask.__new__(BitMask)
+        mask.bits, mask.size = bits, size
+        mask.clear_padding()
+        return mask
+
+    @staticmethod
+    def full(size, value):
+        """
+        Create a mask where every value is the same.
+
+        Parameters
+        ----------
+        size : int
+            The number of values in the mask.
+        value : bool
+            The value to fill the mask with.
+
+        Returns
+        -------
+        BitMask
+            The new mask.
+        """
+        return BitMask.from_bits(np.full((size + 7) >> 3, 0xFF if value else 0, dtype='uint8'), size)
@@ -0,0 +1,442 @@
+from . import helper_functions
+from .lru_cache import LRUCache
+import numpy as np
+import os
+import pandas as pd
+import pathlib
+import threading
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except:
+    pass
+
+def is_data_source(data):
+    """
+    This function checks whether a value is a path that can be passed to "load_data_source".
+    """
+    return isinstance(data, (str, pathlib.PurePath))
+
+def is_partitioned(path):
+    """
+    This function checks whether a path is a directory of time-ordered chunks (see "PartitionedSource")
+    rather than a single data source.
+    """
+    path = pathlib.Path(path)
+    return path.is_dir() and not any(path.glob('*.npy'))
+
+def load_arrow_file(path):
+    """
+    This function memory-maps the columns of an Arrow IPC/Feather (version 2) file.
+    Columns without nulls that are stored in a single chunk are used without copying,
+    all other columns are converted by pyarrow.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The path to the file.
+
+    Returns
+    -------
+    dict
+        The values of each column.
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        values = None
+        if column.num_chunks == 1:
+            try:
+                values = column.chunk(0).to_numpy(zero_copy_only=True)
+            except (pa.ArrowInvalid, NotImplementedError):
+                pass
+        if values is None:
+            columns[name] = column.to_pandas()
+        elif pa.types.is_timestamp(column.type) and column.type.tz is not None:
+            columns[name] = make_column(values, column.type.tz)
+        else:
+            columns[name] = make_column(values)
+    return columns
+
+def get_mapped_file(array):
+    """
+    This function returns the path of the file that a numpy array is memory-mapped from if the array covers the whole file.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        The array to check.
+
+    Returns
+    -------
+    None, pathlib.Path
+        The resolved path of the file, or None if the array isn't a memory-mapped .npy file in its entirety.
+    """
+    base = array
+    while base is not None and not isinstance(base, np.memmap):
+        base = getattr(base, 'base', None)
+    if not isinstance(base, np.memmap) or getattr(base, 'filename', None) is None:
+        return None
+    elif array.nbytes != base.nbytes or array.__array_interface__['data'][0] != base.__array_interface__['data'][0] or array.dtype != base.dtype:
+        return None
+    return pathlib.Path(base.filename).resolve()
+
+def load_columns(path, saved):
+    """
+    This function loads columns that were saved by "save_columns". Columns that were saved as .npy files are memory-mapped.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The directory that the columns were saved to.
+    saved : dict
+        The column information returned by "save_columns".
+
+    Returns
+    -------
+    pandas.DataFrame
+        The data.
+    """
+    values = {}
+    for i, (name, timezone, stored_values) in enumerate(saved['columns']):
+        if stored_values is None:
+            values[name] = make_column(np.load(path / '{}.npy'.format(i), mmap_mode='r'), timezone)
+        else:
+            values[name] = stored_values
+    data = pd.DataFrame(values, copy=False)
+    if saved['index'] is not None:
+        data.index = saved['index']
+    return data
+
+def load_data_source(path):
+    """
+    This function opens a file-backed data source as a pandas.DataFrame whose columns are memory-mapped,
+    so only the pages that are accessed (such as the rows in the current time range) are read from disk.
+
+    The source can be one of the following:
+
+    * A directory of .npy files, where each file is a column named after the file (the columns are in natural order).
+    * An Arrow IPC/Feather (version 2) file. This requires the "pyarrow" module.
+
+    datetime64 columns without a timezone are localized to UTC.
+
+    Parameters
+    ----------
+    path : str, pathlib.Path
+        The path to the data source.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The data.
+    """
+    path = pathlib.Path(path)
+    if path.is_dir():
+        columns = load_npy_dir(path)
+    elif path.is_file():
+        if 'pa' not in globals():
+            raise ValueError('The "pyarrow" module must be installed in order to open Arrow/Feather files.')
+        columns = load_arrow_file(path)
+    else:
+        raise ValueError('"{}" isn\'t a valid file or directory path.'.format(path))
+    lengths = set(len(values) for values in columns.values())
+    if len(lengths) > 1:
+        raise ValueError('All of the columns in "{}" must have the same length.'.format(path))
+    return pd.DataFrame(columns, copy=False)
+
+def load_npy_dir(path):
+    """
+    This function memory-maps each .npy file in a directory as a column.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The path to the directory.
+
+    Returns
+    -------
+    dict
+        The values of each column.
+    """
+    columns = {}
+    for file_path in sorted(path.glob('*.npy'), key=lambda p: helper_functions.natural_order(p.stem)):
+        try:
+            values = np.load(file_path, mmap_mode='r')
+        except ValueError: # Object arrays are pickled, so they can't be memory-mapped
+            raise ValueError('"{}" can\'t be memory-mapped. Columns must not have dtype: object'.format(file_path))
+        if values.ndim != 1:
+            raise ValueError('"{}" must be 1-dimensional.'.format(file_path))
+        columns[file_path.stem] = make_column(values)
+    if len(columns) == 0:
+        raise ValueError('"{}" doesn\'t contain any .npy files.'.format(path))
+    return columns
+
+def make_column(values, timezone=None):
+    """
+    This function wraps the values of a column so that they can be put in a pandas.DataFrame.
+    datetime64 values are converted to pandas.Timestamps with tz since that is the only type of timestamp DIVE accepts.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The values of the column.
+    timezone : None, str (Default: None)
+        The timezone of datetime64 values. If None, UTC is used.
+
+    Returns
+    -------
+    numpy.ndarray, pandas.Series
+        The values of the column.
+    """
+    if np.issubdtype(values.dtype, np.datetime64):
+        return pd.Series(values, copy=False).dt.tz_localize('UTC').dt.tz_convert('UTC' if timezone is None else timezone)
+    return values
+
+def save_columns(data, path):
+    """
+    This function saves each column of a pandas.DataFrame so that it can be memory-mapped by "load_columns".
+    Columns are saved as .npy files in a directory (pandas.Timestamps with tz are saved as UTC datetime64 values).
+    Columns that can't be memory-mapped (such as object columns) are returned to be stored with the rest of the session.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The data to save.
+    path : pathlib.Path
+        The directory to save the columns to. It will be created if it doesn't exist.
+
+    Returns
+    -------
+    dict
+        columns : list
+            The name, timezone and values (None if the values were saved to a file) of each column.
+        index : None, pandas.Index
+            The index of the data if it isn't the default index.
+    """
+    path.mkdir(exist_ok=True)
+    columns = []
+    for i, name in enumerate(data.columns):
+        file_path = path / '{}.npy'.format(i)
+        values = data.iloc[:, i]
+        timezone = None
+        if pd.api.types.is_datetime64tz_dtype(values):
+            timezone = str(values.dt.tz)
+            array = values.to_numpy(dtype='datetime64[ns]')
+        else:
+            array = values.to_numpy()
+        if array.dtype.hasobject:
+            columns.append((name, None, values.array))
+        else:
+            if get_mapped_file(array) != file_path.resolve(): # Columns loaded from this file already have the same contents
+                # The column is written to a temporary file first so that files that are memory-mapped by loaded data (such as a session loaded from this directory) aren't truncated
+                temp_path = path / '{}.npy.tmp'.format(i)
+                with open(temp_path, 'wb') as f:
+                    np.save(f, array)
+                os.replace(temp_path, file_path)
+            columns.append((name, timezone, None))
+    return {'columns': columns, 'index': None if data.index.equals(pd.RangeIndex(len(data.index))) else data.index}
+
+class PartitionedSource:
+    """
+    This class is a data source that is split into time-ordered chunks (such as one file per hour) that are loaded into memory as needed.
+    Each entry in the directory is one chunk and can be any source accepted by "load_data_source".
+    Chunks are sorted in natural order of their names and their time values must not overlap.
+
+    Only the chunks that overlap the current time range are combined into the data that DIVE uses.
+    Loaded chunks are kept in an LRU cache, and the chunks next to the current time range are loaded in a background thread.
+
+    Parameters
+    ----------
+    path : str, pathlib.Path
+        The path to the directory of chunks.
+    max_chunks : int (Default: 4)
+        The maximum number of chunks that can be in the current time range. If the current time range overlaps more chunks than this, only the latest ones are used (and a warning is printed once).
+        Two more chunks are kept in memory so that the chunks on either side of the current time range can be loaded in the background.
+    """
+    def __init__(self, path, max_chunks=4):
+        self.path = pathlib.Path(path)
+        self.chunk_paths = sorted([p for p in self.path.iterdir() if not p.name.startswith('.')], key=lambda p: helper_functions.natural_order(p.name))
+        if len(self.chunk_paths) == 0:
+            raise ValueError('"{}" doesn\'t contain any chunks.'.format(self.path))
+        self.max_chunks = max_chunks
+        self.chunk_cache = LRUCache(max_chunks + 2)
+        self.loading = {} # Holds the background threads that are loading chunks
+        self.window_warned = False # Whether a warning has been printed for a time range that overlaps more than "max_chunks" chunks
+        self.lock = threading.Lock()
+        self.time_field = self.time_starts = self.time_stops = self.time_limits = None
+
+    def evict_chunks(self, window):
+        """
+        Remove the chunks outside of a window from the cache. They will be loaded again if they are needed.
+
+        Parameters
+        ----------
+        window : None, tuple
+            The first and last (inclusive) chunk indices to keep.
+        """
+        with self.chunk_cache.lock:
+            keys = list(self.chunk_cache.entries)
+        for i in keys:
+            if window is None or not window[0] <= i <= window[1]:
+                self.chunk_cache.pop(i)
+
+    def get_cached_chunks(self, window):
+        """
+        Get the cached chunks inside of a window without changing the order in which they will be discarded.
+
+        Parameters
+        ----------
+        window : None, tuple
+            The first and last (inclusive) chunk indices.
+
+        Returns
+        -------
+        list
+            The cached chunks.
+        """
+        with self.chunk_cache.lock:
+            entries = list(self.chunk_cache.entries.items())
+        return [chunk for i, chunk in entries if window is not None and window[0] <= i <= window[1]]
+
+    def get_chunk(self, i):
+        """
+        Get the data in a chunk, loading it into memory if it isn't in the cache.
+
+        Parameters
+        ----------
+        i : int
+            The index of the chunk.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The data in the chunk.
+        """
+        with self.lock:
+            thread = self.loading.get(i)
+        if thread is not None:
+            thread.join()
+        data = self.chunk_cache.get(i)
+        if data is None:
+            data = self.load_chunk(i)
+        return data
+
+    def get_window(self, current_time, hold_time=None):
+        """
+        Calculate the range of chunks that overlap the current time range.
+        If the current time range is between chunks, the previous chunk is used.
+
+        Parameters
+        ----------
+        current_time : numeric
+            The current time value (see "helper_functions.to_time_value").
+        hold_time : None, numeric (Default: None)
+            The amount of time prior to the current time that should be included (in the same units as "current_time").
+            If None, all chunks prior to the current time will be included.
+
+        Returns
+        -------
+        tuple
+            The first and last (inclusive) chunk indices. At most "max_chunks" chunks are included.
+        """
+        stop = max(int(self.time_starts.searchsorted(current_time, side='right')) - 1, 0)
+        start = 0 if hold_time is None else min(int(self.time_stops.searchsorted(current_time - hold_time)), stop)
+        if start < stop - self.max_chunks + 1:
+            if not self.window_warned:
+                self.window_warned = True
+                helper_functions.print_error('The current time range of "{}" overlaps {} chunks, but only the latest {} are loaded. Rows in earlier chunks won\'t be shown. Decrease the hold time to avoid this.'.format(self.path.name, stop - start + 1, self.max_chunks))
+            start = stop - self.max_chunks + 1
+        return start, stop
+
+    def get_window_data(self, window):
+        """
+        Combine the chunks in a window into a single pandas.DataFrame.
+
+        Parameters
+        ----------
+        window : tuple
+            The first and last (inclusive) chunk indices.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The data in the window.
+        """
+        start, stop = window
+        chunks = [self.get_chunk(i) for i in range(start, stop + 1)]
+        for i in [start - 1, stop + 1]: # Load the neighboring chunks so that scrubbing/playback in either direction doesn't have to wait
+            if 0 <= i < len(self.chunk_paths):
+                self.prefetch_chunk(i)
+        return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+    def load_chunk(self, i):
+        try:
+            data = load_data_source(self.chunk_paths[i]).copy() # Copy the memory-mapped columns into memory
+            self.chunk_cache.set(i, data)
+        finally:
+            with self.lock:
+                self.loading.pop(i, None)
+        return data
+
+    def prefetch_chunk(self, i):
+        with self.lock:
+            if i in self.chunk_cache or i in self.loading:
+                return
+            thread = threading.Thread(target=self.prefetch_target, args=(i,), daemon=True)
+            self.loading[i] = thread
+        thread.start()
+
+    def prefetch_target(self, i):
+        try:
+            self.load_chunk(i)
+        except Exception: # The error is raised when the chunk is needed and loaded again by "get_chunk"
+            pass
+
+    def set_time_field(self, time_field, validate):
+        """
+        Check the time values of each chunk and read their time ranges. The chunks are memory-mapped, so only the time field is read from disk.
+
+        Parameters
+        ----------
+        time_field : str
+            The name of the time field.
+        validate : function
+            Called with the data in each chunk. It should return an error message if the time values in the chunk are invalid.
+
+        Returns
+        -------
+        None, str
+            An error message if the chunks can't be used with the time field.
+        """
+        if time_field == self.time_field:
+            return
+        starts, stops, limits = [], [], []
+        columns = None
+        for chunk_path in self.chunk_paths:
+            try:
+                data = load_data_source(chunk_path)
+            except Exception as error:
+                return 'Cannot open chunk "{}". {}'.format(chunk_path.name, error)
+            if columns is None:
+                columns = set(data.columns)
+            if set(data.columns) != columns: # Missing columns would be filled with NaN when the chunks are combined
+                return 'Chunk "{}" must have the same fields as chunk "{}".'.format(chunk_path.name, self.chunk_paths[0].name)
+            elif time_field not in data:
+                return '"{}" is not a valid field name in chunk "{}".'.format(time_field, chunk_path.name)
+            elif len(data.index) == 0:
+                return 'Chunk "{}" must have at least one value.'.format(chunk_path.name)
+            err_msg = validate(data)
+            if err_msg is not None:
+                return 'Invalid time values in chunk "{}". {}'.format(chunk_path.name, err_msg)
+            time_vals = data.loc[:, time_field]
+            if len(limits) > 0 and isinstance(time_vals.iat[0], pd.Timestamp) != isinstance(limits[0][0], pd.Timestamp):
+                return 'Time values in chunk "{}" must be the same type as in chunk "{}".'.format(chunk_path.name, self.chunk_paths[0].name)
+            limits.append((time_vals.iat[0], time_vals.iat[-1]))
+            starts.append(helper_functions.to_time_value(limits[-1][0]))
+            stops.append(helper_functions.to_time_value(limits[-1][1]))
+        if any(stops[i] > starts[i + 1] for i in range(len(starts) - 1)):
+            return 'Chunks must be in time order and their time values must not overlap.'
+        self.time_field, self.time_starts, self.time_stops = time_field, np.array(starts), np.array(stops)
+        self.time_limits = (limits[0][0], limits[-1][1])
+        self.chunk_cache.clear()
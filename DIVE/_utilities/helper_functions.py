@@ -1,8 +1,17 @@
+import concurrent.futures
 import numpy as np
+import os
 import pandas as pd
 import re
+import threading
 import traceback
 
+unit_conversions = {} # Holds the scale and offset for each pair of units that has been converted
+thread_pool = None # The thread pool shared by the parallel calculations in DIVE (see "get_thread_pool")
+thread_pool_lock = threading.Lock()
+thread_pool_size = None # The number of threads in the shared thread pool. If None, the number of CPUs (up to 8) is used (see "set_thread_pool_size")
+timestamp_bounds = tuple(bound.replace(nanosecond=0).value for bound in [pd.Timestamp.min + pd.Timedelta(days=365), pd.Timestamp.max - pd.Timedelta(days=365)]) # The min/max safe times as int64 nanoseconds since the epoch (UTC)
+
 def apply_operation(op, left, right):
     """
     This function applies a logical operation to two values and returns the result.
@@ -36,6 +45,97 @@ def apply_operation(op, left, right):
     else:
         raise Exception('Operation not recognized.')
 
+def convert_units(unit_reg, values, from_unit, to_unit):
+    """
+    This function converts values from one unit to another.
+    Linear conversions are stored as a scale and offset so that pint only has to be called once for each pair of units.
+
+    Parameters
+    ----------
+    unit_reg : pint.UnitRegistry
+        The unit registry to use for the conversion.
+    values : numeric, numpy.ndarray
+        The values to convert.
+    from_unit : str
+        The unit of "values".
+    to_unit : str
+        The unit to convert "values" to.
+
+    Returns
+    -------
+    numeric, numpy.ndarray
+        The converted values.
+    """
+    key = (id(unit_reg), from_unit, to_unit)
+    if key not in unit_conversions:
+        test_values = unit_reg.Quantity(np.array([0., 1., 2.]), from_unit).to(to_unit).magnitude
+        offset, scale = test_values[0], test_values[1] - test_values[0]
+        unit_conversions[key] = (scale, offset) if np.isclose(test_values[2], offset + 2 * scale) else None
+    conversion = unit_conversions[key]
+    if conversion is None: # Non-linear units (such as logarithmic units) have to be converted by pint
+        return unit_reg.Quantity(values, from_unit).to(to_unit).magnitude
+    return values * conversion[0] + conversion[1]
+
+def from_time_value(value, timezone=None):
+    """
+    This function converts an internal time value back to the time type used by the public API.
+
+    Parameters
+    ----------
+    value : None, numeric
+        The time value (see "to_time_value").
+    timezone : None, str (Default: None)
+        The timezone of the output pandas.Timestamp.
+        If None, "value" is numeric time and will be returned as is.
+
+    Returns
+    -------
+    None, numeric, pandas.Timestamp with tz
+        The converted time value.
+    """
+    if value is None or timezone is None:
+        return value
+    return pd.Timestamp(int(value), tz='UTC').tz_convert(timezone)
+
+def get_thread_pool():
+    """
+    This function returns the thread pool that is used for independent calculations that can run in parallel (such as filter groups and axis limits),
+    creating it the first time it is needed. Most of these calculations are done by numpy/pandas, which release the GIL.
+    Tasks in the pool must not wait on other tasks that haven't started yet.
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+        The thread pool.
+    """
+    global thread_pool
+    with thread_pool_lock:
+        if thread_pool is None:
+            thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1) if thread_pool_size is None else thread_pool_size, thread_name_prefix='DIVE')
+    return thread_pool
+
+def natural_argsort(values):
+    """
+    This function returns the indices that would sort an array of values in natural order.
+    The key from "natural_order" is only calculated once for each unique value, so this is much
+    faster than sorting with "natural_order" as the key when there are many duplicate values.
+
+    Parameters
+    ----------
+    values : array-like
+        The values to sort. They will be converted to str before sorting.
+
+    Returns
+    -------
+    numpy.ndarray
+        The indices that sort "values" (the sort is stable).
+    """
+    codes, uniques = pd.factorize(pd.Series(values).astype('str'))
+    order = sorted(range(len(uniques)), key=lambda i: natural_order(uniques[i]))
+    ranks = np.empty(len(uniques), dtype='int64')
+    ranks[order] = np.arange(len(uniques))
+    return np.argsort(ranks[codes], kind='stable')
+
 def natural_order(text):
     """
     This function should be passed in as the "key" parameter
@@ -88,13 +188,8 @@ def safe_time_math(time, amount, add=True):
         The incremented/decremented time value.
     """
     if isinstance(time, pd.Timestamp):
-        edge_offset = pd.Timedelta(days=365)
-        min_time, max_time = (pd.Timestamp.min + edge_offset).replace(nanosecond=0).tz_localize('UTC').tz_convert(time.tzinfo), (pd.Timestamp.max - edge_offset).replace(nanosecond=0).tz_localize('UTC').tz_convert(time.tzinfo)
-        seconds = time.timestamp() + amount.total_seconds() if add else time.timestamp() - amount.total_seconds()
-        if seconds < min_time.timestamp():
-            return min_time
-        elif seconds > max_time.timestamp():
-            return max_time
+        value = time.value + amount.value if add else time.value - amount.value
+        return pd.Timestamp(min(max(value, timestamp_bounds[0]), timestamp_bounds[1]), tz='UTC').tz_convert(time.tzinfo)
     return time + amount if add else time - amount
 
 def safe_tz_convert(time, timezone):
@@ -115,10 +210,25 @@ def safe_tz_convert(time, timezone):
         The converted time value.
     """
     if isinstance(time, pd.Timestamp):
-        edge_offset = pd.Timedelta(days=365)
-        return np.clip(time, (pd.Timestamp.min + edge_offset).replace(nanosecond=0).tz_localize('UTC'), (pd.Timestamp.max - edge_offset).replace(nanosecond=0).tz_localize('UTC')).tz_convert(timezone)
+        return pd.Timestamp(min(max(time.value, timestamp_bounds[0]), timestamp_bounds[1]), tz='UTC').tz_convert(timezone)
     return time
 
+def set_thread_pool_size(size=None):
+    """
+    This function sets the number of threads in the shared thread pool (see "get_thread_pool").
+    The current pool is shut down once its tasks finish, and a new pool is created the next time it is needed.
+
+    Parameters
+    ----------
+    size : None, int (Default: None)
+        The number of threads. If None, the number of CPUs (up to 8) is used.
+    """
+    global thread_pool, thread_pool_size
+    with thread_pool_lock:
+        old_pool, thread_pool, thread_pool_size = thread_pool, None, size
+    if old_pool is not None:
+        old_pool.shutdown(wait=False)
+
 def strftime(time, include_date=True, include_tz=False):
     """
     This function converts a time value to a string.
@@ -143,3 +253,23 @@ def strftime(time, include_date=True, include_tz=False):
     else:
         abs_time = abs(time)
         return '{}{}.{:06d}'.format('-' if time < 0 else '', int(abs_time // 1), int(abs_time * 1e6 - abs_time // 1 * 1e6))
+
+def to_time_value(time):
+    """
+    This function converts a time value to the representation used internally for time math.
+    pandas.Timestamps become int64 nanoseconds since the epoch (UTC), pandas.Timedeltas become int64 nanoseconds,
+    and numeric values are returned as is.
+
+    Parameters
+    ----------
+    time : None, numeric, pandas.Timestamp with tz, pandas.Timedelta
+        The time value to convert.
+
+    Returns
+    -------
+    None, numeric
+        The converted time value.
+    """
+    if isinstance(time, (pd.Timestamp, pd.Timedelta)):
+        return time.value
+    return time
@@ -0,0 +1,99 @@
+from .bit_mask import BitMask
+from .lru_cache import LRUCache
+import mmap
+import numpy as np
+import pandas as pd
+import sys
+
+def get_nbytes(value, seen=None):
+    """
+    This function estimates the number of bytes of memory that a value uses.
+    numpy arrays, BitMasks and pandas objects are measured by the size of their values (object values are only counted as pointers, and views are measured by the size of the array that owns their values),
+    containers are measured by the sum of their items, and everything else by "sys.getsizeof".
+    Memory-mapped arrays aren't counted since their pages can be reclaimed by the OS at any time.
+
+    Parameters
+    ----------
+    value : object
+        The value to measure.
+    seen : None, set (Default: None)
+        The keys of the arrays and pandas.DataFrames that have already been counted. Arrays that are shared by several values are only counted the first time.
+        The keys of the values counted by this call are added to it.
+
+    Returns
+    -------
+    int
+        The estimated number of bytes.
+    """
+    if seen is None:
+        seen = set()
+    if value is None:
+        return 0
+    elif isinstance(value, np.ndarray):
+        if is_memory_mapped(value):
+            return 0
+        while isinstance(value.base, np.ndarray): # Views keep the array that owns their values alive, so that array is counted (once) instead
+            value = value.base
+        key = ('array', id(value))
+        if key in seen:
+            return 0
+        seen.add(key)
+        return int(value.nbytes)
+    elif isinstance(value, BitMask):
+        return get_nbytes(value.bits, seen)
+    elif isinstance(value, pd.DataFrame):
+        if ('frame', id(value)) in seen:
+            return 0
+        seen.add(('frame', id(value)))
+        return get_nbytes(value.index, seen) + sum(get_nbytes(value.iloc[:, i], seen) for i in range(len(value.columns)))
+    elif isinstance(value, (pd.Series, pd.Index)):
+        if isinstance(value.dtype, np.dtype) and not value.dtype.hasobject: # The values can be measured without being copied
+            return get_nbytes(value.to_numpy(copy=False), seen)
+        return int(value.memory_usage(deep=False)) if isinstance(value, pd.Index) else int(value.memory_usage(index=False, deep=False))
+    elif isinstance(value, LRUCache):
+        with value.lock:
+            entries = list(value.entries.items())
+        return get_nbytes(entries, seen)
+    elif isinstance(value, dict):
+        return sum(get_nbytes(key, seen) + get_nbytes(item, seen) for key, item in list(value.items()))
+    elif isinstance(value, (list, tuple, set)):
+        return sum(get_nbytes(item, seen) for item in list(value))
+    return sys.getsizeof(value)
+
+def is_memory_mapped(array):
+    """
+    This function checks whether a numpy array (or the array it is a view of) is backed by a memory-mapped file.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        The array to check.
+
+    Returns
+    -------
+    bool
+        Whether the array is memory-mapped.
+    """
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+def sum_nbytes(usage):
+    """
+    This function adds up all of the byte counts in a nested dict of memory usage (see "DIVEManager.get_memory_usage").
+
+    Parameters
+    ----------
+    usage : int, dict
+        The memory usage.
+
+    Returns
+    -------
+    int
+        The total number of bytes.
+    """
+    if isinstance(usage, dict):
+        return sum(sum_nbytes(value) for value in usage.values())
+    return usage
@@ -28,13 +28,13 @@ def validate_field(name, data_objs, data_name, field_name, required_names=[], op
             return 'data_name is required when {} is not None.'.format(name)
         elif field_name not in data_objs[data_name].data:
             return '"{}" is not a valid field name for data object "{}".'.format(field_name, data_name)
-        elif name in size_names:
-            data = data_objs[data_name].data.loc[:, field_name]
-            if not pd.api.types.is_numeric_dtype(data):
+        elif name in size_names: # The column properties are cached by the data object, so they are only calculated once for each version of the data
+            data_obj = data_objs[data_name]
+            if data_obj.get_field_fact(field_name, 'dtype') not in ['numeric', 'complex']:
                 return '{} must have numeric values.'.format(name)
-            elif not np.isfinite(data).all():
+            elif not data_obj.get_field_fact(field_name, 'finite'):
                 return '{} must have finite values.'.format(name)
-            elif data.min() < 0:
+            elif not data_obj.get_field_fact(field_name, 'non_negative'):
                 return '{} must have values greater than or equal to 0.'.format(name)
 
 def validate_unit(name, unit_reg, unit):
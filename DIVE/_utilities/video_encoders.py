@@ -0,0 +1,189 @@
+import importlib
+import numpy as np
+import pathlib
+import queue
+import shutil
+import subprocess
+import threading
+import vispy.app as vpapp
+qt = vpapp.use_app().backend_name
+try:
+    qtgui = importlib.import_module('{}.QtGui'.format(qt))
+except:
+    pass
+del qt
+try:
+    import cv2
+except:
+    pass
+
+def create_encoder(encoder, file_path, fps):
+    """
+    This function creates a video encoder.
+
+    Parameters
+    ----------
+    encoder : str
+        The name of the encoder (one of the values returned by "get_available_encoders").
+    file_path : str
+        The path that the output should be written to.
+    fps : int
+        The number of frames per second that the video should have.
+
+    Returns
+    -------
+    VideoEncoder
+        The encoder.
+    """
+    if encoder == 'opencv':
+        return OpenCVEncoder(file_path, fps)
+    elif encoder == 'ffmpeg':
+        return FFmpegEncoder(file_path, fps)
+    return FrameEncoder(file_path, fps, encoder)
+
+def get_available_encoders():
+    """
+    This function returns the names of the encoders that can be used with the installed modules/executables.
+
+    Returns
+    -------
+    list
+        The names of the available encoders in order of preference.
+    """
+    encoders = []
+    if 'cv2' in globals():
+        encoders.append('opencv')
+    if shutil.which('ffmpeg') is not None:
+        encoders.append('ffmpeg')
+    return encoders + ['png', 'npy']
+
+class VideoEncoder:
+    """
+    This class is the base class for the encoders used by DIVEManager.record_video.
+    Frames are passed to a background thread so that encoding overlaps with rendering the next frame.
+
+    Parameters
+    ----------
+    file_path : str
+        The path that the output should be written to.
+    fps : int
+        The number of frames per second that the video should have.
+    """
+    def __init__(self, file_path, fps):
+        self.file_path, self.fps = file_path, fps
+        self.error = None
+        self.frame_queue = queue.Queue(maxsize=8) # Bound the queue so that memory doesn't grow if the encoder is slower than the rendering
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """
+        Wait for all of the queued frames to be written and then release the output.
+        If the writer thread failed, its exception is raised here.
+        """
+        self.frame_queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def release(self):
+        pass
+
+    def run(self):
+        while True:
+            frame = self.frame_queue.get()
+            if frame is None:
+                break
+            elif self.error is None:
+                try:
+                    self.write_frame(frame)
+                except Exception as e:
+                    self.error = e
+        try:
+            self.release()
+        except Exception as e:
+            if self.error is None:
+                self.error = e
+
+    def write(self, frame):
+        """
+        Queue a frame to be written.
+
+        Parameters
+        ----------
+        frame : numpy.ndarray
+            The RGB image data for the frame (as uint8 with shape (height, width, 3)).
+        """
+        if self.error is not None:
+            raise self.error
+        self.frame_queue.put(frame)
+
+    def write_frame(self, frame):
+        raise NotImplementedError
+
+class FFmpegEncoder(VideoEncoder):
+    """
+    This class pipes raw RGB frames to a local ffmpeg executable which encodes them with x264.
+    """
+    def __init__(self, file_path, fps):
+        self.process = None
+        super().__init__(file_path, fps)
+
+    def release(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            _, stderr = self.process.communicate()
+            if self.process.returncode != 0 and self.error is None:
+                raise RuntimeError('ffmpeg exited with code {}: {}'.format(self.process.returncode, stderr.decode(errors='replace').strip()))
+
+    def write_frame(self, frame):
+        if self.process is None:
+            height, width, _ = frame.shape
+            # yuv420p requires even dimensions, so the frame is padded if needed
+            self.pad = (height % 2, width % 2)
+            command = [shutil.which('ffmpeg'), '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', '{}x{}'.format(width + self.pad[1], height + self.pad[0]), '-r', str(self.fps), '-i', '-', '-c:v', 'libx264', '-preset', 'veryfast', '-threads', '0', '-pix_fmt', 'yuv420p', self.file_path]
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if any(self.pad):
+            frame = np.pad(frame, ((0, self.pad[0]), (0, self.pad[1]), (0, 0)), mode='edge')
+        self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+
+class FrameEncoder(VideoEncoder):
+    """
+    This class writes each frame to a numbered file in a directory instead of encoding a video.
+    PNG files are encoded by Qt, and npy files hold the raw RGB image data.
+    """
+    def __init__(self, file_path, fps, frame_format):
+        self.frame_format = frame_format
+        self.frame_num = 0
+        pathlib.Path(file_path).mkdir(exist_ok=True)
+        super().__init__(file_path, fps)
+
+    def write_frame(self, frame):
+        path = pathlib.Path(self.file_path) / 'frame_{:06d}.{}'.format(self.frame_num, self.frame_format)
+        if self.frame_format == 'npy':
+            np.save(path, frame)
+        else:
+            height, width, _ = frame.shape
+            data = np.ascontiguousarray(frame).tobytes() # The QImage doesn't own this buffer, so it must stay alive until the image is saved
+            image = qtgui.QImage(data, width, height, width * 3, qtgui.QImage.Format_RGB888)
+            if not image.save(str(path), 'PNG'):
+                raise RuntimeError('Cannot write "{}".'.format(path))
+        self.frame_num += 1
+
+class OpenCVEncoder(VideoEncoder):
+    """
+    This class encodes frames as an mp4v video using opencv.
+    """
+    def __init__(self, file_path, fps):
+        self.video = None
+        super().__init__(file_path, fps)
+
+    def release(self):
+        if self.video is not None:
+            self.video.release()
+
+    def write_frame(self, frame):
+        if self.video is None:
+            height, width, _ = frame.shape
+            self.video = cv2.VideoWriter(self.file_path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, (width, height))
+        self.video.write(frame[:, :, ::-1])
@@ -1,4 +1,5 @@
 from ._components.dive_manager import DIVEManager as _DIVEManager
+import contextlib as _contextlib
 import importlib as _importlib
 import vispy as _vp
 qt = _vp.app.use_app().backend_name
@@ -22,6 +23,12 @@ class DIVEWidget(_qtwidgets.QWidget):
         Only valid if the "pint" module has been installed.
     *args
         Any parameters that are accepted by a QWidget.
+    data_store : None, DIVEDataStore (Default: None)
+        The store to share data with other DIVEWidgets in the same application.
+        Data objects added to widgets with the same store share the data (when the same pandas.DataFrame or data source path is given)
+        and the values derived from it, such as distinct-value indices and time values, so memory and load time don't scale with the number of widgets.
+        Filters and selections aren't shared. If None, data isn't shared.
+        A pandas.DataFrame in the store must not be modified in place unless it is passed to "edit_data" again afterward.
     **kwargs
         Any keyword parameters that are accepted by a QWidget.
 
@@ -32,12 +39,12 @@ class DIVEWidget(_qtwidgets.QWidget):
     """
     current_time_changed = _qtcore.pyqtSignal() if hasattr(_qtcore, 'pyqtSignal') else _qtcore.Signal()
 
-    def __init__(self, unit_reg=None, *args, **kwargs):
+    def __init__(self, unit_reg=None, *args, data_store=None, **kwargs):
         super().__init__(*args,**kwargs)
         self.setWindowTitle('Data Interface for Visual Exploration')
-        self._dive_manager = _DIVEManager(self, unit_reg)
+        self._dive_manager = _DIVEManager(self, unit_reg, data_store)
 
-    def add_arrow_artist(self, axis_name, name, data_name, x_field, y_field, z_field=None, label_field=None, label_size=10, visible=True, draw_order=0, label_draw_order=0, legend_text=None, selectable=True,
+    def add_arrow_artist(self, axis_name, name, data_name, x_field, y_field, z_field=None, label_field=None, label_size=10, label_culling=False, visible=True, draw_order=0, label_draw_order=0, legend_text=None, selectable=True,
                          line_width=1, line_color='r', line_color_field=None, line_colormap='viridis', line_color_label=None, line_color_unit=None,
                          arrow_shape='stealth', arrow_spacing=0, show_last_arrow=True, arrow_size=10,
                          arrow_color='g', arrow_color_field=None, arrow_colormap='viridis', arrow_color_label=None, arrow_color_unit=None):
@@ -64,6 +71,10 @@ class DIVEWidget(_qtwidgets.QWidget):
             If None, labels will not be shown.
         label_size : numeric (Default: 10)
             The font size to use for labels.
+        label_culling : bool (Default: False)
+            Toggle whether labels outside of the view are hidden and overlapping labels are thinned out.
+            If True, the view is split into a grid of cells (one line tall and as wide as a typical label) and only the most recent label in each cell is shown.
+            The labels are laid out again whenever the view changes.
         visible : bool (Default: True)
             Toggle whether this artist is visible.
         draw_order : numeric (Default: 0)
@@ -136,7 +147,7 @@ class DIVEWidget(_qtwidgets.QWidget):
 
         It is possible to cycle through the colorbars in an axis by clicking on the colorbar.
         """
-        self._dive_manager.add_artist(axis_name, 'arrow', dict(name=name, data_name=data_name, x_field=x_field, y_field=y_field, z_field=z_field, label_field=label_field, label_size=label_size, visible=visible, draw_order=draw_order, label_draw_order=label_draw_order, legend_text=legend_text, selectable=selectable,
+        self._dive_manager.add_artist(axis_name, 'arrow', dict(name=name, data_name=data_name, x_field=x_field, y_field=y_field, z_field=z_field, label_field=label_field, label_size=label_size, label_culling=label_culling, visible=visible, draw_order=draw_order, label_draw_order=label_draw_order, legend_text=legend_text, selectable=selectable,
                                                                line_width=line_width, line_color=line_color, line_color_field=line_color_field, line_colormap=line_colormap, line_color_label=line_color_label, line_color_unit=line_color_unit,
                                                                arrow_shape=arrow_shape, arrow_spacing=arrow_spacing, show_last_arrow=show_last_arrow, arrow_size=arrow_size,
                                                                arrow_color=arrow_color, arrow_color_field=arrow_color_field, arrow_colormap=arrow_colormap, arrow_color_label=arrow_color_label, arrow_color_unit=arrow_color_unit))
@@ -298,9 +309,16 @@ class DIVEWidget(_qtwidgets.QWidget):
         ----------
         name : str
             The name to use for this data object.
-        data : pandas.DataFrame
+        data : pandas.DataFrame, str, pathlib.Path
             The data to store in this data object.
             All column names must be strings.
+            A path to an on-disk data source can be given instead of a pandas.DataFrame. The columns of the source will be memory-mapped,
+            so only the pages that DIVE accesses are read from disk. The source can be either a directory of .npy files (one file per column,
+            named after the column) or an Arrow IPC/Feather file (requires the "pyarrow" module). datetime64 columns without a timezone are localized to UTC.
+            A directory of time-ordered chunks (such as one Arrow file or .npy directory per hour) can also be given. Only the chunks that overlap
+            the current time range are loaded, and the neighboring chunks are loaded in the background. At most 4 chunks are loaded at a time, so if the
+            hold time covers more chunks than that (including a hold time of 0, which covers all prior chunks), only the latest 4 are shown and a warning is printed.
+            Partitioned data requires "time_field", its filters are recalculated whenever different chunks are loaded, and it can't be used with custom filters.
         id_field : None, str (Default: None)
             The name of the field in "data" that contains the ID for each row.
         time_field : None, str (Default: None)
@@ -477,7 +495,7 @@ class DIVEWidget(_qtwidgets.QWidget):
         """
         self._dive_manager.add_filter('value', dict(name=name, data_names=data_names, filters=filters, id_filter=id_filter, enabled=enabled))
 
-    def add_image_artist(self, axis_name, name, data_name, color_field, visible=True, draw_order=0, legend_text=None, x_pos=0, x_pos_field=None, y_pos=0, y_pos_field=None, width=1, width_field=None, height=1, height_field=None, colormap='viridis', color_label=None, color_unit=None, interpolation='Nearest'):
+    def add_image_artist(self, axis_name, name, data_name, color_field, visible=True, draw_order=0, legend_text=None, x_pos=0, x_pos_field=None, y_pos=0, y_pos_field=None, width=1, width_field=None, height=1, height_field=None, colormap='viridis', color_label=None, color_unit=None, interpolation='Nearest', tile_size=None):
         """
         Add an image artist to an axis in DIVE.
 
@@ -530,6 +548,11 @@ class DIVEWidget(_qtwidgets.QWidget):
         interpolation : str (Default: "Nearest")
             The interpolation method to use for the image.
             Allowed values are: 'Bessel', 'Bicubic', 'Bilinear', 'Blackman', 'CatRom', 'Gaussian', 'Hamming', 'Hanning', 'Hermite', 'Kaiser', 'Lanczos', 'Mitchell', 'Nearest', 'Quadric', 'Sinc', 'Spline16', 'Spline36'
+        tile_size : None, int (Default: None)
+            If not None, each image is split into tiles with this many rows/columns at several resolutions (an image pyramid).
+            Only the tiles in view are drawn, at the resolution that best matches the screen, and the colormap is applied on the GPU.
+            This is recommended for images that are too large to be drawn as a single texture.
+            Must be between 16 and 4096.
 
         Notes
         -----
@@ -541,7 +564,7 @@ class DIVEWidget(_qtwidgets.QWidget):
 
         It is possible to cycle through the colorbars in an axis by clicking on the colorbar.
         """
-        self._dive_manager.add_artist(axis_name, 'image', dict(name=name, data_name=data_name, color_field=color_field, visible=visible, draw_order=draw_order, legend_text=legend_text, x_pos=x_pos, x_pos_field=x_pos_field, y_pos=y_pos, y_pos_field=y_pos_field, width=width, width_field=width_field, height=height, height_field=height_field, colormap=colormap, color_label=color_label, color_unit=color_unit, interpolation=interpolation))
+        self._dive_manager.add_artist(axis_name, 'image', dict(name=name, data_name=data_name, color_field=color_field, visible=visible, draw_order=draw_order, legend_text=legend_text, x_pos=x_pos, x_pos_field=x_pos_field, y_pos=y_pos, y_pos_field=y_pos_field, width=width, width_field=width_field, height=height, height_field=height_field, colormap=colormap, color_label=color_label, color_unit=color_unit, interpolation=interpolation, tile_size=tile_size))
 
     def add_infinite_line_artist(self, axis_name, name, data_name=None, visible=True, draw_order=0, legend_text=None, pos=0, pos_field=None, color='r', color_field=None, colormap='viridis', color_label=None, color_unit=None, is_vertical=True):
         """
@@ -765,7 +788,7 @@ class DIVEWidget(_qtwidgets.QWidget):
         """
         self._dive_manager.add_artist(axis_name, 'rectangle', dict(name=name, data_name=data_name, visible=visible, draw_order=draw_order, legend_text=legend_text, x_pos=x_pos, x_pos_field=x_pos_field, y_pos=y_pos, y_pos_field=y_pos_field, edge_width=edge_width, edge_width_field=edge_width_field, width=width, width_field=width_field, height=height, height_field=height_field, color=color, color_field=color_field, colormap=colormap, color_label=color_label, color_unit=color_unit, edge_color=edge_color, edge_color_field=edge_color_field, edge_colormap=edge_colormap, edge_color_label=edge_color_label, edge_color_unit=edge_color_unit))
 
-    def add_scatter_artist(self, axis_name, name, data_name, x_field, y_field, z_field=None, label_field=None, label_size=10, visible=True, draw_order=0, label_draw_order=0, legend_text=None, selectable=True,
+    def add_scatter_artist(self, axis_name, name, data_name, x_field, y_field, z_field=None, label_field=None, label_size=10, label_culling=False, visible=True, draw_order=0, label_draw_order=0, legend_text=None, selectable=True,
                            line_width=1, line_color='r', line_color_field=None, line_colormap='viridis', line_color_label=None, line_color_unit=None,
                            marker='o', marker_size=10, marker_color='g', marker_color_field=None, marker_colormap='viridis', marker_color_label=None, marker_color_unit=None,
                            edge_width=0, edge_color='g', edge_color_field=None, edge_colormap='viridis', edge_color_label=None, edge_color_unit=None):
@@ -792,6 +815,10 @@ class DIVEWidget(_qtwidgets.QWidget):
             If None, labels will not be shown.
         label_size : numeric (Default: 10)
             The font size to use for labels.
+        label_culling : bool (Default: False)
+            Toggle whether labels outside of the view are hidden and overlapping labels are thinned out.
+            If True, the view is split into a grid of cells (one line tall and as wide as a typical label) and only the most recent label in each cell is shown.
+            The labels are laid out again whenever the view changes.
         visible : bool (Default: True)
             Toggle whether this artist is visible.
         draw_order : numeric (Default: 0)
@@ -879,7 +906,7 @@ class DIVEWidget(_qtwidgets.QWidget):
 
         It is possible to cycle through the colorbars in an axis by clicking on the colorbar.
         """
-        self._dive_manager.add_artist(axis_name, 'scatter', dict(name=name, data_name=data_name, x_field=x_field, y_field=y_field, z_field=z_field, label_field=label_field, label_size=label_size, visible=visible, draw_order=draw_order, label_draw_order=label_draw_order, legend_text=legend_text, selectable=selectable,
+        self._dive_manager.add_artist(axis_name, 'scatter', dict(name=name, data_name=data_name, x_field=x_field, y_field=y_field, z_field=z_field, label_field=label_field, label_size=label_size, label_culling=label_culling, visible=visible, draw_order=draw_order, label_draw_order=label_draw_order, legend_text=legend_text, selectable=selectable,
                                                                  line_width=line_width, line_color=line_color, line_color_field=line_color_field, line_colormap=line_colormap, line_color_label=line_color_label, line_color_unit=line_color_unit,
                                                                  marker=marker, marker_size=marker_size, marker_color=marker_color, marker_color_field=marker_color_field, marker_colormap=marker_colormap, marker_color_label=marker_color_label, marker_color_unit=marker_color_unit,
                                                                  edge_width=edge_width, edge_color=edge_color, edge_color_field=edge_color_field, edge_colormap=edge_colormap, edge_color_label=edge_color_label, edge_color_unit=edge_color_unit))
@@ -975,7 +1002,7 @@ class DIVEWidget(_qtwidgets.QWidget):
         """
         self._dive_manager.add_table_row(dict(data_name=data_name, field_name=field_name, label=label, operation=operation, color_criteria=color_criteria, blend_colors=blend_colors, index=index))
 
-    def add_text_artist(self, axis_name, name, data_name, text_field, x_field, y_field, z_field=None, visible=True, draw_order=0, legend_text=None, x_anchor='center', y_anchor='center', font_size=12, bold=False, italic=False, color='black', color_field=None, colormap='viridis', color_label=None, color_unit=None):
+    def add_text_artist(self, axis_name, name, data_name, text_field, x_field, y_field, z_field=None, visible=True, draw_order=0, legend_text=None, x_anchor='center', y_anchor='center', font_size=12, bold=False, italic=False, label_culling=False, color='black', color_field=None, colormap='viridis', color_label=None, color_unit=None):
         """
         Add a text artist to an axis in DIVE.
 
@@ -1016,6 +1043,10 @@ class DIVEWidget(_qtwidgets.QWidget):
             Toggle whether text is bold.
         italic : bool (Default: False)
             Toggle whether text is italicized.
+        label_culling : bool (Default: False)
+            Toggle whether text outside of the view is hidden and overlapping text is thinned out.
+            If True, the view is split into a grid of cells (one line tall and as wide as a typical text value) and only the most recent text in each cell is shown.
+            The text is laid out again whenever the view changes.
         color : str (Default: "black")
             The color to use for the text.
             It must be either a hex string (such as "#ff0000") or the name of a CSS color.
@@ -1044,7 +1075,7 @@ class DIVEWidget(_qtwidgets.QWidget):
 
         It is possible to cycle through the colorbars in an axis by clicking on the colorbar.
         """
-        self._dive_manager.add_artist(axis_name, 'text', dict(name=name, data_name=data_name, text_field=text_field, x_field=x_field, y_field=y_field, z_field=z_field, visible=visible, draw_order=draw_order, legend_text=legend_text, x_anchor=x_anchor, y_anchor=y_anchor, font_size=font_size, bold=bold, italic=italic, color=color, color_field=color_field, colormap=colormap, color_label=color_label, color_unit=color_unit))
+        self._dive_manager.add_artist(axis_name, 'text', dict(name=name, data_name=data_name, text_field=text_field, x_field=x_field, y_field=y_field, z_field=z_field, visible=visible, draw_order=draw_order, legend_text=legend_text, x_anchor=x_anchor, y_anchor=y_anchor, font_size=font_size, bold=bold, italic=italic, label_culling=label_culling, color=color, color_field=color_field, colormap=colormap, color_label=color_label, color_unit=color_unit))
 
     def axis_limits_autoscale(self, name=None):
         """
@@ -1070,6 +1101,38 @@ class DIVEWidget(_qtwidgets.QWidget):
         """
         self._dive_manager.axis_limits_reset(name)
 
+    @_contextlib.contextmanager
+    def batch_update(self):
+        """
+        Return a context manager that defers all refreshes in DIVE until the context exits.
+
+        Notes
+        -----
+        This is equivalent to calling "begin_update" when entering the context and "end_update" when exiting it.
+        """
+        self.begin_update()
+        try:
+            yield self
+        finally:
+            self.end_update()
+
+    def begin_update(self):
+        """
+        Start a batch update in DIVE.
+        Until "end_update" is called, the filter indices, grid cells, legend, canvas, and table won't be refreshed.
+        When the batch update ends, a single refresh will be done for everything that changed.
+
+        Notes
+        -----
+        Batch updates can be nested. The refresh will be done when the outermost batch update ends.
+
+        Values that depend on filter indices (such as the time limits when "apply_limits_filter" is True) may be
+        out of date until the batch update ends.
+
+        A video can't be recorded while a batch update is in progress.
+        """
+        self._dive_manager.begin_update()
+
     def display_axis(self, name=None):
         """
         Display an axis in DIVE.
@@ -1091,6 +1154,11 @@ class DIVEWidget(_qtwidgets.QWidget):
         name : None, str (Default: None)
             The name of the axis group to display.
             If None, no axis group will be displayed.
+
+        Notes
+        -----
+        The limits of the axes in the group are calculated in parallel. If this takes a while, a placeholder is shown on the canvas
+        and the window keeps repainting until they are ready (user input is ignored and animation frames are skipped until then).
         """
         self._dive_manager.display_axis_group(name)
 
@@ -1200,6 +1268,13 @@ class DIVEWidget(_qtwidgets.QWidget):
         """
         self._dive_manager.edit_table_row(row_index, kwargs)
 
+    def end_update(self):
+        """
+        End a batch update in DIVE that was started with "begin_update".
+        If this ends the outermost batch update, everything that changed during the batch update will be refreshed.
+        """
+        self._dive_manager.end_update()
+
     def get_animation_direction(self):
         """
         Return the direction of the animation in DIVE.
@@ -1449,6 +1524,28 @@ class DIVEWidget(_qtwidgets.QWidget):
         """
         return self._dive_manager.get_interact_mode()
 
+    def get_memory_usage(self):
+        """
+        Return an estimate of the memory used by DIVE in bytes.
+        Memory-mapped data isn't counted, values that are shared (such as data shared through a DIVEDataStore) are only counted once,
+        and object values are only counted as pointers. Memory used by vispy and the GPU isn't included.
+
+        Returns
+        -------
+        dict
+            data : dict
+                The bytes used by each data object name, split into "data", "filter", "selection", "field_indices", "time_values" and "chunk_cache".
+            filters : dict
+                The bytes used by each filter group name for each filter type ("custom", "ID", "value").
+            artists : dict
+                The bytes kept between updates by each artist name for each axis being displayed.
+            caches : dict
+                The bytes used by the other caches ("tick_cache", "unit_conversions").
+            total : int
+                The total number of bytes.
+        """
+        return self._dive_manager.get_memory_usage()
+
     def get_recording_state(self):
         """
         Return the recording state in DIVE.
@@ -1503,7 +1600,25 @@ class DIVEWidget(_qtwidgets.QWidget):
         """
         return self._dive_manager.get_time_limits()
 
-    def record_video(self, file_path, start_time, stop_time, fps=None):
+    def load_session(self, file_path):
+        """
+        Replace everything in DIVE with a session that was saved by "save_session".
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the session directory.
+
+        Notes
+        -----
+        The saved data columns are memory-mapped. The saved filter indices, selections and distinct-value indices are used
+        without being validated or recalculated, so the session directory must not be modified after it has been saved.
+        Partitioned data is reopened from its original source.
+        Sessions are stored with pickle, so only load sessions from trusted sources.
+        """
+        self._dive_manager.load_session(file_path)
+
+    def record_video(self, file_path, start_time, stop_time, fps=None, encoder=None):
         """
         Record a .mp4 video of the DIVE window for a period of time.
 
@@ -1511,6 +1626,7 @@ class DIVEWidget(_qtwidgets.QWidget):
         ----------
         file_path : str
             The path (including the file name) to where the video should be saved.
+            If "encoder" is "png" or "npy", this is the directory that the frames will be saved to.
         start_time : numeric, pandas.Timestamp with tz
             The time value that the recording should start from.
         stop_time : numeric, pandas.Timestamp with tz
@@ -1518,12 +1634,21 @@ class DIVEWidget(_qtwidgets.QWidget):
         fps : None, int (Default: None)
             The number of frames per second that the video should have.
             If None, the fps in DIVE's settings will be used.
+        encoder : None, str (Default: None)
+            The backend used to write the frames. It must be one of the following values:
+
+            * "opencv": Encode an mp4v video using the "opencv-python" module.
+            * "ffmpeg": Pipe raw RGB frames to a local ffmpeg executable that encodes an x264 video.
+            * "png": Save each frame as a numbered PNG file in a directory.
+            * "npy": Save each frame as a numbered NPY file in a directory.
+
+            If None, "opencv" will be used if it's installed, then "ffmpeg" if it's on the PATH, then "png" if "file_path" doesn't have a file extension.
 
         Notes
         -----
-        If the "opencv-python" module hasn't been installed, this function won't do anything.
+        Frames are written by a background thread while the next frame is being rendered.
         """
-        self._dive_manager.record_video(file_path, start_time, stop_time, fps)
+        self._dive_manager.record_video(file_path, start_time, stop_time, fps, encoder)
 
     def remove_artist(self, axis_name=None, name=None):
         """
@@ -1624,6 +1749,24 @@ class DIVEWidget(_qtwidgets.QWidget):
         """
         self._dive_manager.remove_table_row(index)
 
+    def save_session(self, file_path):
+        """
+        Save everything in DIVE to a session directory that can be loaded by "load_session".
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the session directory. It will be created if it doesn't exist.
+
+        Notes
+        -----
+        Each data column is saved as a .npy file so that it can be memory-mapped when the session is loaded
+        (columns with object values are saved with the rest of the session). The states of the data, axes, axis groups,
+        artists, filters, table rows and settings are saved along with the filter indices, selections and distinct-value
+        indices. Partitioned data is saved as a reference to its source.
+        """
+        self._dive_manager.save_session(file_path)
+
     def set_animation_direction(self, reverse):
         """
         Set the direction of the animation in DIVE.
@@ -1711,6 +1854,13 @@ class DIVEWidget(_qtwidgets.QWidget):
             and_filters : bool
                 Toggle whether filter groups in DIVE should be merged using AND.
                 If False, filter groups will be merged using OR.
+            memory_budget : None, numeric
+                The number of megabytes (2**20 bytes) of memory that DIVE should try to stay within (see "get_memory_usage").
+                The usage is checked every few seconds, and derived values that can be recalculated (cached tick labels, artist buffers,
+                cached chunks of partitioned data and distinct-value indices) are discarded, least recently used first, until it is within the budget.
+                Distinct-value indices that were used since the last check are kept. A warning is printed if the data, filters and
+                selections alone need more memory than the budget allows.
+                If None, there is no budget.
 
         Notes
         -----
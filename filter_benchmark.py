@@ -0,0 +1,68 @@
+from DIVE._components import dive_data, dive_filters
+from DIVE._utilities import helper_functions
+import argparse
+import numpy as np
+import os
+import pandas as pd
+import time
+
+# This script measures how long it takes to calculate the combined filter indices of several filter groups
+# (the work done by DIVEManager.update_filters) with different numbers of threads in the shared thread pool.
+# The filter groups are only calculated in parallel when they cover at least "dive_filters.parallel_min_rows" rows, so "--rows" should be large enough for that.
+
+def create_data(n_rows):
+    return pd.DataFrame({'id': np.random.randint(0, 1000, n_rows).astype('str'),
+                         'a': np.random.rand(n_rows),
+                         'b': np.random.randn(n_rows),
+                         'c': np.random.randint(0, 100, n_rows),
+                         'time': np.arange(n_rows, dtype='float64')})
+
+def time_filters(filters, data_objs, workers, repeats):
+    helper_functions.set_thread_pool_size(workers)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        filter_idx, _ = filters.get_filter_indices(data_objs, None, None, True, None, as_masks=True)
+        times.append(time.perf_counter() - start)
+    return min(times), {data_name: mask.to_bool() for data_name, mask in filter_idx.items()}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the parallel calculation of filter indices.')
+    parser.add_argument('--rows', type=int, default=5000000, help='The number of rows in each data object.')
+    parser.add_argument('--data', type=int, default=2, help='The number of data objects.')
+    parser.add_argument('--groups', type=int, default=8, help='The number of value filter groups for each data object.')
+    parser.add_argument('--repeats', type=int, default=5, help='The number of times each measurement is repeated (the fastest is used).')
+    args = parser.parse_args()
+    np.random.seed(1234)
+
+    data_objs = {}
+    for i in range(args.data):
+        data_obj = dive_data.DIVEData()
+        err_msg = data_obj.set_state([], {'name': 'data_{}'.format(i), 'data': create_data(args.rows), 'id_field': 'id', 'time_field': 'time'})
+        if err_msg is not None:
+            raise RuntimeError(err_msg)
+        data_objs[data_obj.name] = data_obj
+
+    filters = dive_filters.DIVEFilters()
+    for data_name in data_objs:
+        for j in range(args.groups):
+            threshold = j / args.groups
+            err_msg = filters.add_filter(data_objs, 'value', {'name': '{} value {}'.format(data_name, j), 'data_names': [data_name], 'filters': ['OR', ['AND', ['>=', data_name, 'a', threshold / 2], ['<', data_name, 'b', 2 - threshold]], ['!=', data_name, 'c', j]], 'enabled': True})
+            if err_msg is not None:
+                raise RuntimeError(err_msg)
+    err_msg = filters.add_filter(data_objs, 'ID', {'name': 'ids', 'values': {data_name: [str(k) for k in range(0, 1000, 2)] for data_name in data_objs}, 'enabled': True})
+    if err_msg is not None:
+        raise RuntimeError(err_msg)
+    filters.get_filter_indices(data_objs, None, None, True, None) # Build the distinct-value indices used by the ID filter group before timing
+
+    print('{} data objects with {} rows, {} filter groups, {} CPUs'.format(args.data, args.rows, len(filters.value) + len(filters.ID), os.cpu_count()))
+    print('{:>8} {:>10} {:>8}'.format('threads', 'time (s)', 'speedup'))
+    serial_time = serial_idx = None
+    for workers in [1, 2, 4, 8]:
+        elapsed, filter_idx = time_filters(filters, data_objs, workers, args.repeats)
+        if serial_time is None:
+            serial_time, serial_idx = elapsed, filter_idx
+        elif any(not np.array_equal(filter_idx[data_name], serial_idx[data_name]) for data_name in serial_idx):
+            raise RuntimeError('The filter indices with {} threads don\'t match the filter indices with 1 thread.'.format(workers))
+        print('{:>8} {:>10.3f} {:>7.2f}x'.format(workers, elapsed, serial_time / elapsed))
+    helper_functions.set_thread_pool_size(None)